@@ -67,6 +67,11 @@ class Device():
         self.__GET_BUFFER_TIMEOUT_MILLISEC = _GET_BUFFER_TIMEOUT_MILLISEC_DEFAULT
         self.__WAIT_ON_EVENT_TIMEOUT_MILLISEC = _WAIT_ON_EVENT_TIMEOUT_MILLISEC_DEFAULT
         self.__DEFAULT_NUM_BUFFERS = _NUM_OF_BUFFERS_DEFAULT
+        self.__event_service = None
+        # {xdevice getter name : node map}. node map handles are valid
+        # from create_device() to destroy_device(), so each node map is
+        # created once and its node cache survives between accesses
+        self.__nodemaps = {}
 
     def __str__(self):
 
@@ -853,9 +858,60 @@ class Device():
 
     # ---------------------------------------------------------------------
 
+    def __get_event_service(self):
+        if self.__event_service is None:
+            # imported here because arena_api.event depends on this module
+            from arena_api.event import EventService
+            self.__event_service = EventService(self)
+        return self.__event_service
+
+    event_service = property(__get_event_service)
+    '''
+    The background events engine of the device.\n
+
+    :getter: Returns the ``arena_api.event.EventService`` instance of\
+    the device. The same instance is returned every time.\n
+    :type: ``arena_api.event.EventService`` instance.\n
+
+    The service runs ``device.initialize_events()``,\
+    ``device.wait_on_event()`` and ``device.deinitialize_events()`` on a\
+    thread of its own and notifies subscribers when events update nodes,\
+    so an application does not need to write a polling thread for every\
+    device.\n
+
+    :warning:\n
+    - ``device.wait_on_event()`` must not be called while the service\
+    is running.\n
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    # ---------------------------------------------------------------------
+
+    def _release(self):
+        # called by system.destroy_device() right before the device is
+        # destroyed, anything that runs on or holds on to the device must
+        # be stopped here
+        if self.__event_service is not None:
+            self.__event_service.stop()
+
+        for nodemap in self.__nodemaps.values():
+            nodemap._release()
+        self.__nodemaps.clear()
+
+    def __get_or_create_nodemap(self, xdevice_getter_name):
+        nodemap = self.__nodemaps.get(xdevice_getter_name)
+        if nodemap is None:
+            hxnodemap = getattr(self._xdev, xdevice_getter_name)()
+            nodemap = _nodemap.Nodemap(hxnodemap)
+            self.__nodemaps[xdevice_getter_name] = nodemap
+        return nodemap
+
+    # ---------------------------------------------------------------------
+
     def __get_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetNodeMap()
-        return _nodemap.Nodemap(hxnodemap)
+        return self.__get_or_create_nodemap('xDeviceGetNodeMap')
 
     nodemap = property(__get_nodemap)
     '''
@@ -921,8 +977,7 @@ class Device():
     # ---------------------------------------------------------------------
 
     def __get_tl_device_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetTLDeviceNodeMap()
-        return _nodemap.Nodemap(hxnodemap)
+        return self.__get_or_create_nodemap('xDeviceGetTLDeviceNodeMap')
 
     tl_device_nodemap = property(__get_tl_device_nodemap)
     '''
@@ -985,8 +1040,7 @@ class Device():
     # ---------------------------------------------------------------------
 
     def __get_tl_stream_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetTLStreamNodeMap()
-        return _nodemap.Nodemap(hxnodemap)
+        return self.__get_or_create_nodemap('xDeviceGetTLStreamNodeMap')
 
     tl_stream_nodemap = property(__get_tl_stream_nodemap)
     '''
@@ -1035,8 +1089,7 @@ class Device():
     # ---------------------------------------------------------------------
 
     def __get_tl_interface_nodemap(self):
-        hxnodemap = self._xdev.xDeviceGetTLInterfaceNodeMap()
-        return _nodemap.Nodemap(hxnodemap)
+        return self.__get_or_create_nodemap('xDeviceGetTLInterfaceNodeMap')
 
     tl_interface_nodemap = property(__get_tl_interface_nodemap)
     '''
@@ -0,0 +1,57 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+# helpers used by the background services to hand a notification over to
+# the user function. a dispatcher can be:
+#   - None : the function is called from the service thread
+#   - concurrent.futures.Executor : the function is submitted to it
+#   - asyncio.AbstractEventLoop : the function is scheduled on the loop.
+#     coroutine functions are run with asyncio.run_coroutine_threadsafe
+
+import asyncio
+from concurrent.futures import Executor
+
+
+def check_dispatcher(dispatcher):
+
+    if dispatcher is None or \
+       isinstance(dispatcher, (Executor, asyncio.AbstractEventLoop)):
+        return
+
+    raise TypeError(f'expected None, concurrent.futures.Executor, or '
+                    f'asyncio.AbstractEventLoop instead of '
+                    f'{type(dispatcher).__name__}')
+
+
+def check_function(function):
+
+    if not callable(function):
+        raise TypeError(f'expected a callable instead of '
+                        f'{type(function).__name__}')
+
+
+def dispatch(dispatcher, function, *args):
+
+    # sync
+    if dispatcher is None:
+        function(*args)
+
+    # thread pool
+    elif isinstance(dispatcher, Executor):
+        dispatcher.submit(function, *args)
+
+    # asyncio
+    elif asyncio.iscoroutinefunction(function):
+        asyncio.run_coroutine_threadsafe(function(*args), dispatcher)
+    else:
+        dispatcher.call_soon_threadsafe(function, *args)
@@ -0,0 +1,88 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+# suggestions for misspelled node names. difflib.get_close_matches() scores
+# every name in the node map with a SequenceMatcher, which is slow for the
+# main node map of a device. the index narrows the names down to the ones
+# that share a prefix or a few trigrams with the misspelled name first, and
+# only those candidates are scored by difflib
+
+from bisect import bisect_left
+from difflib import SequenceMatcher
+
+
+class NameIndex():
+
+    # max number of trigram candidates scored by difflib
+    MAX_CANDIDATES = 64
+
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.__lowered = sorted(
+            (name.lower(), index) for index, name in enumerate(self.names))
+        self.__lowered_keys = [lowered for lowered, _ in self.__lowered]
+        self.__trigrams = {}  # {trigram : [name index]}
+        for index, name in enumerate(self.names):
+            for trigram in self.__get_trigrams(name):
+                self.__trigrams.setdefault(trigram, []).append(index)
+
+    def __contains__(self, name):
+        index = bisect_left(self.names, name)
+        return index < len(self.names) and self.names[index] == name
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def __get_trigrams(name):
+        # the padding lets short names and the first/last letters count
+        padded = f'  {name.lower()} '
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def __get_prefix_matches(self, prefix):
+        prefix = prefix.lower()
+        matches = []
+        index = bisect_left(self.__lowered_keys, prefix)
+        while index < len(self.__lowered_keys) and \
+                self.__lowered_keys[index].startswith(prefix):
+            matches.append(self.__lowered[index][1])
+            index += 1
+        return matches
+
+    def __get_trigram_matches(self, name):
+        shared = {}  # {name index : number of shared trigrams}
+        for trigram in self.__get_trigrams(name):
+            for index in self.__trigrams.get(trigram, ()):
+                shared[index] = shared.get(index, 0) + 1
+
+        return sorted(shared, key=shared.get,
+                      reverse=True)[:self.MAX_CANDIDATES]
+
+    def suggest(self, name, n=16, cutoff=0.15):
+        # same scoring as difflib.get_close_matches() over the candidates
+        candidates = set(self.__get_prefix_matches(name)[:self.MAX_CANDIDATES])
+        candidates.update(self.__get_trigram_matches(name))
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(name)
+        scored = []
+        for index in candidates:
+            matcher.set_seq1(self.names[index])
+            if matcher.real_quick_ratio() >= cutoff and \
+               matcher.quick_ratio() >= cutoff:
+                score = matcher.ratio()
+                if score >= cutoff:
+                    scored.append((score, self.names[index]))
+
+        scored.sort(reverse=True)
+        return [name for _, name in scored[:n]]
@@ -11,6 +11,8 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 import enum
+import threading
+from contextlib import contextmanager
 
 from arena_api import _node_helpers
 from arena_api import enums as _enums
@@ -56,15 +58,146 @@ def __base_node__repr__(node):
     )
 
 
+class _ValueCache():
+    # the last value, min, max and inc read from a node. ArenaC calls the
+    # node callback when the node is invalidated, by a write, by a node it
+    # depends on, or by a poll, and the callback invalidates the cache
+
+    __slots__ = ('values', 'generation', 'lock', 'ignored_thread_id',
+                 'callback_handle', 'callback_refs')
+
+    def __init__(self, hxnode):
+        # {'value' / 'min' / 'max' / 'inc' : value read}
+        self.values = {}
+        # bumped by every invalidation, so a read that raced with one is
+        # not cached
+        self.generation = 0
+        self.lock = threading.Lock()
+        # the thread whose callbacks are ignored, see writing()
+        self.ignored_thread_id = None
+        # ArenaC calls it from its own threads
+        self.callback_handle, self.callback_refs = \
+            _xCallback().xCallbackRegister(hxnode, self.__on_invalidated,
+                                           None)
+
+    def __on_invalidated(self, hxnode, user_data):
+        if self.ignored_thread_id == threading.get_ident():
+            return
+        self.invalidate()
+
+    @contextmanager
+    def writing(self):
+        # ArenaC makes the callbacks of a write on the writing thread before
+        # the write returns. for the range caches: writing the value of a
+        # node does not change its own range, so these callbacks are
+        # ignored. the callbacks of other threads still invalidate
+        self.ignored_thread_id = threading.get_ident()
+        try:
+            yield
+        finally:
+            self.ignored_thread_id = None
+
+    def get(self, key, getter):
+        try:
+            return self.values[key]
+        except KeyError:
+            pass
+
+        with self.lock:
+            generation = self.generation
+        value = getter()
+        with self.lock:
+            if generation == self.generation:
+                self.values[key] = value
+        return value
+
+    def invalidate(self):
+        with self.lock:
+            self.generation += 1
+            self.values = {}
+
+    def release(self):
+        self.invalidate()
+        _xCallback().xCallbackDeregister(self.callback_handle)
+
+
+# {node handle : _ValueCache} of the nodes with an enabled value cache.
+# keyed by handle so all the Node instances of a node share one cache.
+# handles are unique across node maps, a node map reaches its own caches
+# with the handles of its nodes
+_value_caches = {}
+# held to add or remove caches, so two threads enabling the cache of a node
+# do not register two callbacks
+_value_caches_lock = threading.Lock()
+
+# {node handle : _ValueCache} of the min, max and inc of the integer and
+# float nodes, used by set_clamped() and set_snapped() whether the value
+# cache of the node is enabled or not
+_range_caches = {}
+_range_caches_lock = threading.Lock()
+
+
+def _invalidate_value_caches(hxnodes):
+    # hxnodes is the set of the node handles of one node map
+    for caches, lock in ((_value_caches, _value_caches_lock),
+                         (_range_caches, _range_caches_lock)):
+        with lock:
+            value_caches = [value_cache
+                            for hxnode, value_cache in caches.items()
+                            if hxnode in hxnodes]
+        for value_cache in value_caches:
+            value_cache.invalidate()
+
+
+def _snap(value, minimum, maximum, inc):
+    # the closest value of min + n * inc in [min, max], half way values go
+    # up. integers are snapped with integer arithmetic, so int64 values
+    # keep their precision
+    value = min(max(value, minimum), maximum)
+    if not inc:
+        return value
+
+    if isinstance(value, int):
+        steps, rest = divmod(value - minimum, inc)
+        if 2 * rest >= inc:
+            steps += 1
+    else:
+        steps = int((value - minimum) / inc + 0.5)
+    value = minimum + steps * inc
+    if value > maximum:
+        value -= inc
+    return value
+
+
+def _release_value_caches(hxnodes):
+    # called before the node map owning the nodes is destroyed, the
+    # callbacks must be deregistered while the nodes exist
+    if not _value_caches and not _range_caches:
+        return
+    for caches, lock in ((_value_caches, _value_caches_lock),
+                         (_range_caches, _range_caches_lock)):
+        with lock:
+            value_caches = [caches.pop(hxnode)
+                            for hxnode in hxnodes if hxnode in caches]
+        for value_cache in value_caches:
+            value_cache.release()
+
+
 class Node():
 
+    # nodes are created for every feature an application touches and for
+    # every node of a tree walk, slots keep them small
+    __slots__ = ('xnode', 'xselector', '__metadata', '__weakref__')
+
     def __repr__(self):
         return __base_node__repr__(self)
 
     def __init__(self, xhnode):
         self.xnode = _xNode(xhnode)
-        self.__child_nodes = {}
-        self.__parent_nodes = {}
+        self.xselector = _xSelector(xhnode)
+        # {property name : value} of the properties that do not change for
+        # the lifetime of the node, created on first use
+        self.__metadata = None
 
     def __eq__(self, other):
         # for testing sometimes we dont need the same node when we choose
@@ -81,6 +214,138 @@ class Node():
                 f'{expected_type.__name__} '
                 f'expected instead of {type(value).__name__}')
 
+    # value cache ---------------------------------------------------------
+
+    # True for the nodes that have a value property
+    _SUPPORTS_VALUE_CACHE = False
+
+    def enable_value_cache(self):
+        '''
+        Serves the reads of ``value``, and of ``min``, ``max`` and ``inc``\
+        for integer and float nodes, from Python memory until the node\
+        changes.\n
+        ArenaC calls back when the node is invalidated: when it is written,\
+        when a node it depends on changes, or when a poll refreshes it.\
+        The next read after that goes to the device. ``invalidate_node()``\
+        and ``nodemap.invalidate_nodes()`` invalidate the cache too.\n
+        The cache belongs to the node, not to this instance; every instance\
+        of the node shares it.\n
+        Only nodes that are invalidated when their value changes can be\
+        cached. Volatile nodes, and nodes that are refreshed by polling,\
+        change on the device without notice and are refused. Some nodes\
+        are not volatile but are changed by the device while an automatic\
+        function runs, for example ``ExposureTime`` while ``ExposureAuto``\
+        is ``'Continuous'``; do not cache them then.
+
+        >>> exposure_time = nodemap['ExposureTime']
+        >>> exposure_time.enable_value_cache()
+        >>> for buffer in frames:
+        >>>     # read from the device only after ExposureTime changed
+        >>>     exposure_time_us = exposure_time.value
+
+        **Raises**:
+            - ``TypeError`` :
+                - the node has no value, such as category and command\
+                nodes.
+            - ``ValueError`` :
+                - the caching mode of the node is ``CachingMode.NO_CACHE``,\
+                the node is not cachable (it is volatile or depends on a\
+                volatile node), or it has a ``polling_time``. Its value can\
+                change without the node being invalidated, for example a\
+                counter or a sensor reading.
+
+        **Returns**:
+            - ``None``.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        if not self._SUPPORTS_VALUE_CACHE:
+            raise TypeError(f'{type(self).__name__} has no value to cache')
+
+        hxnode = self.xnode.hxnode.value
+        if hxnode in _value_caches:
+            return
+        if self.caching_mode == _enums.CachingMode.NO_CACHE:
+            raise ValueError(f'\'{self.name}\' caching mode is NO_CACHE, '
+                             f'its value can change without notice')
+        if not self.is_cachable:
+            raise ValueError(f'\'{self.name}\' is not cachable, its value '
+                             f'can change without notice')
+        if self.polling_time > 0:
+            raise ValueError(f'\'{self.name}\' is refreshed by polling, its '
+                             f'value can change without notice')
+        with _value_caches_lock:
+            # another thread can have enabled it since the check above
+            if hxnode not in _value_caches:
+                _value_caches[hxnode] = _ValueCache(hxnode)
+
+    def disable_value_cache(self):
+        '''
+        Reads ``value`` from the device on every access again and\
+        deregisters the node callback of the cache. Calling it on a node\
+        without a value cache does nothing.
+
+        **Returns**:
+            - ``None``.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        with _value_caches_lock:
+            value_cache = _value_caches.pop(self.xnode.hxnode.value, None)
+        if value_cache is not None:
+            value_cache.release()
+
+    def __get_is_value_cache_enabled(self):
+        return self.xnode.hxnode.value in _value_caches
+
+    is_value_cache_enabled = property(__get_is_value_cache_enabled)
+    '''
+    :getter: Returns whether ``enable_value_cache()`` was called for the\
+    node.
+    :type: ``bool``
+    '''
+
+    def _get_cached_value(self, getter, key='value'):
+        value_cache = _value_caches.get(self.xnode.hxnode.value)
+        if value_cache is None:
+            return getter()
+        return value_cache.get(key, getter)
+
+    def _invalidate_value_cache(self):
+        value_cache = _value_caches.get(self.xnode.hxnode.value)
+        if value_cache is not None:
+            value_cache.invalidate()
+
+    def _get_range_cache(self):
+        # created on first use, it registers a node callback
+        hxnode = self.xnode.hxnode.value
+        range_cache = _range_caches.get(hxnode)
+        if range_cache is None:
+            with _range_caches_lock:
+                range_cache = _range_caches.get(hxnode)
+                if range_cache is None:
+                    range_cache = _range_caches[hxnode] = _ValueCache(hxnode)
+        return range_cache
+
+    def _invalidate_range_cache(self):
+        range_cache = _range_caches.get(self.xnode.hxnode.value)
+        if range_cache is not None:
+            range_cache.invalidate()
+
+    def _get_metadata(self, key, getter):
+        # reads a property that never changes from ArenaC the first time
+        # only. failed reads are not cached
+        metadata = self.__metadata
+        if metadata is None:
+            metadata = self.__metadata = {}
+        try:
+            return metadata[key]
+        except KeyError:
+            value = metadata[key] = getter()
+            return value
+
     # ---------------------------------------------------------------------
 
     def __get_access_mode(self):
@@ -152,55 +417,56 @@ class Node():
     # ---------------------------------------------------------------------
 
     def __get_description(self):
-        return self.xnode.xNodeGetDescription()
+        return self._get_metadata('description', self.xnode.xNodeGetDescription)
 
     description = property(__get_description)
 
     # ---------------------------------------------------------------------
 
     def __get_device_name(self):
-        return self.xnode.xNodeGetDeviceName()
+        return self._get_metadata('device_name', self.xnode.xNodeGetDeviceName)
 
     device_name = property(__get_device_name)
 
     # ---------------------------------------------------------------------
     def __get_display_name(self):
-        return self.xnode.xNodeGetDisplayName()
+        return self._get_metadata('display_name', self.xnode.xNodeGetDisplayName)
 
     display_name = property(__get_display_name)
 
     # ---------------------------------------------------------------------
 
     def __get_docu_url(self):
-        return self.xnode.xNodeGetDocuURL()
+        return self._get_metadata('docu_url', self.xnode.xNodeGetDocuURL)
 
     docu_url = property(__get_docu_url)
 
     # ---------------------------------------------------------------------
 
     def __get_event_id(self):
-        return self.xnode.xNodeGetEventID()
+        return self._get_metadata('event_id', self.xnode.xNodeGetEventID)
 
     event_id = property(__get_event_id)
 
     # ---------------------------------------------------------------------
 
     def __get_name(self):
-        return self.xnode.xNodeGetName()
+        return self._get_metadata('name', self.xnode.xNodeGetName)
 
     name = property(__get_name)
 
     # ---------------------------------------------------------------------
 
     def __get_fully_qualified_name(self):
-        return self.xnode.xNodeGetFullyQualifiedName()
+        return self._get_metadata('fully_qualified_name', self.xnode.xNodeGetFullyQualifiedName)
 
     fully_qualified_name = property(__get_fully_qualified_name)
 
     # ---------------------------------------------------------------------
 
     def __get_namespace(self):
-        namespace = self.xnode.xNodeGetNamespace()
+        namespace = self._get_metadata('namespace',
+                                       self.xnode.xNodeGetNamespace)
         return _enums.Namespace(namespace)
 
     namespace = property(__get_namespace)
@@ -215,7 +481,8 @@ class Node():
     # ---------------------------------------------------------------------
 
     def __get_interface_type(self):
-        interface_type = self.xnode.xNodeGetPrincipalInterfaceType()
+        interface_type = self._get_metadata(
+            'interface_type', self.xnode.xNodeGetPrincipalInterfaceType)
         return _enums.InterfaceType(interface_type)
 
     interface_type = property(__get_interface_type)
@@ -223,7 +490,7 @@ class Node():
     # ---------------------------------------------------------------------
 
     def __get_tool_tip(self):
-        return self.xnode.xNodeGetToolTip()
+        return self._get_metadata('tool_tip', self.xnode.xNodeGetToolTip)
 
     tool_tip = property(__get_tool_tip)
 
@@ -237,14 +504,14 @@ class Node():
     # ---------------------------------------------------------------------
 
     def __get_is_deprecated(self):
-        return self.xnode.xNodeIsDeprecated()
+        return self._get_metadata('is_deprecated', self.xnode.xNodeIsDeprecated)
 
     is_deprecated = property(__get_is_deprecated)
 
     # ---------------------------------------------------------------------
 
     def __get_is_feature(self):
-        return self.xnode.xNodeIsFeature()
+        return self._get_metadata('is_feature', self.xnode.xNodeIsFeature)
 
     is_feature = property(__get_is_feature)
 
@@ -262,9 +529,57 @@ class Node():
 
     is_writable = property(__get_is_writable)
 
+    # selector ------------------------------------------------------------
+
+    def __get_is_selector(self):
+        return self._get_metadata('is_selector', self.xselector.xSelectorIsSelector)
+
+    is_selector = property(__get_is_selector)
+    '''
+    ``True`` if the node selects other features, for example\
+    ``GainSelector`` selects ``Gain``.
+
+    :getter: Returns a ``bool``.
+    '''
+
+    def __get_selected_features(self):
+        num_of_features = self.xselector.xSelectorGetNumSelectedFeatures()
+        return [self.__get_specific_node(
+            self.xselector.xSelectorGetSelectedFeature(index))
+            for index in range(num_of_features)]
+
+    selected_features = property(__get_selected_features)
+    '''
+    The features this selector node selects.
+
+    :getter: Returns a ``list`` of nodes, empty if the node is not a\
+    selector.
+    '''
+
+    def __get_selecting_features(self):
+        num_of_features = self.xselector.xSelectorGetNumSelectingFeatures()
+        return [self.__get_specific_node(
+            self.xselector.xSelectorGetSelectingFeature(index))
+            for index in range(num_of_features)]
+
+    selecting_features = property(__get_selecting_features)
+    '''
+    The selector nodes that select this node.
+
+    :getter: Returns a ``list`` of nodes, empty if no selector selects\
+    the node.
+    '''
+
+    def __get_specific_node(self, hxnode):
+        node_base = Node(hxnode)
+        return _node_helpers.cast_from_general_node_to_specific_node_type(
+            node_base)
+
     # Other ---------------------------------------------------------------
 
     def invalidate_node(self):
+        self._invalidate_value_cache()
+        self._invalidate_range_cache()
         return self.xnode.xNodeInvalidateNode()
 
     # Property ------------------------------------------------------------
@@ -296,6 +611,10 @@ class Node():
 
 class NodeString(Node):
 
+    __slots__ = ('xstring',)
+
+    _SUPPORTS_VALUE_CACHE = True
+
     def __init__(self, hxnode):
         super().__init__(hxnode)
         self.xstring = _xString(hxnode)
@@ -325,17 +644,24 @@ class NodeString(Node):
     # value ---------------------------------------------------------------
 
     def __get_value(self):
-        return self.xstring.xStringGetValue()
+        return self._get_cached_value(self.xstring.xStringGetValue)
 
     def __set_value(self, value):
         self.__raise_type_error_if_not_expected_type(value, str)
-        self.xstring.xStringSetValue(value)
+        try:
+            self.xstring.xStringSetValue(value)
+        finally:
+            self._invalidate_value_cache()
 
     value = property(__get_value, __set_value)
 
 
 class NodeInteger(Node):
 
+    __slots__ = ('xinteger',)
+
+    _SUPPORTS_VALUE_CACHE = True
+
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
 
@@ -388,45 +714,116 @@ class NodeInteger(Node):
     # ---------------------------------------------------------------------
 
     def __get_value(self):
-        return self.xinteger.xIntegerGetValue()
+        return self._get_cached_value(self.xinteger.xIntegerGetValue)
 
     def __set_value(self, value):
         self.__raise_type_error_if_not_expected_type(value, int)
-        self.xinteger.xIntegerSetValue(value)
+        try:
+            self.xinteger.xIntegerSetValue(value)
+        finally:
+            self._invalidate_value_cache()
 
     value = property(__get_value, __set_value)
 
     # ---------------------------------------------------------------------
 
     def __get_min(self):
-        return self.xinteger.xIntegerGetMin()
+        return self._get_cached_value(self.xinteger.xIntegerGetMin, 'min')
 
     def __set_min(self, value):
         self.__raise_type_error_if_not_expected_type(value, int)
-        self.xinteger.xIntegerImposeMin(value)
+        try:
+            self.xinteger.xIntegerImposeMin(value)
+        finally:
+            self._invalidate_value_cache()
+            self._invalidate_range_cache()
 
     min = property(__get_min, __set_min)
 
     # ---------------------------------------------------------------------
 
     def __get_max(self):
-        return self.xinteger.xIntegerGetMax()
+        return self._get_cached_value(self.xinteger.xIntegerGetMax, 'max')
 
     def __set_max(self, value):
         self.__raise_type_error_if_not_expected_type(value, int)
-        self.xinteger.xIntegerImposeMax(value)
+        try:
+            self.xinteger.xIntegerImposeMax(value)
+        finally:
+            self._invalidate_value_cache()
+            self._invalidate_range_cache()
 
     max = property(__get_max, __set_max)
 
     # ---------------------------------------------------------------------
 
     def __get_inc(self):
-        return self.xinteger.xIntegerGetInc()
+        return self._get_cached_value(self.xinteger.xIntegerGetInc, 'inc')
 
     inc = property(__get_inc)
 
     # ---------------------------------------------------------------------
 
+    def set_clamped(self, value):
+        '''
+        Clamps ``value`` to ``[min, max]`` and writes it. The range is\
+        checked before the write, so values out of range never reach the\
+        device. The range is cached for the node and read from the device\
+        again only after ArenaC invalidates the node, for example when a\
+        node it depends on changes; writing the value keeps it.
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``value`` is not an ``int``.
+
+        **Returns**:
+            - the value written.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        self.__raise_type_error_if_not_expected_type(value, int)
+        range_cache = self._get_range_cache()
+        minimum, maximum, _ = self.__get_range(range_cache)
+        value = min(max(value, minimum), maximum)
+        with range_cache.writing():
+            self.value = value
+        return value
+
+    def set_snapped(self, value):
+        '''
+        Clamps ``value`` to ``[min, max]``, moves it to the closest\
+        ``min + n * inc`` and writes it. Values half way between two\
+        increments go up. Like ``set_clamped()`` the value is checked\
+        before the write.
+
+        >>> # an auto tuner can write any candidate value
+        >>> written = nodemap['Width'].set_snapped(candidate)
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``value`` is not an ``int``.
+
+        **Returns**:
+            - the value written.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        self.__raise_type_error_if_not_expected_type(value, int)
+        range_cache = self._get_range_cache()
+        value = _snap(value, *self.__get_range(range_cache))
+        with range_cache.writing():
+            self.value = value
+        return value
+
+    def __get_range(self, range_cache):
+        return (range_cache.get('min', self.xinteger.xIntegerGetMin),
+                range_cache.get('max', self.xinteger.xIntegerGetMax),
+                range_cache.get('inc', self.xinteger.xIntegerGetInc))
+
+    # ---------------------------------------------------------------------
+
     def __get_inc_mode(self):
         inc_mode = self.xinteger.xIntegerGetIncMode()
         return _enums.IncMode(inc_mode)
@@ -436,7 +833,8 @@ class NodeInteger(Node):
     # ---------------------------------------------------------------------
 
     def __get_representation(self):
-        representation = self.xinteger.xIntegerGetRepresentation()
+        representation = self._get_metadata(
+            'representation', self.xinteger.xIntegerGetRepresentation)
         return _enums.Representation(representation)
 
     representation = property(__get_representation)
@@ -444,13 +842,17 @@ class NodeInteger(Node):
     # ---------------------------------------------------------------------
 
     def __get_unit(self):
-        return self.xinteger.xIntegerGetUnit()
+        return self._get_metadata('unit', self.xinteger.xIntegerGetUnit)
 
     unit = property(__get_unit)
 
 
 class NodeFloat(Node):
 
+    __slots__ = ('xfloat',)
+
+    _SUPPORTS_VALUE_CACHE = True
+
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
 
@@ -503,49 +905,129 @@ class NodeFloat(Node):
     # ---------------------------------------------------------------------
 
     def __get_value(self):
-        return self.xfloat.xFloatGetValue()
+        return self._get_cached_value(self.xfloat.xFloatGetValue)
 
     def __set_value(self, value):
         self.__raise_type_error_if_not_expected_type(value, float)
-        self.xfloat.xFloatSetValue(value)
+        try:
+            self.xfloat.xFloatSetValue(value)
+        finally:
+            self._invalidate_value_cache()
 
     value = property(__get_value, __set_value)
 
     # ---------------------------------------------------------------------
 
     def __get_min(self):
-        return self.xfloat.xFloatGetMin()
+        return self._get_cached_value(self.xfloat.xFloatGetMin, 'min')
 
     def __set_min(self, value):
         self.__raise_type_error_if_not_expected_type(value, float)
-        self.xfloat.xFloatImposeMin(value)
+        try:
+            self.xfloat.xFloatImposeMin(value)
+        finally:
+            self._invalidate_value_cache()
+            self._invalidate_range_cache()
 
     min = property(__get_min, __set_min)
 
     # ---------------------------------------------------------------------
 
     def __get_max(self):
-        return self.xfloat.xFloatGetMax()
+        return self._get_cached_value(self.xfloat.xFloatGetMax, 'max')
 
     def __set_max(self, value):
         self.__raise_type_error_if_not_expected_type(value, float)
-        self.xfloat.xFloatImposeMax(value)
+        try:
+            self.xfloat.xFloatImposeMax(value)
+        finally:
+            self._invalidate_value_cache()
+            self._invalidate_range_cache()
 
     max = property(__get_max, __set_max)
 
     # ---------------------------------------------------------------------
 
-    def __get_inc(self):
+    def __read_inc(self):
 
         if self.xfloat.xFloatHasInc():
             return self.xfloat.xFloatGetInc()
         else:
             return None
 
+    def __get_inc(self):
+        return self._get_cached_value(self.__read_inc, 'inc')
+
     inc = property(__get_inc)
 
     # ---------------------------------------------------------------------
 
+    def set_clamped(self, value):
+        '''
+        Clamps ``value`` to ``[min, max]`` and writes it. The range is\
+        checked before the write, so values out of range never reach the\
+        device. The range is cached for the node and read from the device\
+        again only after ArenaC invalidates the node, for example when a\
+        node it depends on changes; writing the value keeps it.
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``value`` is not a ``float`` or an ``int``.
+
+        **Returns**:
+            - the value written.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f'float expected instead of '
+                            f'{type(value).__name__}')
+        value = float(value)
+        range_cache = self._get_range_cache()
+        minimum, maximum, _ = self.__get_range(range_cache)
+        value = min(max(value, minimum), maximum)
+        with range_cache.writing():
+            self.value = value
+        return value
+
+    def set_snapped(self, value):
+        '''
+        Clamps ``value`` to ``[min, max]``, moves it to the closest\
+        ``min + n * inc`` and writes it. Values half way between two\
+        increments go up. Like ``set_clamped()`` the value is checked\
+        before the write.
+
+        >>> # an auto tuner can write any candidate value
+        >>> written = nodemap['ExposureTime'].set_snapped(candidate)
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``value`` is not a ``float`` or an ``int``.
+
+        **Returns**:
+            - the value written.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f'float expected instead of '
+                            f'{type(value).__name__}')
+        value = float(value)
+        range_cache = self._get_range_cache()
+        value = _snap(value, *self.__get_range(range_cache))
+        with range_cache.writing():
+            self.value = value
+        return value
+
+    def __get_range(self, range_cache):
+        return (range_cache.get('min', self.xfloat.xFloatGetMin),
+                range_cache.get('max', self.xfloat.xFloatGetMax),
+                range_cache.get('inc', self.__read_inc))
+
+    # ---------------------------------------------------------------------
+
     def __get_inc_mode(self):
         inc_mode = self.xfloat.xFloatGetIncMode()
         return _enums.IncMode(inc_mode)
@@ -555,7 +1037,8 @@ class NodeFloat(Node):
     # ---------------------------------------------------------------------
 
     def __get_representation(self):
-        representation = self.xfloat.xFloatGetRepresentation()
+        representation = self._get_metadata(
+            'representation', self.xfloat.xFloatGetRepresentation)
         return _enums.Representation(representation)
 
     representation = property(__get_representation)
@@ -563,14 +1046,15 @@ class NodeFloat(Node):
     # ---------------------------------------------------------------------
 
     def __get_unit(self):
-        return self.xfloat.xFloatGetUnit()
+        return self._get_metadata('unit', self.xfloat.xFloatGetUnit)
 
     unit = property(__get_unit)
 
     # ---------------------------------------------------------------------
 
     def __get_display_notation(self):
-        display_notation = self.xfloat.xFloatGetDisplayNotation()
+        display_notation = self._get_metadata(
+            'display_notation', self.xfloat.xFloatGetDisplayNotation)
         return _enums.DisplayNotation(display_notation)
 
     display_notation = property(__get_display_notation)
@@ -578,13 +1062,18 @@ class NodeFloat(Node):
     # ---------------------------------------------------------------------
 
     def __get_display_precision(self):
-        return self.xfloat.xFloatGetDisplayPrecision()
+        return self._get_metadata('display_precision',
+                                  self.xfloat.xFloatGetDisplayPrecision)
 
     display_precision = property(__get_display_precision)
 
 
 class NodeBoolean(Node):
 
+    __slots__ = ('xboolean',)
+
+    _SUPPORTS_VALUE_CACHE = True
+
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
 
@@ -612,17 +1101,25 @@ class NodeBoolean(Node):
     # ---------------------------------------------------------------------
 
     def __get_value(self):
-        return self.xboolean.xBooleanGetValue()
+        return self._get_cached_value(self.xboolean.xBooleanGetValue)
 
     def __set_value(self, value):
         self.__raise_type_error_if_not_expected_type(value, bool)
-        self.xboolean.xBooleanSetValue(value)
+        try:
+            self.xboolean.xBooleanSetValue(value)
+        finally:
+            self._invalidate_value_cache()
 
     value = property(__get_value, __set_value)
 
 
 class NodeEnumeration(Node):
 
+    __slots__ = ('xenumeration', '__entries', '__entries_by_int_value',
+                 '__int_values_by_hxnode')
+
+    _SUPPORTS_VALUE_CACHE = True
+
     def __repr__(self):
 
         base_node_info = __base_node__repr__(self)
@@ -655,16 +1152,70 @@ class NodeEnumeration(Node):
     def __init__(self, hxnode):
         super().__init__(hxnode)
         self.xenumeration = _xEnumeration(hxnode)
-        self.__entries_names = []
-        self.__entries_nodes = {}
+        # {symbolic : (int value, entry node)} of all the entries, including
+        # the ones not available with the current settings. built on first
+        # use, dropped by invalidate_node()
+        self.__entries = None
+        # {int value : entry node} and {entry handle : int value}, built
+        # with the table
+        self.__entries_by_int_value = None
+        self.__int_values_by_hxnode = None
+
+    # entries table -------------------------------------------------------
+
+    def __get_entries(self):
+        entries = self.__entries
+        if entries is None:
+            entries = {}
+            entries_by_int_value = {}
+            int_values_by_hxnode = {}
+            for index in range(self.xenumeration.xEnumerationGetNumEntries()):
+                entry_node = NodeEnumentry(
+                    self.xenumeration.xEnumerationGetEntryByIndex(index))
+                int_value = entry_node.xenumentry.xEnumEntryGetIntValue()
+                entries[entry_node.name] = (int_value, entry_node)
+                entries_by_int_value[int_value] = entry_node
+                int_values_by_hxnode[entry_node.xnode.hxnode.value] = \
+                    int_value
+            self.__entries_by_int_value = entries_by_int_value
+            self.__int_values_by_hxnode = int_values_by_hxnode
+            # set last, the other tables are complete once it is set
+            self.__entries = entries
+        return entries
+
+    def __get_entries_by_int_value(self):
+        self.__get_entries()
+        return self.__entries_by_int_value
+
+    def __get_int_values_by_hxnode(self):
+        self.__get_entries()
+        return self.__int_values_by_hxnode
+
+    def __get_entry_node(self, enum_name):
+        entry = self.__get_entries().get(enum_name)
+        if entry is not None:
+            return entry[1]
+        # not in the table, ArenaC raises for names that are not entries
+        return NodeEnumentry(
+            self.xenumeration.xEnumerationGetEntryByName(enum_name))
+
+    def invalidate_node(self):
+        self.__entries = None
+        self.__entries_by_int_value = None
+        self.__int_values_by_hxnode = None
+        return super().invalidate_node()
 
     # value ---------------------------------------------------------------
 
     def __get_value(self):
-        return self.xenumeration.xEnumerationGetCurrentSymbolic()
+        return self._get_cached_value(
+            self.xenumeration.xEnumerationGetCurrentSymbolic)
 
     def __set_value_from_str(self, str_value):
-        return self.xenumeration.xEnumerationSetBySymbolic(str_value)
+        try:
+            return self.xenumeration.xEnumerationSetBySymbolic(str_value)
+        finally:
+            self._invalidate_value_cache()
 
     def __set_value(self, value):
 
@@ -708,18 +1259,80 @@ class NodeEnumeration(Node):
 
     # enumentry_nodes -----------------------------------------------------
     def __get_enumentry_nodes(self):
-        entries_nodes = {}
-        for enum_name in self.enumentry_names:
-            hxentry_node = self.xenumeration.xEnumerationGetEntryByName(
-                enum_name)
-            enum_entry_node = NodeEnumentry(hxentry_node)
-            entries_nodes[enum_name] = enum_entry_node
-        return entries_nodes
+        # the available entries change with the settings, so the names are
+        # read every time. the entry nodes come from the table
+        return {enum_name: self.__get_entry_node(enum_name)
+                for enum_name in self.enumentry_names}
 
     enumentry_nodes = property(__get_enumentry_nodes)
 
+    # enumentry_int_values ------------------------------------------------
+    def __get_enumentry_int_values(self):
+        return {enum_name: int_value
+                for enum_name, (int_value, _) in self.__get_entries().items()}
+
+    enumentry_int_values = property(__get_enumentry_int_values)
+    '''
+    The integer value of every entry of the enumeration, including the\
+    entries that are not available with the current settings.\
+    The table is read from the device once per node and dropped by\
+    ``invalidate_node()``.
+
+    :getter: Returns a ``dict`` that has the entry symbolic as a key and\
+    its ``int`` value as the value.
+    '''
+
+    # int_value -----------------------------------------------------------
+    def __get_int_value(self):
+        hxentry_node = self.xenumeration.xEnumerationGetCurrentEntry()
+        int_value = self.__get_int_values_by_hxnode().get(hxentry_node)
+        if int_value is None:
+            # not in the table, read it from the entry
+            int_value = _xEnumentry(hxentry_node).xEnumEntryGetIntValue()
+        return int_value
+
+    def __set_int_value(self, int_value):
+
+        if isinstance(int_value, bool) or not isinstance(int_value, int):
+            raise TypeError(f'int expected instead of '
+                            f'{type(int_value).__name__}')
+
+        if int_value not in self.__get_entries_by_int_value():
+            raise ValueError(f'\n{int_value} is not a valid enumentry '
+                             f'value\nenumentries values for this node '
+                             f'are:\n\t{self.enumentry_int_values}')
+
+        try:
+            self.xenumeration.xEnumerationSetByIntValue(int_value)
+        except (TypeError, ValueError):
+            # ArenaC returns invalid parameter for values that are not an
+            # entry value
+            raise ValueError(f'\n{int_value} is not a valid enumentry '
+                             f'value\nenumentries values for this node '
+                             f'are:\n\t{self.enumentry_int_values}')
+        finally:
+            self._invalidate_value_cache()
+
+    int_value = property(__get_int_value, __set_int_value)
+    '''
+    The integer value of the current entry. Setting it skips the symbolic\
+    string marshalling of ``value``, for switches on hot paths such as\
+    ``PixelFormat`` or ``TriggerSource``.
+
+    >>> pixel_format = nodemap['PixelFormat']
+    >>> mono8 = pixel_format.enumentry_int_values['Mono8']
+    >>> pixel_format.int_value = mono8
+
+    :getter: Returns the ``int`` value of the current entry.
+    :setter: Sets the current entry by its ``int`` value.
+    :type: ``int``
+    '''
+
 
 class NodeEnumentry(Node):
+
+    __slots__ = ('xenumentry',)
+
     # needs more design thoughts
     def __repr__(self):
 
@@ -743,7 +1356,8 @@ class NodeEnumentry(Node):
     # overrides the base calss , node , name property because enums needs
     # to return their sympolic name (which is human readable)
     def __get_name(self):
-        return self.xenumentry.xEnumEntryGetSymbolic()
+        return self._get_metadata('name',
+                                  self.xenumentry.xEnumEntryGetSymbolic)
 
     name = property(__get_name)
     # ---------------------------------------------------------------------
@@ -757,6 +1371,9 @@ class NodeEnumentry(Node):
 
 
 class NodeCategory(Node):
+
+    __slots__ = ('xcategory',)
+
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
 
@@ -794,6 +1411,8 @@ class NodeCategory(Node):
 # TODO SFW-2117
 class NodeRegister(Node):
 
+    __slots__ = ('xregister',)
+
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
         return f'{base_node_info}'
@@ -803,12 +1422,110 @@ class NodeRegister(Node):
         self.xregister = _xRegister(hxnode)
 
     def get(self, register_length):
+        '''
+        Reads ``register_length`` bytes of the register and returns the\
+        first one.
+
+        **Args**:
+            register_length :
+                an ``int``, the number of bytes to read.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``register_length`` is not an ``int``.
+
+        **Returns**:
+            - an ``int``, the first byte of the register.
+
+        :warning:\n
+        - Use ``read_into()`` to get all the bytes of the register.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
         if not isinstance(register_length, int):
             raise TypeError(f'int expected instead of '
                             f'{type(register_length).__name__}')
 
         return self.xregister.xRegisterGet(register_length)
 
+    @staticmethod
+    def __get_bytes_view(array):
+        try:
+            view = memoryview(array)
+        except TypeError:
+            raise TypeError(f'numpy.ndarray, bytearray, or another object '
+                            f'supporting the buffer protocol is expected '
+                            f'instead of {type(array).__name__}')
+        if not view.c_contiguous:
+            raise ValueError('array must be C contiguous, use '
+                             'numpy.ascontiguousarray()')
+        if not view.nbytes:
+            raise ValueError('array is empty')
+        return view.cast('B')
+
+    def read_into(self, array):
+        '''
+        Reads the register into the memory of ``array`` in one native call.\
+        ``array.nbytes`` bytes are read, so the array dtype and shape give\
+        the layout, for example a ``numpy.uint32`` array of the register\
+        length divided by 4.
+
+        >>> lut = numpy.empty(4096, dtype=numpy.uint32)
+        >>> nodemap['LUTValueAll'].read_into(lut)
+
+        **Args**:
+            array :
+                a writable, C contiguous ``numpy.ndarray``, ``bytearray``,\
+                or any object supporting the buffer protocol.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``array`` does not support the buffer protocol.
+            - ``ValueError`` :
+                - ``array`` is read only, not C contiguous, or empty.
+
+        **Returns**:
+            - ``array``.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        view = self.__get_bytes_view(array)
+        if view.readonly:
+            raise ValueError('array is read only')
+        self.xregister.xRegisterGetInto(view)
+        return array
+
+    def write_from(self, array):
+        '''
+        Writes the bytes of ``array`` to the register in one native call.\
+        ``array.nbytes`` bytes are written.
+
+        >>> gamma = numpy.linspace(0, 1, 4096) ** (1 / 2.2)
+        >>> nodemap['LUTValueAll'].write_from(
+        >>>     (gamma * 4095).astype(numpy.uint32))
+
+        **Args**:
+            array :
+                a C contiguous ``numpy.ndarray``, ``bytes``, ``bytearray``,\
+                or any object supporting the buffer protocol. Read only\
+                objects are copied once before the write.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``array`` does not support the buffer protocol.
+            - ``ValueError`` :
+                - ``array`` is not C contiguous, or is empty.
+
+        **Returns**:
+            - ``None``.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        self.xregister.xRegisterSetFrom(self.__get_bytes_view(array))
+
     def set(self, hsrc_register, src_register_length: int):
         if not isinstance(src_register_length, int):
             raise TypeError(f'int expected instead of '
@@ -820,6 +1537,8 @@ class NodeRegister(Node):
 
 class NodeCommand(Node):
 
+    __slots__ = ('xcommand',)
+
     def __repr__(self):
         base_node_info = __base_node__repr__(self)
         return f'{base_node_info}'
@@ -11,10 +11,104 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
-import difflib
+import os
+import weakref
+from collections.abc import Mapping
 
 from arena_api import _node_helpers, _node
+from arena_api._polling import PollingScheduler as _PollingScheduler
+from arena_api._name_index import NameIndex as _NameIndex
+from arena_api._xlayer.xarena._xaccessor import (_xBooleanAccessor,
+                                                  _xEnumerationAccessor,
+                                                  _xFloatAccessor,
+                                                  _xIntegerAccessor)
+from arena_api._xlayer.xarena._xfeaturestream import (_xFeaturestream,
+                                                      xFeatureStreamCreate,
+                                                      xFeatureStreamDestroy)
+from arena_api._xlayer.xarena._xnode import _xEnumentry, _xNode
 from arena_api._xlayer.xarena._xnodemap import _xNodemap
+from arena_api.enums import AccessMode as _AccessMode
+from arena_api.enums import InterfaceType as _InterfaceType
+
+
+class NodemapSnapshot(Mapping):
+    '''
+    The values of the writable features of a node map, taken by\
+    ``nodemap.snapshot()``.\n
+    It is a read only ``dict`` like object that has node name as a key and\
+    the node value as the value. Values are ``int``, ``float``, ``bool`` or\
+    ``str`` so a snapshot can be serialized, for example to JSON with\
+    ``json.dumps(snapshot.to_dict())``, and rebuilt with\
+    ``NodemapSnapshot.from_dict()``.
+
+    >>> reference = device.nodemap.snapshot()
+    >>> # later
+    >>> drift = reference.diff(device.nodemap.snapshot())
+    >>> if drift:
+    >>>     device.nodemap.apply(drift)
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    def __init__(self, values):
+        self.__values = dict(values)
+
+    def __getitem__(self, node_name):
+        return self.__values[node_name]
+
+    def __iter__(self):
+        return iter(self.__values)
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.__values})'
+
+    def diff(self, other):
+        '''
+        Finds the features whose value in this snapshot is different from\
+        their value in ``other``.
+
+        **Args**:
+            other :
+                a ``NodemapSnapshot`` or a ``dict``, usually the current\
+                state of a node map ``nodemap.snapshot()``.\n
+
+        **Returns**:
+            - a ``NodemapSnapshot`` with the values of this snapshot for\
+            the features that are missing or different in ``other``.\
+            ``nodemap.apply(diff)`` writes only these features to bring the\
+            node map of ``other`` to this snapshot.\n
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(other, Mapping):
+            raise TypeError(f'expected NodemapSnapshot or dict '
+                            f'instead of {type(other).__name__}')
+
+        missing = object()
+        return NodemapSnapshot(
+            (node_name, value) for node_name, value in self.__values.items()
+            if other.get(node_name, missing) != value)
+
+    def to_dict(self):
+        '''
+        Returns a ``dict`` copy of the snapshot values.
+        '''
+        return dict(self.__values)
+
+    @classmethod
+    def from_dict(cls, values):
+        '''
+        Builds a snapshot from a ``dict``, for example one loaded from JSON.
+        '''
+        if not isinstance(values, Mapping):
+            raise TypeError(f'expected dict '
+                            f'instead of {type(values).__name__}')
+        return cls(values)
 
 
 class Nodemap():
@@ -28,10 +122,28 @@ class Nodemap():
     def __init__(self, xhnodemap):
         self.__xnodemap = _xNodemap(xhnodemap)
         self.DEFAULT_POLL_TIME_MILLISEC = 1000
+        # {node name : specific node}. node handles are owned by the node
+        # map and stay valid until the device is destroyed, so each node is
+        # resolved once instead of on every nodemap['name']
+        self.__nodes = {}
+        # built on first use. the feature nodes of a node map do not change
+        # for the lifetime of the node map
+        self.__feature_name_index = None
+        # {node name : interface type} for the reads and writes that go
+        # through the node map by name and skip the node objects
+        self.__interface_types = {}
+        # [(node name, x node map getter)] of the value features, built on
+        # first snapshot()
+        self.__snapshot_readers = None
+        # the handles of all the nodes of the node map, built on first use
+        self.__hxnodes = None
+        self.__polling_scheduler = None
+        # background readers of the node map, such as telemetry samplers.
+        # they are stopped before the node map handles become dangling
+        self.__workers = weakref.WeakSet()
 
     def __repr__(self):
-        return str(self.feature_names)
-        pass
+        return str(self.__get_feature_name_index().names)
     # device_name ---------------------------------------------------------
 
     def __get_device_name(self):
@@ -53,10 +165,38 @@ class Nodemap():
 
     def invalidate_nodes(self):
         '''
+        Invalidates the values of all the nodes and drops the nodes cached\
+        by this node map instance. Nodes are resolved again on the next\
+        access.
+
         **--------------------------------------------------------------**\
         **---------------------------------------------------------------**
         '''
         self.__xnodemap.xNodeMapInvalidateNodes()
+        # only the value caches of the nodes of this node map
+        _node._invalidate_value_caches(self.__get_hxnodes())
+        self.__nodes.clear()
+
+    def __get_hxnodes(self):
+        if self.__hxnodes is None:
+            self.__hxnodes = frozenset(
+                self.__xnodemap.xNodeMapGetNodeByIndex(node_index)
+                for node_index in range(self.__xnodemap.xNodeMapGetNumNodes()))
+        return self.__hxnodes
+
+    def _release(self):
+        # called when the device owning the node map is destroyed. the
+        # cached nodes hold handles that become dangling afterwards
+        if self.__polling_scheduler is not None:
+            self.__polling_scheduler.stop()
+        for worker in list(self.__workers):
+            worker.stop()
+        self.__workers.clear()
+        _node._release_value_caches(self.__get_hxnodes())
+        self.__hxnodes = None
+        self.__nodes.clear()
+        self.__feature_name_index = None
+        self.__interface_types.clear()
 
     def __check_poll_parameter_elapsed_time_millisec(self, elapsed_time_millisec):
         # check types
@@ -102,6 +242,43 @@ class Nodemap():
 
         self.__xnodemap.xNodeMapPoll(elapsed_time_millisec)
 
+    def __get_polling_scheduler(self):
+        if self.__polling_scheduler is None:
+            self.__polling_scheduler = _PollingScheduler(self)
+        return self.__polling_scheduler
+
+    polling_scheduler = property(__get_polling_scheduler)
+    '''
+    The background poller of the node map.
+
+    :getter: Returns the ``PollingScheduler`` instance of the node map.\
+    The same instance is returned every time.\n
+
+    The scheduler calls ``nodemap.poll()`` at the shortest\
+    ``polling_time`` of the node map nodes, with the time that elapsed\
+    since the previous poll, and notifies subscribers when the value of\
+    a node changes.
+
+    **--------------------------------------------------------------**\
+    **---------------------------------------------------------------**
+    '''
+
+    def _get_polling_times(self):
+        # polling_time of every node that is polled, read from the x nodes
+        # so no node instance is created
+        polling_times = []
+        for node_index in range(self.__xnodemap.xNodeMapGetNumNodes()):
+            hxnode = self.__xnodemap.xNodeMapGetNodeByIndex(node_index)
+            polling_time = _xNode(hxnode).xNodeGetPollingTime()
+            # nodes that are not polled have -1 or 0
+            if polling_time > 0:
+                polling_times.append(polling_time)
+        return polling_times
+
+    def _add_worker(self, worker):
+        # worker has a stop() that _release() calls
+        self.__workers.add(worker)
+
     def lock(self):
         '''
         **--------------------------------------------------------------**\
@@ -128,20 +305,32 @@ class Nodemap():
 
     # feature_names -------------------------------------------------------
 
-    def __get_feature_names(self):
-        # have to read it everytime because some features might become
-        # unavailable under certain settings
+    def __get_feature_name_index(self):
+        if self.__feature_name_index is None:
+            self.__feature_name_index = _NameIndex(self.__read_feature_names())
+        return self.__feature_name_index
+
+    def __read_feature_names(self):
+        # works on the x nodes directly, building a Node and a specific
+        # node for every node in the node map is what makes it slow
         num_of_nodes = self.__xnodemap.xNodeMapGetNumNodes()
         nodes_names = []
         for node_index in range(num_of_nodes):
             hxnode = self.__xnodemap.xNodeMapGetNodeByIndex(node_index)
-            node_ = _node.Node(hxnode)
-            if node_.is_feature:
-                specific_node = _node_helpers.cast_from_general_node_to_specific_node_type(
-                    node_)
-                nodes_names.append(specific_node.name)
+            xnode = _xNode(hxnode)
+            if not xnode.xNodeIsFeature():
+                continue
+            if xnode.xNodeGetPrincipalInterfaceType() == \
+                    _InterfaceType.ENUMENTRY:
+                nodes_names.append(_xEnumentry(hxnode).xEnumEntryGetSymbolic())
+            else:
+                nodes_names.append(xnode.xNodeGetName())
 
-        return sorted(nodes_names)
+        return nodes_names
+
+    def __get_feature_names(self):
+        # a copy so the cached index can not be changed by the caller
+        return list(self.__get_feature_name_index().names)
 
     feature_names = property(__get_feature_names)
     '''
@@ -151,10 +340,9 @@ class Nodemap():
     :type: ``list`` of ``str``.\n
 
     :warning:\n
-    - any node becomes unavailable would not show in the \
-    feature_names list.\n
-    - expensive to call because ``arena_api`` acquires all nodes\
-    in the node map then check if ``_node.is_feature`` evaluates to true.
+    - the list is built the first time it is needed, by acquiring all\
+    nodes in the node map and checking if ``_node.is_feature`` evaluates\
+    to true, then it is cached by the node map.\n
     **------------------------------------------------------------------**\
     **-------------------------------------------------------------------**
     '''
@@ -253,28 +441,712 @@ class Nodemap():
     def __get_node(self, node_name):
 
         # input is already checked if it is a str or not
+        specific_node = self.__nodes.get(node_name)
+        if specific_node is not None:
+            return specific_node
+
         hxnode = self.__xnodemap.xNodeMapGetNode(node_name)
 
         if not hxnode:
-            possible_names = self.__find_closest_matches_to_node_name(
-                node_name)
-            if not possible_names:
-                raise ValueError(f'\'{node_name}\' node does not exist '
-                                 f'in this nodemap. Make sure the node name '
-                                 f'is correct or check another nodemap\n')
-            else:
-                raise ValueError(f'\'{node_name}\' node does not exist in '
-                                 f'this nodemap\n'
-                                 f'(some suggestions):\n'
-                                 f'{possible_names}')
+            self.__raise_node_does_not_exist(node_name)
 
         node_ = _node.Node(hxnode)
         specific_node = _node_helpers.cast_from_general_node_to_specific_node_type(
             node_)
+        self.__nodes[node_name] = specific_node
         return specific_node
 
+    # read_values ---------------------------------------------------------
+
+    def read_values(self, nodes_names):
+        '''
+        Reads the values of multiple nodes at once.\n
+        The values are read by node name through the node map, so no\
+        node instance is created. It is the cheapest way to take a\
+        snapshot of many features, for example for telemetry.
+
+        **Args**:
+            nodes_names : it can be:\n
+                - a ``list`` of ``str``.\n
+                - a ``tuple`` of ``str``.\n
+        **Raises**:
+            - ``ValueError`` :
+                - ``nodes_names`` has an element that is not a ``str``.
+                - a node name does not match any node name in this node\
+                map. The exception will suggest similar node names.
+            - ``TypeError`` :
+                - ``nodes_names`` type is not ``list`` nor ``tuple``.
+                - a node is not a string, integer, float, boolean or\
+                enumeration node.
+
+        **Returns**:
+            - a ``dict``, that has node name as a key and the node value\
+            as the value. Enumeration values are the current entry\
+            symbolic ``str``.\n
+
+        **Examples**:\n
+            >>> values = device.nodemap.read_values(
+            >>>     ['ExposureTime', 'Gain', 'PixelFormat', 'DeviceTemperature'])
+            >>> print(values)
+            {'ExposureTime': 5000.0, 'Gain': 0.0, 'PixelFormat': 'Mono8',\
+            'DeviceTemperature': 43.5}
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        if not isinstance(nodes_names, (list, tuple)):
+            raise TypeError(f'expected list or tuple '
+                            f'instead of {type(nodes_names).__name__}')
+        self.__check__get_nodes_as_dict_input_parameter_nodes_names(
+            nodes_names)
+
+        values = {}
+        for node_name in nodes_names:
+            values[node_name] = self.__get_value_reader(node_name)(node_name)
+        return values
+
+    def __get_interface_type(self, node_name):
+        interface_type = self.__interface_types.get(node_name)
+        if interface_type is None:
+            hxnode = self.__xnodemap.xNodeMapGetNode(node_name)
+            if not hxnode:
+                self.__raise_node_does_not_exist(node_name)
+            # not converted to InterfaceType, it has no member for some
+            # node types such as ports
+            interface_type = _xNode(hxnode).xNodeGetPrincipalInterfaceType()
+            self.__interface_types[node_name] = interface_type
+        return interface_type
+
+    def __get_value_reader(self, node_name):
+        reader = self.__get_value_reader_by_type(
+            self.__get_interface_type(node_name))
+        if reader is None:
+            raise TypeError(f'\'{node_name}\' is not a string, integer, '
+                            f'float, boolean, or enumeration node')
+        return reader
+
+    def __get_value_reader_by_type(self, interface_type):
+        if interface_type == _InterfaceType.INTEGER:
+            return self.__xnodemap.xNodeMapGetIntegerValue
+        elif interface_type == _InterfaceType.FLOAT:
+            return self.__xnodemap.xNodeMapGetFloatValue
+        elif interface_type == _InterfaceType.BOOLEAN:
+            return self.__xnodemap.xNodeMapGetBooleanValue
+        elif interface_type == _InterfaceType.ENUMERATION:
+            return self.__xnodemap.xNodeMapGetEnumerationValue
+        elif interface_type == _InterfaceType.STRING:
+            return self.__xnodemap.xNodeMapGetStringValue
+        else:
+            return None
+
+    # accessor ------------------------------------------------------------
+
+    def accessor(self, node_name):
+        '''
+        Creates an accessor, an object with ``get()`` and ``set(value)``\
+        bound to the handle of a node and to the ArenaC getter and setter\
+        of its type.\n
+        Each call is one foreign call: there is no node lookup, no type\
+        check and no wrapper object. It is meant for control loops that\
+        read or write the same node on every frame, such as exposure or\
+        gain updates.
+
+        **Args**:
+            node_name :
+                a ``str``, the name of an integer, float, boolean or\
+                enumeration node.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``node_name`` is not a ``str``.
+                - the node is not an integer, float, boolean or\
+                enumeration node.
+            - ``ValueError`` :
+                - ``node_name`` is not in the node map. The exception will\
+                suggest similar node names.
+
+        **Returns**:
+            - an accessor with:\n
+                - ``get()`` : returns the value of the node. For\
+                enumeration nodes it is the ``int`` value of the current\
+                entry, see ``NodeEnumeration.enumentry_int_values``.\n
+                - ``set(value)`` : sets the value of the node, enumeration\
+                nodes take the ``int`` value of an entry.\n
+                - ``name`` : the node name.\n
+
+        **Examples**:\n
+            >>> exposure_time = device.nodemap.accessor('ExposureTime')
+            >>> for buffer in frames:
+            >>>     exposure_time.set(controller.update(buffer))
+
+        :warning:\n
+        - An accessor must not be used from more than one thread at the\
+        same time.\n
+        - Values are not checked before the call; ArenaC raises for values\
+        out of range or of the wrong type.\n
+        - An accessor must not be used after the device is destroyed.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        if not isinstance(node_name, str):
+            raise TypeError(f'expected str instead of '
+                            f'{type(node_name).__name__}')
+
+        interface_type = self.__get_interface_type(node_name)
+        if interface_type == _InterfaceType.INTEGER:
+            accessor_type = _xIntegerAccessor
+        elif interface_type == _InterfaceType.FLOAT:
+            accessor_type = _xFloatAccessor
+        elif interface_type == _InterfaceType.BOOLEAN:
+            accessor_type = _xBooleanAccessor
+        elif interface_type == _InterfaceType.ENUMERATION:
+            accessor_type = _xEnumerationAccessor
+        else:
+            raise TypeError(f'\'{node_name}\' is not an integer, float, '
+                            f'boolean, or enumeration node')
+
+        return accessor_type(node_name,
+                             self.__xnodemap.xNodeMapGetNode(node_name))
+
+    # apply ---------------------------------------------------------------
+
+    def apply(self, config):
+        '''
+        Writes the values of multiple nodes as one batch.\n
+        The node map is locked for the whole batch. Nodes that already\
+        have the value are not written. If a write fails, the nodes that\
+        were written are set back to their previous values, in reverse\
+        order, and the exception is raised again.
+
+        When ``config`` is a ``dict`` the nodes are written in the order\
+        GenICam dependencies usually need:\n
+            1. selectors, ``...Selector``.\n
+            2. modes and switches, ``...Mode``, ``...Auto`` and\
+            ``...Enable``.\n
+            3. ``PixelFormat``, binning and decimation.\n
+            4. ``Width`` and ``Height``.\n
+            5. offsets, ``OffsetX`` and ``OffsetY``.\n
+            6. the rest of the nodes.\n
+        Nodes in the same group keep the ``dict`` order. Pass a ``list``\
+        of ``(node name, value)`` pairs to write the nodes in exactly the\
+        given order, for example when the same selector is set twice.
+
+        **Args**:
+            config : it can be:\n
+                - a ``dict``, or a mapping such as a ``NodemapSnapshot``,\
+                that has node name as a key and the value to write as the\
+                value.\n
+                - a ``list`` or ``tuple`` of ``(node name, value)`` pairs.\n
+        **Raises**:
+            - ``ValueError`` :
+                - a node name does not match any node name in this node\
+                map. The exception will suggest similar node names.
+            - ``TypeError`` :
+                - ``config`` type is not ``dict``, ``list`` nor ``tuple``.
+                - a node is not a string, integer, float, boolean or\
+                enumeration node.
+                - a value type does not match its node type.
+            - the exception of the write that failed, after the rollback.
+
+        **Returns**:
+            - a ``dict``, that has node name as a key and the value before\
+            the batch as the value, for every node that was written.\
+            Passing it to ``apply()`` undoes the batch.\n
+
+        **Examples**:\n
+            >>> device.nodemap.apply({
+            >>>     'OffsetX': 64,
+            >>>     'Width': 1024,
+            >>>     'PixelFormat': 'Mono12',
+            >>>     'ExposureAuto': 'Off',
+            >>>     'ExposureTime': 2500.0})
+
+        :warning:\n
+        - the rollback is best effort, a node that can not be set back is\
+        skipped.\n
+        - the values are checked by the device only, not by ``arena_api``,\
+        so an out of range value is reported by the write that fails.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        steps = self.__get_apply_steps(config)
+
+        previous_values = {}
+        written = []  # [(node name, previous value, writer)]
+        self.lock()
+        try:
+            for node_name, value, read, write in steps:
+                previous_value = read(node_name)
+                if previous_value == value:
+                    continue
+
+                write(node_name, value)
+                written.append((node_name, previous_value, write))
+                # a node written twice keeps the value before the batch
+                previous_values.setdefault(node_name, previous_value)
+        except BaseException:
+            self.__rollback(written)
+            raise
+        finally:
+            self.unlock()
+
+        return previous_values
+
+    # writes in this order when config is not ordered by the caller
+    __APPLY_ORDER = (
+        lambda name: name.endswith('Selector'),
+        lambda name: name.endswith(('Mode', 'Auto', 'Enable')),
+        lambda name: name == 'PixelFormat' or
+        name.startswith(('Binning', 'Decimation')),
+        lambda name: name in ('Width', 'Height'),
+        lambda name: name.startswith('Offset'),
+    )
+
+    def __get_apply_rank(self, node_name):
+        for rank, matches in enumerate(self.__APPLY_ORDER):
+            if matches(node_name):
+                return rank
+        return len(self.__APPLY_ORDER)
+
+    def __get_apply_steps(self, config):
+        # everything is checked before the first write, so a wrong name or
+        # value type does not leave the node map half configured
+        if isinstance(config, Mapping):
+            items = sorted(config.items(),
+                           key=lambda item: self.__get_apply_rank(item[0]))
+        elif isinstance(config, (list, tuple)):
+            items = list(config)
+        else:
+            raise TypeError(f'expected dict, list, or tuple '
+                            f'instead of {type(config).__name__}')
+
+        steps = []
+        for item in items:
+            if not isinstance(item, (list, tuple)) or len(item) != 2:
+                raise TypeError('expected (node name, value) pairs')
+            node_name, value = item
+            if not isinstance(node_name, str):
+                raise TypeError(f'expected str node name instead of '
+                                f'{type(node_name).__name__}')
+
+            write = self.__get_value_writer(node_name, value)
+            read = self.__get_value_reader(node_name)
+            steps.append((node_name, value, read, write))
+
+        return steps
+
+    def __get_value_writer(self, node_name, value):
+        interface_type = self.__get_interface_type(node_name)
+
+        if interface_type == _InterfaceType.INTEGER:
+            expected_types, expected_name = int, 'int'
+            write = self.__xnodemap.xNodeMapSetIntegerValue
+        elif interface_type == _InterfaceType.FLOAT:
+            expected_types, expected_name = (float, int), 'float'
+            write = self.__xnodemap.xNodeMapSetFloatValue
+        elif interface_type == _InterfaceType.BOOLEAN:
+            expected_types, expected_name = bool, 'bool'
+            write = self.__xnodemap.xNodeMapSetBooleanValue
+        elif interface_type == _InterfaceType.ENUMERATION:
+            expected_types, expected_name = str, 'str'
+            write = self.__xnodemap.xNodeMapSetEnumerationValue
+        elif interface_type == _InterfaceType.STRING:
+            expected_types, expected_name = str, 'str'
+            write = self.__xnodemap.xNodeMapSetStringValue
+        else:
+            raise TypeError(f'\'{node_name}\' is not a string, integer, '
+                            f'float, boolean, or enumeration node')
+
+        # bool is an int but never a valid integer or float value
+        if not isinstance(value, expected_types) or \
+           (isinstance(value, bool) and expected_types is not bool):
+            raise TypeError(f'\'{node_name}\' expected {expected_name} '
+                            f'instead of {type(value).__name__}')
+        return write
+
+    def __rollback(self, written):
+        for node_name, previous_value, write in reversed(written):
+            try:
+                write(node_name, previous_value)
+            except Exception:
+                pass
+
+    # snapshot ------------------------------------------------------------
+
+    def snapshot(self):
+        '''
+        Reads the values of all the writable string, integer, float,\
+        boolean and enumeration features of the node map.\n
+        The node map is locked while the values are read. The values are\
+        read by node name through the node map, no node instance is\
+        created. Read only features, such as ``DeviceTemperature`` or\
+        counters, are left out: they change on their own and\
+        ``nodemap.apply()`` could not write them back.
+
+        **Returns**:
+            - a ``NodemapSnapshot``. Pass ``snapshot.diff(other)`` to\
+            ``nodemap.apply()`` to write only the features that changed.\n
+
+        :warning:\n
+        - features that are not readable and writable at the moment,\
+        because of other settings or because they fail to read, are not in\
+        the snapshot.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        values = {}
+        self.lock()
+        try:
+            for node_name, read in self.__get_snapshot_readers():
+                # the access mode depends on other settings, it is checked
+                # on every snapshot
+                _, access_mode = \
+                    self.__xnodemap.xNodeMapGetNodeAndAccessMode(node_name)
+                if access_mode != _AccessMode.RW:
+                    continue
+
+                try:
+                    values[node_name] = read(node_name)
+                except Exception:
+                    # readable nodes can still fail to read, a missing
+                    # value is what the warning in the docstring promises
+                    continue
+        finally:
+            self.unlock()
+
+        return NodemapSnapshot(values)
+
+    def __get_snapshot_readers(self):
+        # walks the x nodes once. the feature names are not used, they have
+        # the enum entries symbolics that are not node names
+        if self.__snapshot_readers is None:
+            readers = []
+            for node_index in range(self.__xnodemap.xNodeMapGetNumNodes()):
+                xnode = _xNode(
+                    self.__xnodemap.xNodeMapGetNodeByIndex(node_index))
+                if not xnode.xNodeIsFeature():
+                    continue
+                interface_type = xnode.xNodeGetPrincipalInterfaceType()
+                read = self.__get_value_reader_by_type(interface_type)
+                if read is None:
+                    continue
+                node_name = xnode.xNodeGetName()
+                self.__interface_types[node_name] = interface_type
+                readers.append((node_name, read))
+
+            readers.sort(key=lambda reader: reader[0])
+            self.__snapshot_readers = readers
+        return self.__snapshot_readers
+
+    def _get_numeric_value_reader(self, node_name):
+        # the x node map getter of an integer, float or boolean node, for
+        # readers that store the values as numbers
+        interface_type = self.__get_interface_type(node_name)
+        if interface_type not in (_InterfaceType.INTEGER,
+                                  _InterfaceType.FLOAT,
+                                  _InterfaceType.BOOLEAN):
+            raise TypeError(f'\'{node_name}\' is not an integer, float, '
+                            f'or boolean node')
+        return self.__get_value_reader(node_name)
+
+    def __get_value_reader_or_none(self, node_name):
+        try:
+            return self.__get_value_reader(node_name)
+        except (TypeError, ValueError):
+            # not a value node or the name is an enum entry symbolic
+            return None
+
+    # read_selected / write_selected --------------------------------------
+
+    def read_selected(self, selector_name, features=None):
+        '''
+        Reads the features selected by a selector for every value of the\
+        selector, for example ``Gain`` for every ``GainSelector`` entry.\n
+        The node map is locked and the selector is set back to its value\
+        afterwards, even if a read fails.
+
+        **Args**:
+            selector_name :
+                a ``str``, the name of an enumeration or integer selector\
+                node such as ``'GainSelector'`` or ``'ChunkSelector'``.\n
+            features : it can be:\n
+                - ``None``. This is the parameter's default value. All the\
+                string, integer, float, boolean and enumeration features\
+                that the selector selects are read.\n
+                - a ``list`` or ``tuple`` of feature names.\n
+        **Raises**:
+            - ``ValueError`` :
+                - ``selector_name`` does not match any node name in this\
+                node map.
+            - ``TypeError`` :
+                - the node is not an enumeration or integer selector.
+
+        **Returns**:
+            - a ``dict``, that has the selector value (the entry\
+            symbolic or the integer) as a key and a ``dict`` of feature\
+            name to value as the value. Features that are not readable\
+            for a selector value are left out.\n
+
+        **Examples**:\n
+            >>> device.nodemap.read_selected('ChunkSelector',
+            >>>                              ['ChunkEnable'])
+            {'Image': {'ChunkEnable': True}, 'CRC': {'ChunkEnable': False},\
+            ...}
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        selector, selector_values = self.__get_selector(selector_name)
+        if features is None:
+            features = self.__get_selected_value_features(selector)
+        else:
+            if not isinstance(features, (list, tuple)):
+                raise TypeError(f'expected list, tuple, or None '
+                                f'instead of {type(features).__name__}')
+            self.__check__get_nodes_as_dict_input_parameter_nodes_names(
+                features)
+
+        readers = [(name, self.__get_value_reader(name)) for name in features]
+        values = {}
+        original_value = selector.value
+        self.lock()
+        try:
+            for selector_value in selector_values:
+                selector.value = selector_value
+                selected_values = {}
+                for node_name, read in readers:
+                    _, access_mode = \
+                        self.__xnodemap.xNodeMapGetNodeAndAccessMode(
+                            node_name)
+                    if access_mode in (_AccessMode.RO, _AccessMode.RW):
+                        selected_values[node_name] = read(node_name)
+                values[selector_value] = selected_values
+        finally:
+            selector.value = original_value
+            self.unlock()
+
+        return values
+
+    def write_selected(self, selector_name, values):
+        '''
+        Writes features for multiple values of a selector, for example\
+        ``Gain`` for every ``GainSelector`` entry, as one batch.\n
+        The writes go through ``nodemap.apply()``, so the node map is\
+        locked, equal values are skipped and all the writes are rolled\
+        back if one fails. The selector is set back to its value\
+        afterwards.
+
+        **Args**:
+            selector_name :
+                a ``str``, the name of an enumeration or integer selector\
+                node.\n
+            values :
+                a ``dict`` with the same layout ``read_selected()``\
+                returns, selector value to a ``dict`` of feature name to\
+                value.\n
+        **Raises**:
+            - the exceptions of ``nodemap.apply()``.
+            - ``TypeError`` :
+                - the node is not an enumeration or integer selector.
+                - ``values`` is not a ``dict`` of ``dict``.
+
+        **Returns**:
+            - ``None``.\n
+
+        **Examples**:\n
+            >>> device.nodemap.write_selected('ChunkSelector', {
+            >>>     'Image': {'ChunkEnable': True},
+            >>>     'ExposureTime': {'ChunkEnable': True}})
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        selector, _ = self.__get_selector(selector_name)
+        if not isinstance(values, Mapping):
+            raise TypeError(f'expected dict instead of '
+                            f'{type(values).__name__}')
+
+        pairs = []
+        for selector_value, selected_values in values.items():
+            if not isinstance(selected_values, Mapping):
+                raise TypeError(f'expected dict for \'{selector_value}\' '
+                                f'instead of '
+                                f'{type(selected_values).__name__}')
+            pairs.append((selector_name, selector_value))
+            pairs.extend(selected_values.items())
+
+        original_value = selector.value
+        self.lock()
+        try:
+            self.apply(pairs)
+        finally:
+            selector.value = original_value
+            self.unlock()
+
+    def __get_selector(self, selector_name):
+        selector = self.__get_node(selector_name)
+        if not selector.is_selector:
+            raise TypeError(f'\'{selector_name}\' is not a selector')
+
+        if isinstance(selector, _node.NodeEnumeration):
+            selector_values = selector.enumentry_names
+        elif isinstance(selector, _node.NodeInteger):
+            selector_values = range(selector.min, selector.max + 1,
+                                    selector.inc)
+        else:
+            raise TypeError(f'\'{selector_name}\' is not an enumeration or '
+                            f'integer selector')
+
+        return selector, selector_values
+
+    def __get_selected_value_features(self, selector):
+        features = []
+        xselector = selector.xselector
+        for index in range(xselector.xSelectorGetNumSelectedFeatures()):
+            hxnode = xselector.xSelectorGetSelectedFeature(index)
+            node_name = _xNode(hxnode).xNodeGetName()
+            if self.__get_value_reader_or_none(node_name) is not None:
+                features.append(node_name)
+        return features
+
+    # save_config / load_config -------------------------------------------
+
+    def save_config(self, path=None, features=None):
+        '''
+        Saves the values of the streamable features of the node map to a\
+        file, in one native operation. The file can be restored with\
+        ``nodemap.load_config()``.
+
+        **Args**:
+            path : it can be:\n
+                - a ``str`` or a path-like object, the file to write.\n
+                - ``None``. This is the parameter's default value.\
+                ``features.txt`` is written in the current working\
+                directory.\n
+            features : it can be:\n
+                - ``None``. This is the parameter's default value. All\
+                streamable features are saved.\n
+                - a ``str`` or a ``list``/``tuple`` of ``str``, only these\
+                features are saved.\n
+        **Raises**:
+            - ``TypeError`` :
+                - ``path`` type is not ``str``, path-like nor ``None``.
+                - ``features`` type is not ``str``, ``list``, ``tuple``\
+                nor ``None``.
+
+        **Returns**:
+            - ``None``.\n
+
+        **Examples**:\n
+            >>> device.nodemap.save_config('camera_profile.txt')
+            >>> # later, or on another device of the same model
+            >>> device.nodemap.load_config('camera_profile.txt')
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        path = self.__check_config_path(path)
+        features = self.__check_save_config_features(features)
+
+        with self.__open_featurestream() as xfeaturestream:
+            for feature_name in features:
+                xfeaturestream.xFeatureStreamSelect(feature_name)
+
+            if path is None:
+                xfeaturestream.xFeatureStreamWrite()
+            else:
+                xfeaturestream.xFeatureStreamWriteFileName(path)
+
+    def load_config(self, path=None):
+        '''
+        Restores the values saved by ``nodemap.save_config()`` from a file,\
+        in one native operation.
+
+        **Args**:
+            path : it can be:\n
+                - a ``str`` or a path-like object, the file to read.\n
+                - ``None``. This is the parameter's default value.\
+                ``features.txt`` is read from the current working\
+                directory.\n
+        **Raises**:
+            - ``TypeError`` :
+                - ``path`` type is not ``str``, path-like nor ``None``.
+
+        **Returns**:
+            - ``None``.\n
+
+        :warning:\n
+        - streaming must be stopped because some features, such as\
+        ``PixelFormat``, can not be written while the device streams.
+
+        **--------------------------------------------------------------**\
+        **---------------------------------------------------------------**
+        '''
+        path = self.__check_config_path(path)
+
+        with self.__open_featurestream() as xfeaturestream:
+            if path is None:
+                xfeaturestream.xFeatureStreamRead()
+            else:
+                xfeaturestream.xFeatureStreamReadFileName(path)
+
+    def __check_config_path(self, path):
+        if path is None:
+            return None
+        if not isinstance(path, (str, os.PathLike)):
+            raise TypeError(f'expected str, path-like object, or None '
+                            f'instead of {type(path).__name__}')
+        return os.fspath(path)
+
+    def __check_save_config_features(self, features):
+        if features is None:
+            return []
+        if isinstance(features, str):
+            return [features]
+        if not isinstance(features, (list, tuple)):
+            raise TypeError(f'expected str, list, tuple, or None '
+                            f'instead of {type(features).__name__}')
+        for feature_name in features:
+            if not isinstance(feature_name, str):
+                raise TypeError(f'expected list/tuple str elements instead '
+                                f'of {type(feature_name).__name__}')
+        return features
+
+    def __open_featurestream(self):
+
+        # dont move into the __init__ of the cntxmngr because self will
+        # refer to the cntxmngr
+        xnodemap = self.__xnodemap
+
+        class _FeaturestreamCntxmngr():
+
+            def __enter__(self):
+                self.hxfeaturestream = xFeatureStreamCreate(
+                    xnodemap.h_nodemap.value)
+                return _xFeaturestream(self.hxfeaturestream)
+
+            def __exit__(self, *exc):
+                xFeatureStreamDestroy(self.hxfeaturestream)
+
+        return _FeaturestreamCntxmngr()
+
+    # ---------------------------------------------------------------------
+
+    def __raise_node_does_not_exist(self, node_name):
+        possible_names = self.__find_closest_matches_to_node_name(node_name)
+        if not possible_names:
+            raise ValueError(f'\'{node_name}\' node does not exist '
+                             f'in this nodemap. Make sure the node name '
+                             f'is correct or check another nodemap\n')
+        else:
+            raise ValueError(f'\'{node_name}\' node does not exist in '
+                             f'this nodemap\n'
+                             f'(some suggestions):\n'
+                             f'{possible_names}')
+
     def __find_closest_matches_to_node_name(self, find_this):
-        all_nodes_names = self.feature_names
-        close = difflib.get_close_matches(
-            find_this, all_nodes_names, n=16, cutoff=0.15)
-        return close
+        return self.__get_feature_name_index().suggest(
+            find_this, n=16, cutoff=0.15)
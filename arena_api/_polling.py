@@ -0,0 +1,235 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+from time import perf_counter_ns
+
+from arena_api._service import BackgroundService as _BackgroundService
+
+
+class PollingScheduler(_BackgroundService):
+    '''
+    Drives ``nodemap.poll()`` from a background thread. Some nodes, such\
+    as ``DeviceTemperature`` on some devices, declare a ``polling_time``:\
+    their cached value is refreshed only when the node map is polled.\
+    The scheduler polls at the shortest ``polling_time`` of the node map,\
+    passing the time that really elapsed since the last poll, and notifies\
+    the subscribers of a node when its value changes.\n
+    Use ``nodemap.polling_scheduler`` to get the scheduler of a node map;\
+    there is one scheduler per node map.
+
+    >>> def on_temperature(node):
+    >>>     print(f'temperature is {node.value}')
+    >>>
+    >>> scheduler = device.nodemap.polling_scheduler
+    >>> scheduler.subscribe('DeviceTemperature', on_temperature)
+    >>> with scheduler:
+    >>>     # the node map is polled in the background
+    >>>     pass
+
+    :warning:\n
+    - ``system.destroy_device()`` stops the schedulers of the device\
+    node maps.\n
+    - Subscribers called synchronously run on the scheduler thread and\
+    delay the next poll.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    THREAD_NAME = 'arena_api.PollingScheduler'
+
+    def __init__(self, nodemap):
+
+        super().__init__()
+        self.__nodemap = nodemap
+        # {node name : last value read}
+        self.__values = {}
+        self.__interval_millisec = None
+
+        self.poll_count = 0
+
+    # properties ----------------------------------------------------------
+
+    def __get_interval_millisec(self):
+        return self.__interval_millisec
+
+    interval_millisec = property(__get_interval_millisec)
+    '''
+    The time between two polls, the shortest ``polling_time`` of the node\
+    map nodes, found when the scheduler starts.
+
+    :getter: Returns an ``int`` or ``None`` if the scheduler never started.
+    '''
+
+    # subscribe -----------------------------------------------------------
+
+    def subscribe(self, node_name, function, dispatcher=None):
+        '''
+        Calls ``function(node)`` every time the value of the node named\
+        ``node_name`` changes after a poll.
+
+        **Args**:
+            node_name :
+                a ``str``, the name of a string, integer, float, boolean or\
+                enumeration node of the node map.\n
+            function :
+                a callable that takes the node.\n
+            dispatcher : can be\n
+                - ``None``. This is the default value. ``function`` is\
+                called from the scheduler thread.\n
+                - a ``concurrent.futures.Executor``. ``function`` is\
+                submitted to the executor.\n
+                - an ``asyncio.AbstractEventLoop``. ``function`` is\
+                scheduled on the loop, coroutine functions are awaited\
+                on the loop.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``node_name`` is not a ``str``.
+                - ``function`` is not callable.
+                - ``dispatcher`` is not one of the supported types.
+            - ``KeyError`` :
+                - ``node_name`` is not in the node map.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(node_name, str):
+            raise TypeError(f'expected str instead of '
+                            f'{type(node_name).__name__}')
+        self._add_subscriber(node_name, function, dispatcher)
+
+    def unsubscribe(self, node_name, function=None):
+        '''
+        Stops notifying ``function`` about the changes of ``node_name``.\
+        All the subscribers of ``node_name`` are removed if ``function``\
+        is ``None``.
+
+        **Raises**:
+            - ``ValueError`` :
+                - ``node_name`` or ``function`` is not subscribed.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self._remove_subscriber(node_name, function)
+
+    def _on_first_subscriber(self, node_name):
+        # raises KeyError for unknown names before anything changes
+        self.__nodemap[node_name]
+
+    def _on_last_unsubscriber(self, node_name):
+        self.__values.pop(node_name, None)
+
+    # start / stop --------------------------------------------------------
+
+    def start(self):
+        '''
+        Finds the shortest ``polling_time`` of the node map nodes and\
+        starts the scheduler thread. When no node declares a\
+        ``polling_time``, ``nodemap.DEFAULT_POLL_TIME_MILLISEC`` is used.
+
+        **Raises**:
+            - ``BaseException`` :
+                - the scheduler is already running.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        with self._lock:
+            if self.is_running:
+                raise BaseException('the polling scheduler is already '
+                                    'running')
+
+            polling_times = self.__nodemap._get_polling_times()
+            if polling_times:
+                self.__interval_millisec = min(polling_times)
+            else:
+                self.__interval_millisec = \
+                    self.__nodemap.DEFAULT_POLL_TIME_MILLISEC
+
+            # values before the first poll, so the first poll reports only
+            # what it changed
+            self.__values.clear()
+            self.__read_changed_values()
+
+            self._start_thread()
+
+    def stop(self):
+        '''
+        Stops the scheduler thread. The subscriptions are kept for the next\
+        ``start()``. Calling it on a stopped scheduler does nothing.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self._stop_thread()
+
+    # thread --------------------------------------------------------------
+
+    def _run(self):
+
+        interval_sec = self.__interval_millisec / 1000
+        last_poll_ns = perf_counter_ns()
+
+        while not self._wait(interval_sec):
+            # the thread can wake up late, poll() gets the time that really
+            # elapsed. the sub millisecond rest is carried to the next poll
+            elapsed_millisec = (perf_counter_ns() - last_poll_ns) // 1000000
+            if elapsed_millisec <= 0:
+                continue
+            last_poll_ns += elapsed_millisec * 1000000
+
+            try:
+                self.__nodemap.poll(elapsed_millisec)
+            except Exception as exception:
+                # the device is gone, polling again would fail the same way
+                self._record_error(exception)
+                break
+            self.poll_count += 1
+
+            for node_name in self.__read_changed_values():
+                self._notify(node_name, self.__nodemap[node_name])
+
+    def __read_changed_values(self):
+        with self._lock:
+            nodes_names = list(self._subscribers)
+
+        changed = []
+        for node_name in nodes_names:
+            try:
+                value = self.__nodemap.read_values([node_name])[node_name]
+            except Exception as exception:
+                # not readable at the moment
+                self._record_error(exception)
+                continue
+
+            with self._lock:
+                if node_name in self.__values and \
+                   self.__values[node_name] != value:
+                    changed.append(node_name)
+                self.__values[node_name] = value
+
+        return changed
@@ -0,0 +1,162 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+# the parts the background services (EventService, PollingScheduler,
+# DeviceWatcher) have in common: the subscribers of a key, the thread that
+# runs the service, and the error counters.
+#
+# a service implements:
+#   - _run() : the loop of the service thread. it returns when
+#     _is_stopping() is True or when the service can not go on
+#   - _on_thread_exit() : called on the service thread after _run()
+#     returns, whether it returned by itself or because of stop()
+#   - _on_first_subscriber(key) and _on_last_unsubscriber(key) : called
+#     with the lock held when a key gets its first subscriber or loses its
+#     last one. _on_first_subscriber() raises to refuse the key
+
+import threading
+
+from arena_api import _dispatch
+
+
+class BackgroundService:
+
+    THREAD_NAME = 'arena_api.BackgroundService'
+
+    def __init__(self):
+
+        # {key : [(function, dispatcher), ...]}
+        self._subscribers = {}
+        self._lock = threading.RLock()
+        self.__stop = threading.Event()
+        self.__thread = None
+
+        self.error_count = 0
+        self.last_error = None
+
+    def __enter__(self):
+        if not self.is_running:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def __get_is_running(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    is_running = property(__get_is_running)
+    '''
+    ``True`` while the service thread is running.
+
+    :getter: Returns whether the service thread is alive.
+    :type: ``bool``
+    '''
+
+    # subscribers ---------------------------------------------------------
+
+    def _add_subscriber(self, key, function, dispatcher):
+        _dispatch.check_function(function)
+        _dispatch.check_dispatcher(dispatcher)
+
+        with self._lock:
+            if key not in self._subscribers:
+                self._on_first_subscriber(key)
+                self._subscribers[key] = []
+            self._subscribers[key].append((function, dispatcher))
+
+    def _remove_subscriber(self, key, function):
+        with self._lock:
+            if key not in self._subscribers:
+                raise ValueError(f'\'{key}\' has no subscribers')
+
+            if function is None:
+                subscribers = []
+            else:
+                subscribers = [subscriber
+                               for subscriber in self._subscribers[key]
+                               if subscriber[0] is not function]
+                if len(subscribers) == len(self._subscribers[key]):
+                    raise ValueError(f'\'{function}\' is not subscribed to '
+                                     f'\'{key}\'')
+
+            if subscribers:
+                self._subscribers[key] = subscribers
+            else:
+                del self._subscribers[key]
+                self._on_last_unsubscriber(key)
+
+    def _notify(self, key, *args):
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, ()))
+
+        for function, dispatcher in subscribers:
+            try:
+                _dispatch.dispatch(dispatcher, function, *args)
+            except Exception as exception:
+                # a failing subscriber must not stop the service
+                self._record_error(exception)
+
+    def _on_first_subscriber(self, key):
+        pass
+
+    def _on_last_unsubscriber(self, key):
+        pass
+
+    # thread --------------------------------------------------------------
+
+    def _start_thread(self):
+        # called with the lock held by start(), after it checked that the
+        # service is not running
+        self.last_error = None
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run_thread,
+                                         name=self.THREAD_NAME,
+                                         daemon=True)
+        self.__thread.start()
+
+    def _stop_thread(self):
+        self.__stop.set()
+        thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.__thread = None
+
+    def _is_stopping(self):
+        return self.__stop.is_set()
+
+    def _wait(self, seconds):
+        # returns True when stop() is called during the wait
+        return self.__stop.wait(seconds)
+
+    def __run_thread(self):
+        try:
+            self._run()
+        finally:
+            try:
+                self._on_thread_exit()
+            except Exception as exception:
+                self._record_error(exception)
+            with self._lock:
+                if self.__thread is threading.current_thread():
+                    self.__thread = None
+
+    def _run(self):
+        raise NotImplementedError
+
+    def _on_thread_exit(self):
+        pass
+
+    def _record_error(self, exception):
+        self.error_count += 1
+        self.last_error = exception
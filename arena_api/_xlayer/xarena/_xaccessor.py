@@ -0,0 +1,147 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+# accessors bind the ArenaC getter and setter of one node to its handle,
+# with the output value allocated once. get() and set() are a single
+# foreign call each, the argtypes of the setters convert the python value.
+# there is no type checking here, ArenaC reports invalid values
+#
+# the output value is shared by the calls of an accessor, so an accessor
+# must not be used from more than one thread at the same time
+
+from ctypes import byref
+
+from arena_api._xlayer.xarena.arenac import harenac
+from arena_api._xlayer.xarena.arenac_types import (acNode, bool8_t, double,
+                                                   int64_t)
+
+
+class _xAccessor():
+
+    __slots__ = ('name', 'hxnode', '_value', '_value_p', '_c_get', '_c_set')
+
+    def __init__(self, name, hxnode, value, c_get, c_set):
+        if not hxnode:
+            raise TypeError('node handle is None')
+
+        self.name = name
+        self.hxnode = acNode(hxnode)
+        self._value = value
+        self._value_p = byref(value)
+        # looked up once instead of on every call
+        self._c_get = c_get
+        self._c_set = c_set
+
+    def __repr__(self):
+        return f'{type(self).__name__[2:]}(\'{self.name}\')'
+
+
+class _xIntegerAccessor(_xAccessor):
+
+    __slots__ = ()
+
+    def __init__(self, name, hxnode):
+        super().__init__(name, hxnode, int64_t(0),
+                         harenac.acIntegerGetValue,
+                         harenac.acIntegerSetValue)
+
+    def get(self):
+        # AC_ERROR acIntegerGetValue(
+        #   acNode hNode,
+        #   int64_t* pValue)
+        self._c_get(self.hxnode, self._value_p)
+        return self._value.value
+
+    def set(self, value):
+        # AC_ERROR acIntegerSetValue(
+        #   acNode hNode,
+        #   int64_t value)
+        self._c_set(self.hxnode, value)
+
+
+class _xFloatAccessor(_xAccessor):
+
+    __slots__ = ()
+
+    def __init__(self, name, hxnode):
+        super().__init__(name, hxnode, double(0),
+                         harenac.acFloatGetValue,
+                         harenac.acFloatSetValue)
+
+    def get(self):
+        # AC_ERROR acFloatGetValue(
+        #   acNode hNode,
+        #   double* pValue)
+        self._c_get(self.hxnode, self._value_p)
+        return self._value.value
+
+    def set(self, value):
+        # AC_ERROR acFloatSetValue(
+        #   acNode hNode,
+        #   double value)
+        self._c_set(self.hxnode, value)
+
+
+class _xBooleanAccessor(_xAccessor):
+
+    __slots__ = ()
+
+    def __init__(self, name, hxnode):
+        super().__init__(name, hxnode, bool8_t(False),
+                         harenac.acBooleanGetValue,
+                         harenac.acBooleanSetValue)
+
+    def get(self):
+        # AC_ERROR acBooleanGetValue(
+        #   acNode hNode,
+        #   bool8_t* pValue)
+        self._c_get(self.hxnode, self._value_p)
+        return self._value.value
+
+    def set(self, value):
+        # AC_ERROR acBooleanSetValue(
+        #   acNode hNode,
+        #   bool8_t value)
+        self._c_set(self.hxnode, value)
+
+
+class _xEnumerationAccessor(_xAccessor):
+    # the int value of the current entry, the symbolic would need a string
+    # buffer on every call
+
+    __slots__ = ('_entry', '_entry_p', '_c_get_entry_value')
+
+    def __init__(self, name, hxnode):
+        super().__init__(name, hxnode, int64_t(0),
+                         harenac.acEnumerationGetCurrentEntry,
+                         harenac.acEnumerationSetByIntValue)
+        self._c_get_entry_value = harenac.acEnumEntryGetIntValue
+        self._entry = acNode(None)
+        self._entry_p = byref(self._entry)
+
+    def get(self):
+        # AC_ERROR acEnumerationGetCurrentEntry(
+        #   acNode hNode,
+        #   acNode* phEntryNode)
+        self._c_get(self.hxnode, self._entry_p)
+        # AC_ERROR acEnumEntryGetIntValue(
+        #   acNode hNode,
+        #   int64_t* pValue)
+        self._c_get_entry_value(self._entry, self._value_p)
+        return self._value.value
+
+    def set(self, value):
+        # AC_ERROR acEnumerationSetByIntValue(
+        #   acNode hNode,
+        #   int64_t value)
+        self._c_set(self.hxnode, value)
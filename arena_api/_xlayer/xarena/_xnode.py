@@ -11,11 +11,10 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
-from ctypes import POINTER, byref, create_string_buffer
+from ctypes import POINTER, byref, cast, create_string_buffer
 
 from arena_api._xlayer.xarena.arenac import harenac
 from arena_api._xlayer.xarena.arenac_defaults import (
-    XARENA_STR_BUFFER_SIZE_DEFAULT,
     XARENA_STR_BUFFER_SIZE_1000,
     XARENA_STR_BUFFER_SIZE_MAX)
 from arena_api._xlayer.xarena.arenac_types import (ac_access_mode,
@@ -28,6 +27,7 @@ from arena_api._xlayer.xarena.arenac_types import (ac_access_mode,
                                                    ac_visibility, acNode,
                                                    bool8_t, char_ptr, double,
                                                    int64_t, size_t, uint8_t)
+from arena_api._xlayer.xarena._xstrbuffer import xget_str
 
 
 class _xNode():
@@ -88,108 +88,73 @@ class _xNode():
 
     def xNodeGetDescription(self):
 
-        description_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_1000)
-        description_len = size_t(XARENA_STR_BUFFER_SIZE_1000)
         # AC_ERROR acNodeGetDescription(
         #   acNode hNode,
         #   char* pDescriptionBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetDescription(
-            self.hxnode,
-            description_p,
-            byref(description_len))
-
-        return description_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetDescription,
+            self.hxnode)
 
     def xNodeGetDeviceName(self):
 
-        device_name_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        device_name_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeGetDeviceName(
         #   acNode hNode,
         #   char* pDeviceNameBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetDeviceName(
-            self.hxnode,
-            device_name_p,
-            byref(device_name_len))
-
-        return device_name_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetDeviceName,
+            self.hxnode)
 
     def xNodeGetDisplayName(self):
 
-        display_name_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        display_name_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeGetDisplayName(
         #   acNode hNode,
         #   char* pDisplayNameBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetDisplayName(
-            self.hxnode,
-            display_name_p,
-            byref(display_name_len))
-
-        return display_name_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetDisplayName,
+            self.hxnode)
 
     def xNodeGetDocuURL(self):
 
-        doc_url_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_1000)
-        doc_url_len = size_t(XARENA_STR_BUFFER_SIZE_1000)
         # AC_ERROR acNodeGetDocuURL(
         #   acNode hNode,
         #   char* pDocuURLBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetDocuURL(
-            self.hxnode,
-            doc_url_p,
-            byref(doc_url_len))
-
-        return doc_url_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetDocuURL,
+            self.hxnode)
 
     def xNodeGetEventID(self):
 
-        event_id_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        event_id_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeGetEventID(
         #   acNode hNode,
         #   char* pEventIDBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetEventID(
-            self.hxnode,
-            event_id_p,
-            byref(event_id_len))
-
-        return event_id_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetEventID,
+            self.hxnode)
 
     def xNodeGetName(self):
 
-        name_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        name_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeGetName(
         #   acNode hNode,
         #   char* pNameBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetName(
-            self.hxnode,
-            name_p,
-            byref(name_len))
-
-        return name_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetName,
+            self.hxnode)
 
     def xNodeGetFullyQualifiedName(self):
 
-        qualified_name_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        qualified_name_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeGetFullyQualifiedName(
         #   acNode hNode,
         #   char* pNameBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetFullyQualifiedName(
-            self.hxnode,
-            qualified_name_p,
-            byref(qualified_name_len))
-
-        return qualified_name_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetFullyQualifiedName,
+            self.hxnode)
 
     def xNodeGetNamespace(self):
 
@@ -229,18 +194,13 @@ class _xNode():
 
     def xNodeGetToolTip(self):
 
-        tooltip_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_1000)
-        tooltip_len = size_t(XARENA_STR_BUFFER_SIZE_1000)
         # AC_ERROR acNodeGetToolTip(
         #   acNode hNode,
         #   char* pToolTipBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetToolTip(
-            self.hxnode,
-            tooltip_p,
-            byref(tooltip_len))
-
-        return tooltip_p.value.decode()
+        return xget_str(
+            harenac.acNodeGetToolTip,
+            self.hxnode)
 
     def xNodeGetVisibility(self):
 
@@ -364,20 +324,15 @@ class _xNode():
 
     def xNodeGetPropertyName(self, index):
 
-        property_name_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_1000)
-        property_name_len = size_t(XARENA_STR_BUFFER_SIZE_1000)
         # AC_ERROR acNodeGetPropertyName(
         #   acNode hNode,
         #   size_t index,
         #   char* pPropertyNameBuf,
         #   size_t* pBufLen)
-        harenac.acNodeGetPropertyName(
+        return xget_str(
+            harenac.acNodeGetPropertyName,
             self.hxnode,
-            index,
-            property_name_p,
-            byref(property_name_len))
-
-        return property_name_p.value.decode()
+            index)
 
     def xNodeGetProperty(self, property_name, str_buffer_size=None):
 
@@ -626,18 +581,13 @@ class _xString():
 
     def xStringGetValue(self):
 
-        value_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        value_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acStringGetValue(
         #   acNode hNode,
         #   char* pValue,
         #   size_t* pBufLen)
-        harenac.acStringGetValue(
-            self.hxnode,
-            value_p,
-            byref(value_len))
-
-        return value_p.value.decode()
+        return xget_str(
+            harenac.acStringGetValue,
+            self.hxnode)
 
     def xStringGetMaxLength(self):
 
@@ -736,18 +686,13 @@ class _xInteger():
 
     def xIntegerGetUnit(self):
 
-        unit_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        unit_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acIntegerGetUnit(
         #   acNode hNode,
         #   char* pUnitBuf,
         #   size_t* pBufLen)
-        harenac.acIntegerGetUnit(
-            self.hxnode,
-            unit_p,
-            byref(unit_len))
-
-        return unit_p.value.decode()
+        return xget_str(
+            harenac.acIntegerGetUnit,
+            self.hxnode)
 
     # Impose --------------------------------------------------------------
 
@@ -878,19 +823,13 @@ class _xFloat():
 
     def xFloatGetUnit(self):
 
-        unit_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        unit_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
-
         # AC_ERROR acFloatGetUnit(
         #   acNode hNode,
         #   char* pUnitBuf,
         #   size_t* pBufLen)
-        harenac.acFloatGetUnit(
-            self.hxnode,
-            unit_p,
-            byref(unit_len))
-
-        return unit_p.value.decode()
+        return xget_str(
+            harenac.acFloatGetUnit,
+            self.hxnode)
 
     def xFloatGetDisplayNotation(self):
 
@@ -1083,21 +1022,15 @@ class _xEnumeration():
     def xEnumerationGetSymbolicByIndex(self, index):
 
         index = size_t(index)
-        symbolic_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        symbolic_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
-
         # AC_ERROR acEnumerationGetSymbolicByIndex(
         #   acNode hNode,
         #   size_t index,
         #   char* pSymbolicBuf,
         #   size_t* pBufLen)
-        harenac.acEnumerationGetSymbolicByIndex(
+        return xget_str(
+            harenac.acEnumerationGetSymbolicByIndex,
             self.hxnode,
-            index,
-            symbolic_p,
-            byref(symbolic_len))
-
-        return symbolic_p.value.decode()
+            index)
 
     def xEnumerationGetCurrentEntry(self):
 
@@ -1128,18 +1061,13 @@ class _xEnumeration():
 
     def xEnumerationGetCurrentSymbolic(self):
 
-        symbolic_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        symbolic_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acEnumerationGetCurrentSymbolic(
         #   acNode hNode,
         #   char* pSymbolicBuf,
         #   size_t* pBufLen)
-        harenac.acEnumerationGetCurrentSymbolic(
-            self.hxnode,
-            symbolic_p,
-            byref(symbolic_len))
-
-        return symbolic_p.value.decode()
+        return xget_str(
+            harenac.acEnumerationGetCurrentSymbolic,
+            self.hxnode)
 
     # Sets ----------------------------------------------------------------
 
@@ -1201,18 +1129,13 @@ class _xEnumentry():
 
     def xEnumEntryGetSymbolic(self):
 
-        symbolic_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        symbolic_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acEnumEntryGetSymbolic(
         #   acNode hNode,
         #   char* pSymbolicBuf,
         #   size_t* pBufLen)
-        harenac.acEnumEntryGetSymbolic(
-            self.hxnode,
-            symbolic_p,
-            byref(symbolic_len))
-
-        return symbolic_p.value.decode()
+        return xget_str(
+            harenac.acEnumEntryGetSymbolic,
+            self.hxnode)
 
     # Checks --------------------------------------------------------------
 
@@ -1305,18 +1228,43 @@ class _xRegister():
 
     def xRegisterGet(self, register_len):
 
-        buffer_p = uint8_t(0)
-        buffer_len = int64_t(register_len)
+        # ArenaC writes register_len bytes, the buffer must hold all of
+        # them. only the first one is returned, as it always was
+        buffer = bytearray(register_len)
+        self.xRegisterGetInto(memoryview(buffer))
+
+        return buffer[0] if buffer else 0
+
+    def xRegisterGetInto(self, view):
+
+        # view is a writable memoryview of bytes, ArenaC writes into the
+        # memory of the object it views
+        buffer = (uint8_t * view.nbytes).from_buffer(view)
         # AC_ERROR acRegisterGet(
         #   acNode hNode,
         #   uint8_t* pBuf,
         #   int64_t bufLen)
         harenac.acRegisterGet(
             self.hxnode,
-            byref(buffer_p),
-            buffer_len)
+            cast(buffer, POINTER(uint8_t)),
+            view.nbytes)
 
-        return buffer_p.value
+    def xRegisterSetFrom(self, view):
+
+        # view is a memoryview of bytes. read only objects have to be
+        # copied, ctypes can only share writable memory
+        if view.readonly:
+            buffer = (uint8_t * view.nbytes).from_buffer_copy(view)
+        else:
+            buffer = (uint8_t * view.nbytes).from_buffer(view)
+        # AC_ERROR acRegisterSet(
+        #   acNode hNode,
+        #   const uint8_t* pBuf,
+        #   int64_t bufLen)
+        harenac.acRegisterSet(
+            self.hxnode,
+            cast(buffer, POINTER(uint8_t)),
+            view.nbytes)
 
 
 class _xCommand():
@@ -1357,18 +1305,13 @@ class _xValue():
 
     def xValueToString(self):
 
-        value_str_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        value_str_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acValueToString(
         #   acNode hNode,
         #   char* pValueBuf,
         #   size_t* pBufLen)
-        harenac.acValueToString(
-            self.hxnode,
-            value_str_p,
-            byref(value_str_len))
-
-        return value_str_p.value.decode()
+        return xget_str(
+            harenac.acValueToString,
+            self.hxnode)
 
     def xValueFromString(self, value):
 
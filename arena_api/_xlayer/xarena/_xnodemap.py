@@ -11,12 +11,11 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
-from ctypes import POINTER, byref, create_string_buffer
+from ctypes import POINTER, byref
 
 from arena_api._xlayer.xarena.arenac import harenac
-from arena_api._xlayer.xarena.arenac_defaults import \
-    XARENA_STR_BUFFER_SIZE_DEFAULT
 from arena_api._xlayer.xarena.arenac_types import *
+from arena_api._xlayer.xarena._xstrbuffer import xget_str
 
 
 class _xNodemap():
@@ -36,18 +35,13 @@ class _xNodemap():
 
     def xNodeMapGetDeviceName(self):
 
-        device_name_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeMapGetDeviceName(
         #   acNodeMap hNodeMap,
         #   char* pDeviceNameBuf,
         #   size_t* pBufLen)
-        harenac.acNodeMapGetDeviceName(
-            self.h_nodemap,
-            device_name_p,
-            byref(buf_len))
-
-        return device_name_p.value.decode()
+        return xget_str(
+            harenac.acNodeMapGetDeviceName,
+            self.h_nodemap)
 
     def xNodeMapPoll(self, elapsed_time_milsec):
 
@@ -174,20 +168,15 @@ class _xNodemap():
     def xNodeMapGetStringValue(self, node_name):
 
         node_name_p = char_ptr(node_name.encode())
-        str_value_buf_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        str_value_buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeMapGetStringValue(
         #   acNodeMap hNodeMap,
         #   char* pNodeName,
         #   char* pValueBuf,
         #   size_t* pBufLen)
-        harenac.acNodeMapGetStringValue(
+        return xget_str(
+            harenac.acNodeMapGetStringValue,
             self.h_nodemap,
-            node_name_p,
-            str_value_buf_p,
-            byref(str_value_buf_len))
-
-        return str_value_buf_p.value.decode()
+            node_name_p)
 
     def xNodeMapGetIntegerValue(self, node_name):
 
@@ -237,20 +226,15 @@ class _xNodemap():
     def xNodeMapGetEnumerationValue(self, node_name):
 
         node_name_p = char_ptr(node_name.encode())
-        symbolic_value_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        symbolic_value_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acNodeMapGetEnumerationValue(
         #   acNodeMap hNodeMap,
         #   char * pNodeName,
         #   char* pSymbolicBuf,
         #   size_t* pBufLen)
-        harenac.acNodeMapGetEnumerationValue(
+        return xget_str(
+            harenac.acNodeMapGetEnumerationValue,
             self.h_nodemap,
-            node_name_p,
-            symbolic_value_p,
-            byref(symbolic_value_len))
-
-        return symbolic_value_p.value.decode()
+            node_name_p)
 
     # Set node value
 
@@ -258,17 +242,14 @@ class _xNodemap():
 
         node_name_p = char_ptr(node_name.encode())
         value_p = char_ptr(value.encode())
-        value_len = size_t(len(value))
         # AC_ERROR acNodeMapSetStringValue(
         #   acNodeMap hNodeMap,
         #   char * pNodeName,
-        #   char* pSymbolicBuf,
-        #   size_t* pBufLen)
+        #   char* pValue)
         harenac.acNodeMapSetStringValue(
             self.h_nodemap,
             node_name_p,
-            value_p,
-            byref(value_len))
+            value_p)
 
     def xNodeMapSetIntegerValue(self, node_name, value):
 
@@ -281,7 +262,7 @@ class _xNodemap():
         harenac.acNodeMapSetIntegerValue(
             self.h_nodemap,
             node_name_p,
-            byref(value))
+            value)
 
     def xNodeMapSetFloatValue(self, node_name, value):
 
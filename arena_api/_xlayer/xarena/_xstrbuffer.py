@@ -0,0 +1,73 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+# string getters of ArenaC take a buffer and its length as the last two
+# arguments, for example:
+#   AC_ERROR acNodeGetName(
+#       acNode hNode,
+#       char* pNameBuf,
+#       size_t* pBufLen)
+# instead of allocating a buffer on every call, every thread keeps a few
+# buffers and reuses them. when a value does not fit, the length of the
+# value is probed by passing a NULL buffer, then the call is retried with a
+# buffer that fits, which replaces the smaller one in the pool
+#
+# this module must not import harenac, arenac_configurator imports it
+
+import threading
+from ctypes import byref, create_string_buffer
+
+from arena_api._xlayer.xarena.arenac_defaults import \
+    XARENA_STR_BUFFER_SIZE_1000
+from arena_api._xlayer.xarena.arenac_types import size_t
+
+
+class BufferTooSmallError(Exception):
+    # raised for AC_ERR_BUFFER_TOO_SMALL. it is an Exception, the type the
+    # error was raised as before, so existing handlers still catch it
+    pass
+
+
+class _StrBufferPool(threading.local):
+
+    def __init__(self):
+        # a stack, so a getter called while another one is running on the
+        # same thread (from a callback for example) gets its own buffer
+        self.free_buffers = []
+
+
+_pool = _StrBufferPool()
+
+
+def xget_str(c_function, *args):
+
+    free_buffers = _pool.free_buffers
+    if free_buffers:
+        str_buf_p = free_buffers.pop()
+    else:
+        str_buf_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_1000)
+
+    try:
+        str_buf_len = size_t(len(str_buf_p))
+        try:
+            c_function(*args, str_buf_p, byref(str_buf_len))
+        except BufferTooSmallError:
+            # probe the length of the value, then read it again
+            str_buf_len = size_t(0)
+            c_function(*args, None, byref(str_buf_len))
+            str_buf_p = create_string_buffer(str_buf_len.value)
+            c_function(*args, str_buf_p, byref(str_buf_len))
+
+        return str_buf_p.value.decode()
+    finally:
+        free_buffers.append(str_buf_p)
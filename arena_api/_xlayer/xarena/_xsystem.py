@@ -13,14 +13,13 @@
 
 import os
 import sys
-from ctypes import byref, create_string_buffer
+from ctypes import byref
 
 from arena_api._xlayer.xarena.arenac import harenac
-from arena_api._xlayer.xarena.arenac_defaults import \
-    XARENA_STR_BUFFER_SIZE_DEFAULT
 from arena_api._xlayer.xarena.arenac_types import (acDevice, acNodeMap,
                                                    acSystem, bool8_t, size_t,
                                                    uint32_t, uint64_t)
+from arena_api._xlayer.xarena._xstrbuffer import xget_str
 
 
 class _xSystem:
@@ -62,20 +61,15 @@ class _xSystem:
     def xSystemGetInterfaceIpAddressStr(self, index):
 
         index = size_t(index)
-        ip_str_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetInterfaceIpAddressStr(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pIpAddressStr,
         #   size_t * pBufLen)
-        harenac.acSystemGetInterfaceIpAddressStr(
+        return xget_str(
+            harenac.acSystemGetInterfaceIpAddressStr,
             self.__acsystem,
-            index,
-            ip_str_p,
-            byref(buf_len))
-
-        return (ip_str_p.value).decode()  # check if it work with no brakets
+            index)
 
     def xSystemGetInterfaceSubnetMask(self, index):
 
@@ -95,21 +89,15 @@ class _xSystem:
     def xSystemGetInterfaceSubnetMaskStr(self, index):
 
         index = size_t(index)
-        subnet_mask_str_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetInterfaceSubnetMaskStr(
         #   acSystem hSystem,
         #   size_t index,
         #   char* pSubnetMaskStr,
         #   size_t* pBufLen)
-        harenac.acSystemGetInterfaceSubnetMaskStr(
+        return xget_str(
+            harenac.acSystemGetInterfaceSubnetMaskStr,
             self.__acsystem,
-            index,
-            subnet_mask_str_p,
-            byref(buf_len))
-
-        return (subnet_mask_str_p.value).decode()
+            index)
 
     def xSystemGetInterfaceMacAddress(self, index):
 
@@ -129,21 +117,15 @@ class _xSystem:
     def xSystemGetInterfaceMacAddressStr(self, index):
 
         index = size_t(index)
-        mac_address_str_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetInterfaceMacAddressStr(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pMacAddress,
         #   size_t * pBufLen)
-        harenac.acSystemGetInterfaceMacAddressStr(
+        return xget_str(
+            harenac.acSystemGetInterfaceMacAddressStr,
             self.__acsystem,
-            index,
-            mac_address_str_p,
-            byref(buf_len))
-
-        return (mac_address_str_p.value).decode()
+            index)
 
     #
     # Device ------------------------------------------------------------------
@@ -234,59 +216,41 @@ class _xSystem:
     def xSystemGetDeviceModel(self, index):
 
         index = size_t(index)
-        device_model_str_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceModel(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pModelNameBuf,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceModel(
+        return xget_str(
+            harenac.acSystemGetDeviceModel,
             self.__acsystem,
-            index,
-            device_model_str_p,
-            byref(buf_len))
-
-        return (device_model_str_p.value).decode()
+            index)
 
     def xSystemGetDeviceVendor(self, index):
 
         index = size_t(index)
-        device_vendor_str_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceVendor(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pVendorNameBuf,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceVendor(
+        return xget_str(
+            harenac.acSystemGetDeviceVendor,
             self.__acsystem,
-            index,
-            device_vendor_str_p,
-            byref(buf_len))
-
-        return (device_vendor_str_p.value).decode()
+            index)
 
     def xSystemGetDeviceSerial(self, index):
 
         index = size_t(index)
-        device_serial_str_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceSerial(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pSerialNumberBuf,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceSerial(
+        return xget_str(
+            harenac.acSystemGetDeviceSerial,
             self.__acsystem,
-            index,
-            device_serial_str_p,
-            byref(buf_len))
-
-        return (device_serial_str_p.value).decode()
+            index)
 
     def xSystemGetDeviceIpAddress(self, index):
 
@@ -306,20 +270,15 @@ class _xSystem:
     def xSystemGetDeviceIpAddressStr(self, index):
 
         index = size_t(index)
-        ip_str_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceIpAddressStr(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pIpAddressStr,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceIpAddressStr(
+        return xget_str(
+            harenac.acSystemGetDeviceIpAddressStr,
             self.__acsystem,
-            index,
-            ip_str_p,
-            byref(buf_len))
-
-        return (ip_str_p.value).decode()
+            index)
 
     def xSystemGetDeviceSubnetMask(self, index):
 
@@ -339,21 +298,15 @@ class _xSystem:
     def xSystemGetDeviceSubnetMaskStr(self, index):
 
         index = size_t(index)
-        subnet_mask_str_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceSubnetMaskStr(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pSubnetMaskStr,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceSubnetMaskStr(
+        return xget_str(
+            harenac.acSystemGetDeviceSubnetMaskStr,
             self.__acsystem,
-            index,
-            subnet_mask_str_p,
-            byref(buf_len))
-
-        return (subnet_mask_str_p.value).decode()
+            index)
 
     def xSystemGetDeviceDefaultGateway(self, index):
 
@@ -373,20 +326,15 @@ class _xSystem:
     def xSystemGetDeviceDefaultGatewayStr(self, index):
 
         index = size_t(index)
-        gateway_str_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceDefaultGatewayStr(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pDefaultGatewayStr,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceDefaultGatewayStr(
+        return xget_str(
+            harenac.acSystemGetDeviceDefaultGatewayStr,
             self.__acsystem,
-            index,
-            gateway_str_p,
-            byref(buf_len))
-
-        return (gateway_str_p.value).decode()
+            index)
 
     def xSystemGetDeviceMacAddress(self, index):
 
@@ -406,40 +354,28 @@ class _xSystem:
     def xSystemGetDeviceMacAddressStr(self, index):
 
         index = size_t(index)
-        mac_address_str_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceMacAddressStr(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pMacAddress,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceMacAddressStr(
+        return xget_str(
+            harenac.acSystemGetDeviceMacAddressStr,
             self.__acsystem,
-            index,
-            mac_address_str_p,
-            byref(buf_len))
-
-        return (mac_address_str_p.value).decode()
+            index)
 
     def xSystemGetDeviceUserDefinedName(self, index):
 
         index = size_t(index)
-        user_defined_name_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceUserDefinedName(
         #   acSystem hSystem,
         #   size_t index,
         #   char * pUserDefinedName,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceUserDefinedName(
+        return xget_str(
+            harenac.acSystemGetDeviceUserDefinedName,
             self.__acsystem,
-            index,
-            user_defined_name_p,
-            byref(buf_len))
-
-        return (user_defined_name_p.value).decode()
+            index)
 
     def xSystemForceIpAddress(self, mac, ip, subnetmask, defaultgateway):
 
@@ -464,21 +400,15 @@ class _xSystem:
     def xSystemGetDeviceVersion(self, index):
 
         index = size_t(index)
-        user_defined_name_p = create_string_buffer(
-            XARENA_STR_BUFFER_SIZE_DEFAULT)
-        buf_len = size_t(XARENA_STR_BUFFER_SIZE_DEFAULT)
         # AC_ERROR acSystemGetDeviceVersion
         #   (acSystem hSystem,
         #   size_t index,
         #   char * pDeviceVersion,
         #   size_t * pBufLen)
-        harenac.acSystemGetDeviceVersion(
+        return xget_str(
+            harenac.acSystemGetDeviceVersion,
             self.__acsystem,
-            index,
-            user_defined_name_p,
-            byref(buf_len))
-
-        return (user_defined_name_p.value).decode()
+            index)
 
     def xSystemIsDeviceDHCPConfigurationEnabled(self, index):
 
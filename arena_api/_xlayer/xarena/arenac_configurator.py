@@ -17,6 +17,7 @@ from inspect import currentframe, getframeinfo
 
 from arena_api._xlayer.binary.binary_function_return_value_checker import \
     BinaryFunctionReturnValueChecker
+from arena_api._xlayer.xarena._xstrbuffer import BufferTooSmallError
 from arena_api._xlayer.xarena.arenac_types import (
     ac_access_mode, ac_bayer_algorithm, ac_caching_mode, ac_display_notation,
     ac_error, ac_inc_mode, ac_interface_type, ac_namespace, ac_payload_type,
@@ -71,7 +72,6 @@ _error_to_exception_dict = {
     _ArenaCErr.ABORT.value: Exception,
     _ArenaCErr.NOT_AVAILABLE.value: Exception,
     _ArenaCErr.INVALID_ADDRESS.value: Exception,
-    _ArenaCErr.BUFFER_TOO_SMALL.value: Exception,
     _ArenaCErr.PARSING_CHUNK_DATA.value: Exception,
     _ArenaCErr.RESOURCE_EXHAUSTED.value: Exception,
     _ArenaCErr.ACCESS_DENIED.value: Exception,
@@ -88,6 +88,8 @@ _error_to_exception_dict = {
     _ArenaCErr.INVALID_INDEX.value: IndexError,
     _ArenaCErr.INVALID_VALUE.value: ValueError,
     _ArenaCErr.OUT_OF_MEMORY.value: MemoryError,
+    # Exception subclass, retried by the string getters with a bigger buffer
+    _ArenaCErr.BUFFER_TOO_SMALL.value: BufferTooSmallError,
 }
 
 
@@ -1166,18 +1168,22 @@ class ArenaCConfigurator:
 
         # AC_ERROR acNodeMapGetEnumerationValue(
         #   acNodeMap hNodeMap,
+        #   char* pNodeName,
         #   char* pSymbolicBuf,
         #   size_t* pBufLen)
         self.handle.acNodeMapGetEnumerationValue.argtypes = [
             acNodeMap,
             char_ptr,
+            char_ptr,
             POINTER(size_t)]
 
         # AC_ERROR acNodeMapSetStringValue(
         #   acNodeMap hNodeMap,
+        #   char* pNodeName,
         #   char* pValue)
         self.handle.acNodeMapSetStringValue.argtypes = [
             acNodeMap,
+            char_ptr,
             char_ptr]
 
         # AC_ERROR acNodeMapSetIntegerValue(
@@ -1209,9 +1215,11 @@ class ArenaCConfigurator:
 
         # AC_ERROR acNodeMapSetEnumerationValue(
         #   acNodeMap hNodeMap,
+        #   char* pNodeName,
         #   char* pSymbolic)
         self.handle.acNodeMapSetEnumerationValue.argtypes = [
             acNodeMap,
+            char_ptr,
             char_ptr]
 
         # AC_ERROR acNodeMapExecute(
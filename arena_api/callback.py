@@ -11,6 +11,10 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
+import threading
+import time
+import warnings
+from bisect import bisect_left
 from ctypes import cast, py_object
 from functools import wraps
 
@@ -60,6 +64,7 @@ class _Callback:
 
         self.xcb = _xCallback()
         self.registry = {}
+        self.__SLOW_CALLBACK_THRESHOLD_MILLISEC = None
 
         # TODO Make global to the file
         self._supported_objs = (
@@ -252,6 +257,10 @@ class _Callback:
         - ``obj`` the instance object that the callback function is registered on.
         - ``callback_function`` the callback function to call.
         - ``args_and_kwargs`` the optional arguments that was passed to ``callback.register()``
+        - ``stats`` a ``_CallbackStats`` instance that keeps the invocation \
+        count, the execution time histogram, the max execution time, and \
+        the dispatch latency of the callback function. \
+        ``stats.as_dict()`` returns a snapshot of them.
 
         **Args**:
             handle:
@@ -277,6 +286,79 @@ class _Callback:
         else:
             return None
 
+    def report(self):
+        '''
+        Collects the execution statistics of every registered callback.\
+        It is useful to find which callback function is slow when buffers\
+        or events start to be lost.\n
+
+        **Args**:
+            - ``None``\n
+
+        **Returns**:
+            - ``dict`` that has the callback handle as a key and the value\
+            returned from ``handle_info(handle)['stats'].as_dict()``.\
+            The entries are sorted by ``max_millisec``, slowest first.\n
+
+        **Examples**:\n
+            >>> for handle, stats in callback.report().items():
+            >>>     print(f'{callback.handle_info(handle)["callback_function"].__name__} '
+            >>>           f'calls = {stats["count"]} '
+            >>>           f'max = {stats["max_millisec"]} ms')
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        all_stats = {handle: handle_info['stats'].as_dict()
+                     for handle, handle_info in self.registry.items()}
+        return dict(sorted(all_stats.items(),
+                           key=lambda item: item[1]['max_millisec'],
+                           reverse=True))
+
+    # SLOW_CALLBACK_THRESHOLD_MILLISEC ----------------------------------------
+
+    def __get_SLOW_CALLBACK_THRESHOLD_MILLISEC(self):
+        return self.__SLOW_CALLBACK_THRESHOLD_MILLISEC
+
+    def __set_SLOW_CALLBACK_THRESHOLD_MILLISEC(self, value):
+        if value is None:
+            self.__SLOW_CALLBACK_THRESHOLD_MILLISEC = None
+            _CallbackStats.slow_threshold_ns = None
+            return
+
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise TypeError(f'expected int, float or None instead of '
+                            f'{type(value).__name__}')
+        if value <= 0:
+            raise ValueError('SLOW_CALLBACK_THRESHOLD_MILLISEC must be > 0 '
+                             'or None')
+
+        self.__SLOW_CALLBACK_THRESHOLD_MILLISEC = value
+        _CallbackStats.slow_threshold_ns = int(value * 1_000_000)
+
+    SLOW_CALLBACK_THRESHOLD_MILLISEC = property(
+        __get_SLOW_CALLBACK_THRESHOLD_MILLISEC,
+        __set_SLOW_CALLBACK_THRESHOLD_MILLISEC)
+    '''
+    Execution time, in millisec, after which a callback function is\
+    reported as slow. The default value is ``None`` which disables\
+    the check.
+
+    :getter: Returns the current threshold.
+    :setter: Sets the threshold. expects a positive int, float or ``None``.
+    :type: int, float, None
+
+    When a callback function takes longer than the threshold to return,\
+    a ``RuntimeWarning`` is issued, from the thread that made the\
+    callback, naming the slow function and its handle. The message is the\
+    same for every call of a callback function, so the warnings filters\
+    show it once; ``callback.report()`` has the number of slow calls and\
+    the execution times.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
     def _deregister_handle(self, callback_handle):
 
         # deregister ----------------------------------------------------------
@@ -307,15 +389,20 @@ class _DeviceCallback:
     @staticmethod
     def register(device, callback_function, *args, **kwargs):
         args_and_kwargs = [args, kwargs]
+        stats = _CallbackStats(callback_function)
         registry_entry = {
             'obj': device,
             'callback_function': callback_function,
-            'args_and_kwargs': args_and_kwargs
+            'args_and_kwargs': args_and_kwargs,
+            'stats': stats
         }
         # xlayer call
+        # the stats travel with the user data so the decorated function
+        # can update them without looking up the handle
         callback_handle, to_add_to_registry_entry = device._xdev.xDeviceRegisterImageCallback(
             callback_function,
-            args_and_kwargs)
+            [args, kwargs, stats])
+        stats.handle = callback_handle
         registry_entry.update(to_add_to_registry_entry)
         return {callback_handle: registry_entry}
 
@@ -343,15 +430,18 @@ class _NodeCallback:
         # made and is not overwritten when the user registers a second callback.
         '''
         args_and_kwargs = [args, kwargs]
+        stats = _CallbackStats(callback_function)
         registry_entry = {
             'obj': node,
             'callback_function': callback_function,
-            'args_and_kwargs': args_and_kwargs
+            'args_and_kwargs': args_and_kwargs,
+            'stats': stats
         }
         # xlayer call
         callback_handle, to_add_to_registry_entry = self.xcb.xCallbackRegister(node.xnode.hxnode.value,
                                                                                callback_function,
-                                                                               args_and_kwargs)
+                                                                               [args, kwargs, stats])
+        stats.handle = callback_handle
         registry_entry.update(to_add_to_registry_entry)
         return {callback_handle: registry_entry}
 
@@ -366,6 +456,113 @@ class _NodeCallback:
                 raise os_error
 
 
+class _CallbackStats:
+    '''
+    Execution statistics of one registered callback function. An instance
+    is created by ``callback.register()`` and is accessible from
+    ``callback.handle_info(handle)['stats']``.
+
+    - ``count`` number of times the callback function has been called.
+    - ``total_ns`` and ``max_ns`` the total and the longest execution \
+    time of the callback function.
+    - ``max_dispatch_ns`` the longest time between ``ArenaC`` calling into \
+    python and the callback function starting. It is the time spent \
+    wrapping the native buffer/node before the user code runs. It is \
+    measured from the first line of the python wrapper: the time \
+    ``ArenaC`` took to deliver the buffer or the event, and to take \
+    the GIL, is not part of it.
+    - ``histogram`` execution time counts per bucket, the upper bound of \
+    each bucket, in microsec, is in ``_CallbackStats.HISTOGRAM_BOUNDS_MICROSEC``.
+    - ``slow_count`` number of calls that took longer than \
+    ``callback.SLOW_CALLBACK_THRESHOLD_MILLISEC``.
+    '''
+
+    # upper bound of each bucket, the last bucket has no upper bound
+    HISTOGRAM_BOUNDS_MICROSEC = (50, 100, 250, 500, 1000, 2500, 5000,
+                                 10000, 25000, 50000, 100000, 250000)
+    __HISTOGRAM_BOUNDS_NS = tuple(
+        bound * 1000 for bound in HISTOGRAM_BOUNDS_MICROSEC)
+
+    # shared by all instances; set from callback.SLOW_CALLBACK_THRESHOLD_MILLISEC
+    slow_threshold_ns = None
+
+    def __init__(self, callback_function):
+        self.callback_function_name = getattr(
+            callback_function, '__name__', repr(callback_function))
+        self.handle = None
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.total_dispatch_ns = 0
+        self.max_dispatch_ns = 0
+        self.slow_count = 0
+        self.histogram = [0] * (len(self.HISTOGRAM_BOUNDS_MICROSEC) + 1)
+        # callbacks of different devices come from different ArenaC threads
+        self.__lock = threading.Lock()
+
+    def record(self, entered_ns, started_ns, finished_ns):
+        dispatch_ns = started_ns - entered_ns
+        elapsed_ns = finished_ns - started_ns
+        bucket = bisect_left(self.__HISTOGRAM_BOUNDS_NS, elapsed_ns)
+
+        with self.__lock:
+            self.count += 1
+            self.total_ns += elapsed_ns
+            self.total_dispatch_ns += dispatch_ns
+            self.histogram[bucket] += 1
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+            if dispatch_ns > self.max_dispatch_ns:
+                self.max_dispatch_ns = dispatch_ns
+
+        slow_threshold_ns = self.slow_threshold_ns
+        if slow_threshold_ns is not None and elapsed_ns > slow_threshold_ns:
+            with self.__lock:
+                self.slow_count += 1
+            # no timing in the message, the warnings filters would see a
+            # new message on every call and show all of them
+            warnings.warn(f'callback function \'{self.callback_function_name}\' '
+                          f'(handle {self.handle}) is slower than '
+                          f'SLOW_CALLBACK_THRESHOLD_MILLISEC, see '
+                          f'callback.report()',
+                          RuntimeWarning)
+
+    def reset(self):
+        with self.__lock:
+            self.count = 0
+            self.total_ns = 0
+            self.max_ns = 0
+            self.total_dispatch_ns = 0
+            self.max_dispatch_ns = 0
+            self.slow_count = 0
+            self.histogram = [0] * len(self.histogram)
+
+    def as_dict(self):
+        with self.__lock:
+            count = self.count
+            histogram = list(self.histogram)
+            total_ns = self.total_ns
+            max_ns = self.max_ns
+            total_dispatch_ns = self.total_dispatch_ns
+            max_dispatch_ns = self.max_dispatch_ns
+            slow_count = self.slow_count
+
+        labels = [f'<={bound}us' for bound in self.HISTOGRAM_BOUNDS_MICROSEC]
+        labels.append(f'>{self.HISTOGRAM_BOUNDS_MICROSEC[-1]}us')
+
+        return {
+            'callback_function': self.callback_function_name,
+            'count': count,
+            'mean_millisec': total_ns / count / 1_000_000 if count else 0.0,
+            'max_millisec': max_ns / 1_000_000,
+            'mean_dispatch_millisec': (total_dispatch_ns / count / 1_000_000
+                                       if count else 0.0),
+            'max_dispatch_millisec': max_dispatch_ns / 1_000_000,
+            'slow_count': slow_count,
+            'histogram': dict(zip(labels, histogram))
+        }
+
+
 ###############################################################################
 #
 # Callback Decorators
@@ -436,13 +633,19 @@ class _DeviceCallbackFunctionDecorator:
 
         @wraps(callback_function)
         def wrapper_func(buffer_, user_data):
+            entered_ns = time.perf_counter_ns()
             buf = _buffer._Buffer(buffer_)
 
             var = cast(user_data, py_object).value
             positional_args = var[0]
             keyword_args = var[1]
+            stats = var[2]
 
-            return callback_function(buf, *positional_args, **keyword_args)
+            started_ns = time.perf_counter_ns()
+            try:
+                return callback_function(buf, *positional_args, **keyword_args)
+            finally:
+                stats.record(entered_ns, started_ns, time.perf_counter_ns())
 
         return wrapper_func
 
@@ -460,6 +663,7 @@ class _NodeCallbackFunctionDecorator:
 
         @wraps(callback_function)
         def wrapper_func(node_, user_data):
+            entered_ns = time.perf_counter_ns()
             var = cast(user_data, py_object).value
 
             base_node = _Node(node_)
@@ -468,8 +672,13 @@ class _NodeCallbackFunctionDecorator:
 
             positional_args = var[0]
             keyword_args = var[1]
+            stats = var[2]
 
-            return callback_function(node, *positional_args, **keyword_args)
+            started_ns = time.perf_counter_ns()
+            try:
+                return callback_function(node, *positional_args, **keyword_args)
+            finally:
+                stats.record(entered_ns, started_ns, time.perf_counter_ns())
 
         return wrapper_func
 
@@ -0,0 +1,347 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+from collections import namedtuple
+
+from arena_api._service import BackgroundService as _BackgroundService
+
+DeviceEvent = namedtuple('DeviceEvent', ['type', 'device_info',
+                                         'previous_device_info'])
+DeviceEvent.__doc__ = '''
+What a ``DeviceWatcher`` subscriber receives. ``type`` is\
+``DeviceWatcher.CONNECT``, ``DeviceWatcher.DISCONNECT`` or\
+``DeviceWatcher.IP_CHANGE``, ``device_info`` is the device info ``dict``\
+of the device, as returned by ``system.device_infos``. For an IP change,\
+``previous_device_info`` is the device info before the change, otherwise\
+it is ``None``.
+'''
+
+
+class DeviceWatcher(_BackgroundService):
+    '''
+    Runs the device discovery on a background thread and keeps a table of\
+    the connected devices, so an application notices devices that are\
+    plugged, unplugged or get a new IP address without calling\
+    ``system.device_infos``, which blocks for\
+    ``system.DEVICE_INFOS_TIMEOUT_MILLISEC``, in a loop.\
+    Use ``system.device_watcher`` to get the watcher; there is one watcher\
+    per system.
+
+    The watcher:\n
+    - discovers the devices every ``interval_millisec``. The interval\
+    starts at ``min_interval_millisec`` and doubles after every discovery\
+    that found no change, up to ``max_interval_millisec``. Any change\
+    brings it back to ``min_interval_millisec``, so a device that\
+    reboots is seen again quickly,\n
+    - reports a device as disconnected only after it missed\
+    ``missed_discoveries_to_disconnect`` discoveries in a row, so a late\
+    discovery answer is not reported as a disconnection,\n
+    - and notifies the subscribers with a ``DeviceEvent``.\n
+
+    >>> def on_device_event(event):
+    >>>     print(event.type, event.device_info['serial'])
+    >>>
+    >>> watcher = system.device_watcher
+    >>> watcher.subscribe(DeviceWatcher.CONNECT, on_device_event)
+    >>> watcher.subscribe(DeviceWatcher.DISCONNECT, on_device_event)
+    >>> with watcher:
+    >>>     # devices are discovered in the background
+    >>>     pass
+
+    :warning:\n
+    - The devices found by the first discovery after ``start()`` are\
+    reported as connected.\n
+    - A discovery blocks the watcher thread for\
+    ``system.DEVICE_INFOS_TIMEOUT_MILLISEC``, but not the other threads:\
+    the discovery lock of the system is only taken to compare the\
+    device list with the device infos, which are read again when a\
+    device was added, removed, moved or got a new IP address. It does\
+    not use ``system.DEVICE_INFOS_TTL_MILLISEC``.\n
+    - Subscribers called synchronously run on the watcher thread and\
+    delay the next discovery.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    CONNECT = 'connect'
+    DISCONNECT = 'disconnect'
+    IP_CHANGE = 'ip_change'
+
+    EVENT_TYPES = (CONNECT, DISCONNECT, IP_CHANGE)
+
+    THREAD_NAME = 'arena_api.DeviceWatcher'
+
+    def __init__(self, system):
+
+        super().__init__()
+        self.__system = system
+        # {mac : device info} of the connected devices
+        self.__devices = {}
+        # {mac : number of discoveries in a row that missed the device}
+        self.__missed_discoveries = {}
+        self.__min_interval_millisec = 100
+        self.__max_interval_millisec = 2000
+        self.__interval_millisec = self.__min_interval_millisec
+
+        self.missed_discoveries_to_disconnect = 2
+        self.discovery_count = 0
+
+    # properties ----------------------------------------------------------
+
+    def __get_devices(self):
+        with self._lock:
+            return {mac: dict(device_info)
+                    for mac, device_info in self.__devices.items()}
+
+    devices = property(__get_devices)
+    '''
+    The devices the watcher sees as connected.
+
+    :getter: Returns a ``dict`` with the MAC address of every connected\
+    device as a key and its device info ``dict`` as the value. It is a\
+    copy of the table, it does not block on the discovery.
+    '''
+
+    def __get_interval_millisec(self):
+        return self.__interval_millisec
+
+    interval_millisec = property(__get_interval_millisec)
+    '''
+    The time until the next discovery.
+
+    :getter: Returns an ``int``, between ``min_interval_millisec`` and\
+    ``max_interval_millisec``.
+    '''
+
+    def __get_min_interval_millisec(self):
+        return self.__min_interval_millisec
+
+    def __set_min_interval_millisec(self, value):
+        value = self.__check_interval_millisec(value)
+        if value > self.__max_interval_millisec:
+            raise ValueError('min_interval_millisec must be <= '
+                             'max_interval_millisec')
+        self.__min_interval_millisec = value
+
+    min_interval_millisec = property(__get_min_interval_millisec,
+                                     __set_min_interval_millisec)
+    '''
+    The time between two discoveries after a change. The default value\
+    is ``100`` millisec.
+
+    :getter: Returns the shortest interval.
+    :setter: Sets the shortest interval. expects an int > 0 and <=\
+    ``max_interval_millisec``.
+    :type: int
+    '''
+
+    def __get_max_interval_millisec(self):
+        return self.__max_interval_millisec
+
+    def __set_max_interval_millisec(self, value):
+        value = self.__check_interval_millisec(value)
+        if value < self.__min_interval_millisec:
+            raise ValueError('max_interval_millisec must be >= '
+                             'min_interval_millisec')
+        self.__max_interval_millisec = value
+
+    max_interval_millisec = property(__get_max_interval_millisec,
+                                     __set_max_interval_millisec)
+    '''
+    The time between two discoveries when nothing changes for a while.\
+    The default value is ``2000`` millisec.
+
+    :getter: Returns the longest interval.
+    :setter: Sets the longest interval. expects an int >=\
+    ``min_interval_millisec``.
+    :type: int
+    '''
+
+    @staticmethod
+    def __check_interval_millisec(value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(f'expected int instead of '
+                            f'{type(value).__name__}')
+        if value <= 0:
+            raise ValueError('the interval must be > 0')
+        return value
+
+    # subscribe -----------------------------------------------------------
+
+    def subscribe(self, event_type, function, dispatcher=None):
+        '''
+        Calls ``function(event)`` with a ``DeviceEvent`` every time a\
+        device event of ``event_type`` happens.
+
+        **Args**:
+            event_type :
+                ``DeviceWatcher.CONNECT``, ``DeviceWatcher.DISCONNECT`` or\
+                ``DeviceWatcher.IP_CHANGE``.\n
+            function :
+                a callable that takes a ``DeviceEvent``.\n
+            dispatcher : can be\n
+                - ``None``. This is the default value. ``function`` is\
+                called from the watcher thread.\n
+                - a ``concurrent.futures.Executor``. ``function`` is\
+                submitted to the executor.\n
+                - an ``asyncio.AbstractEventLoop``. ``function`` is\
+                scheduled on the loop, coroutine functions are awaited\
+                on the loop.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``event_type`` is not a ``str``.
+                - ``function`` is not callable.
+                - ``dispatcher`` is not one of the supported types.
+            - ``ValueError`` :
+                - ``event_type`` is not one of ``DeviceWatcher.EVENT_TYPES``.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(event_type, str):
+            raise TypeError(f'expected str instead of '
+                            f'{type(event_type).__name__}')
+        self._add_subscriber(event_type, function, dispatcher)
+
+    def unsubscribe(self, event_type, function=None):
+        '''
+        Stops notifying ``function`` about the events of ``event_type``.\
+        All the subscribers of ``event_type`` are removed if ``function``\
+        is ``None``.
+
+        **Raises**:
+            - ``ValueError`` :
+                - ``event_type`` or ``function`` is not subscribed.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self._remove_subscriber(event_type, function)
+
+    def _on_first_subscriber(self, event_type):
+        # raises ValueError for unknown types before anything changes
+        if event_type not in self.EVENT_TYPES:
+            raise ValueError(f'expected one of {self.EVENT_TYPES} instead '
+                             f'of \'{event_type}\'')
+
+    # start / stop --------------------------------------------------------
+
+    def start(self):
+        '''
+        Starts the watcher thread. The table of the connected devices is\
+        emptied, the first discovery reports every device it finds as\
+        connected.
+
+        **Raises**:
+            - ``BaseException`` :
+                - the watcher is already running.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        with self._lock:
+            if self.is_running:
+                raise BaseException('the device watcher is already running')
+
+            self.__devices.clear()
+            self.__missed_discoveries.clear()
+            self.__interval_millisec = self.__min_interval_millisec
+
+            self._start_thread()
+
+    def stop(self):
+        '''
+        Stops the watcher thread after the discovery in progress. The\
+        subscriptions are kept for the next ``start()``. Calling it on a\
+        stopped watcher does nothing.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self._stop_thread()
+
+    # thread --------------------------------------------------------------
+
+    def _run(self):
+
+        while True:
+            try:
+                # blocks for DEVICE_INFOS_TIMEOUT_MILLISEC on this thread
+                device_infos = self.__system._discover_device_infos()
+            except Exception as exception:
+                # an interface can be down for a while, try again later
+                # instead of giving up
+                self._record_error(exception)
+                self.__interval_millisec = self.__max_interval_millisec
+            else:
+                self.discovery_count += 1
+                if self.__update_devices(device_infos):
+                    self.__interval_millisec = self.__min_interval_millisec
+                else:
+                    self.__interval_millisec = min(
+                        self.__interval_millisec * 2,
+                        self.__max_interval_millisec)
+
+            if self._wait(self.__interval_millisec / 1000):
+                break
+
+    def __update_devices(self, device_infos):
+        # returns whether the discovery found a change, including devices
+        # that missed it but are not reported as disconnected yet
+        events = []
+        found_macs = set()
+
+        with self._lock:
+            for device_info in device_infos:
+                mac = device_info['mac']
+                found_macs.add(mac)
+                self.__missed_discoveries.pop(mac, None)
+
+                previous_device_info = self.__devices.get(mac)
+                self.__devices[mac] = device_info
+                if previous_device_info is None:
+                    events.append(DeviceEvent(self.CONNECT, device_info, None))
+                elif previous_device_info['ip'] != device_info['ip']:
+                    events.append(DeviceEvent(self.IP_CHANGE, device_info,
+                                              previous_device_info))
+
+            missing_macs = [mac for mac in self.__devices
+                            if mac not in found_macs]
+            for mac in missing_macs:
+                missed = self.__missed_discoveries.get(mac, 0) + 1
+                if missed < self.missed_discoveries_to_disconnect:
+                    self.__missed_discoveries[mac] = missed
+                    continue
+                # not stored when one miss is enough
+                self.__missed_discoveries.pop(mac, None)
+                events.append(DeviceEvent(self.DISCONNECT,
+                                          self.__devices.pop(mac), None))
+
+        for event in events:
+            self._notify(event.type, event)
+
+        return bool(events or missing_macs)
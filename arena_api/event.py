@@ -0,0 +1,538 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+
+from arena_api._device import Device as _Device
+from arena_api._service import BackgroundService as _BackgroundService
+from arena_api.buffer import _Buffer
+from arena_api.callback import callback as _callback
+from arena_api.callback import callback_function as _callback_function
+
+
+@_callback_function.node.on_update
+def _on_node_update(node, event_service, node_name):
+    event_service._notify(node_name, node)
+
+
+class EventService(_BackgroundService):
+    '''
+    Runs the events engine of a device on a background thread so events
+    are processed without a hand-written ``device.wait_on_event()`` loop.
+    Use ``device.event_service`` to get the service of a device; there is
+    one service per device.
+
+    The service:\n
+    - calls ``device.initialize_events()`` when it starts,\n
+    - calls ``device.wait_on_event()`` continuously from its thread,\
+    counting the waits that timed out,\n
+    - notifies the subscribers of a node when processing an event\
+    updates the node,\n
+    - and calls ``device.deinitialize_events()`` when it stops.\n
+
+    >>> def on_exposure_end(node):
+    >>>     print(f'exposure ended at {node.value}')
+    >>>
+    >>> device.nodemap['EventSelector'].value = 'ExposureEnd'
+    >>> device.nodemap['EventNotification'].value = 'On'
+    >>> service = device.event_service
+    >>> service.subscribe('EventExposureEndTimestamp', on_exposure_end)
+    >>> with service:
+    >>>     # grab buffers, events are handled in the background
+    >>>     pass
+
+    :warning:\n
+    - ``system.destroy_device()`` stops the service of the device.\n
+    - Subscribers called synchronously run on the service thread and\
+    delay the processing of the next event.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    THREAD_NAME = 'arena_api.EventService'
+
+    def __init__(self, device):
+
+        if not isinstance(device, _Device):
+            raise TypeError(f'expected Device instead of '
+                            f'{type(device).__name__}')
+
+        super().__init__()
+        self.__device = device
+        # {node name : callback handle}
+        self.__callback_handles = {}
+        self.__events_initialized = False
+
+        self.POLL_TIMEOUT_MILLISEC = 100
+        self.event_count = 0
+        self.timeout_count = 0
+
+    # subscribe -----------------------------------------------------------
+
+    def subscribe(self, node_name, function, dispatcher=None):
+        '''
+        Calls ``function(node)`` every time processing an event updates\
+        the node named ``node_name`` in ``device.nodemap``.
+
+        **Args**:
+            node_name :
+                a ``str``, the name of a node in ``device.nodemap``.\
+                for example ``'EventExposureEnd'`` or\
+                ``'EventExposureEndTimestamp'``.\n
+            function :
+                a callable that takes the updated node.\n
+            dispatcher : can be\n
+                - ``None``. This is the default value. ``function`` is\
+                called from the service thread.\n
+                - a ``concurrent.futures.Executor``. ``function`` is\
+                submitted to the executor.\n
+                - an ``asyncio.AbstractEventLoop``. ``function`` is\
+                scheduled on the loop, coroutine functions are awaited\
+                on the loop.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``node_name`` is not a ``str``.
+                - ``function`` is not callable.
+                - ``dispatcher`` is not one of the supported types.
+            - ``KeyError`` :
+                - ``node_name`` is not in ``device.nodemap``.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(node_name, str):
+            raise TypeError(f'expected str instead of '
+                            f'{type(node_name).__name__}')
+        self._add_subscriber(node_name, function, dispatcher)
+
+    def unsubscribe(self, node_name, function=None):
+        '''
+        Stops notifying ``function`` about the updates of ``node_name``.\
+        All the subscribers of ``node_name`` are removed if ``function``\
+        is ``None``.
+
+        **Raises**:
+            - ``ValueError`` :
+                - ``node_name`` or ``function`` is not subscribed.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self._remove_subscriber(node_name, function)
+
+    def _on_first_subscriber(self, node_name):
+        # raises KeyError for unknown names before anything changes
+        node = self.__device.nodemap[node_name]
+        if self.is_running:
+            self.__register_node(node_name, node)
+
+    def _on_last_unsubscriber(self, node_name):
+        self.__deregister_node(node_name)
+
+    # start / stop --------------------------------------------------------
+
+    def start(self):
+        '''
+        Initializes the events of the device and starts the service thread.
+
+        **Raises**:
+            - ``BaseException`` :
+                - the service is already running.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        with self._lock:
+            if self.is_running:
+                raise BaseException('the event service is already running')
+
+            self.__device.initialize_events()
+            self.__events_initialized = True
+            try:
+                for node_name in self._subscribers:
+                    self.__register_node(node_name,
+                                         self.__device.nodemap[node_name])
+            except BaseException:
+                self.__deregister_all_nodes()
+                self.__device.deinitialize_events()
+                self.__events_initialized = False
+                raise
+
+            self._start_thread()
+
+    def stop(self):
+        '''
+        Stops the service thread, deregisters the node callbacks of the\
+        subscribers and deinitializes the events of the device. The\
+        subscriptions are kept for the next ``start()``. Calling it on a\
+        stopped service does nothing.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self._stop_thread()
+        self.__release_events()
+
+    # thread --------------------------------------------------------------
+
+    def _run(self):
+
+        while not self._is_stopping():
+            try:
+                self.__device.wait_on_event(self.POLL_TIMEOUT_MILLISEC)
+            except TimeoutError:
+                self.timeout_count += 1
+                continue
+            except Exception as exception:
+                # the device is gone or the events engine is broken,
+                # waiting again would fail the same way
+                self._record_error(exception)
+                break
+
+            self.event_count += 1
+
+    def _on_thread_exit(self):
+        # the service stopped by itself, do what stop() would do so the
+        # events are not left initialized
+        if not self._is_stopping():
+            self.__release_events()
+
+    def __release_events(self):
+        with self._lock:
+            self.__deregister_all_nodes()
+            if self.__events_initialized:
+                self.__events_initialized = False
+                self.__device.deinitialize_events()
+
+    def __get_device(self):
+        return self.__device
+
+    _device = property(__get_device)
+
+    # node callbacks ------------------------------------------------------
+
+    def __register_node(self, node_name, node):
+        self.__callback_handles[node_name] = _callback.register(
+            node, _on_node_update, self, node_name)
+
+    def __deregister_node(self, node_name):
+        handle = self.__callback_handles.pop(node_name, None)
+        if handle is not None:
+            _callback.deregister(handle)
+
+    def __deregister_all_nodes(self):
+        for node_name in list(self.__callback_handles):
+            self.__deregister_node(node_name)
+
+
+EventRecord = namedtuple('EventRecord', ['name', 'timestamp_ns', 'frame_id'])
+EventRecord.__doc__ = '''
+An event recorded by ``EventIndex``.
+
+- ``name`` the event name, for example ``'ExposureEnd'``.
+- ``timestamp_ns`` the value of ``Event<name>Timestamp`` node.
+- ``frame_id`` the value of ``Event<name>FrameID`` node or ``None`` if\
+the device does not have the node.
+'''
+
+
+class _EventRing:
+    # a fixed size ring of records ordered by timestamp. the ring is a
+    # sequence of timestamps so bisect can search it without copying
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = [0] * capacity
+        self.records = [None] * capacity
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        return self.timestamps[(self.start + index) % self.capacity]
+
+    def record_at(self, index):
+        return self.records[(self.start + index) % self.capacity]
+
+    def append(self, record):
+        # timestamps of one event only go back when the device timestamp
+        # is reset (TimestampReset, DeviceReset); older records can not be
+        # matched to new frames anymore
+        if self.size and record.timestamp_ns < self[self.size - 1]:
+            self.clear()
+
+        if self.size == self.capacity:
+            position = self.start
+            self.start = (self.start + 1) % self.capacity
+        else:
+            position = (self.start + self.size) % self.capacity
+            self.size += 1
+
+        self.timestamps[position] = record.timestamp_ns
+        self.records[position] = record
+
+    def clear(self):
+        self.records = [None] * self.capacity
+        self.start = 0
+        self.size = 0
+
+
+class EventIndex:
+    '''
+    Keeps the most recent events of a device in rings ordered by\
+    timestamp, one ring per event name, so a buffer can be joined to its\
+    events by ``buffer.timestamp_ns`` with a binary search instead of a\
+    linear search over all the recorded events.
+
+    Events are recorded by ``event_index.record()`` or, for the\
+    ``Event<name>`` nodes of ``device.nodemap``, by attaching the index to\
+    the event service of the device ``event_index.attach()``.
+
+    >>> event_index = EventIndex(capacity=512)
+    >>> event_index.attach(device.event_service, ['ExposureEnd'])
+    >>> with device.event_service, device.start_stream():
+    >>>     buffer = device.get_buffer()
+    >>>     events = event_index.join(buffer, tolerance_ns=1_000_000)
+    >>>     print(events['ExposureEnd'])
+    >>>     device.requeue_buffer(buffer)
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    def __init__(self, capacity=1024):
+
+        if not isinstance(capacity, int):
+            raise TypeError(f'expected int instead of '
+                            f'{type(capacity).__name__}')
+        if capacity < 1:
+            raise ValueError('capacity must be > 0')
+
+        self.__capacity = capacity
+        self.__rings = {}  # {event name : _EventRing}
+        self.__lock = threading.Lock()
+
+    def __get_event_names(self):
+        with self.__lock:
+            return list(self.__rings.keys())
+
+    event_names = property(__get_event_names)
+    '''
+    Names of the events that have been recorded.
+
+    :getter: Returns a ``list`` of ``str``.
+    '''
+
+    def __len__(self):
+        with self.__lock:
+            return sum(len(ring) for ring in self.__rings.values())
+
+    # record --------------------------------------------------------------
+
+    def record(self, event_name, timestamp_ns, frame_id=None):
+        '''
+        Adds an event to the ring of ``event_name``. When the ring is full\
+        the oldest event is dropped.
+
+        **Args**:
+            event_name :
+                a ``str``, the event name, for example ``'ExposureEnd'``.\n
+            timestamp_ns :
+                an ``int``, the device timestamp of the event.\n
+            frame_id :
+                the frame id of the event or ``None``.\n
+
+        **Returns**:
+            - the ``EventRecord`` that has been added.\n
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(timestamp_ns, int):
+            raise TypeError(f'expected int instead of '
+                            f'{type(timestamp_ns).__name__}')
+
+        record = EventRecord(event_name, timestamp_ns, frame_id)
+        with self.__lock:
+            ring = self.__rings.get(event_name)
+            if ring is None:
+                ring = _EventRing(self.__capacity)
+                self.__rings[event_name] = ring
+            ring.append(record)
+
+        return record
+
+    def attach(self, event_service, event_names):
+        '''
+        Records the events of ``event_names`` every time the event service\
+        processes them. For an event name such as ``'ExposureEnd'`` the\
+        index subscribes to ``EventExposureEnd`` node, and records the\
+        values of ``EventExposureEndTimestamp`` and, if the device has it,\
+        ``EventExposureEndFrameID`` nodes.
+
+        **Args**:
+            event_service :
+                an ``EventService`` instance, ``device.event_service``.\n
+            event_names :
+                a ``str`` or a ``list`` of ``str``.\n
+
+        **Raises**:
+            - ``KeyError`` :
+                - ``Event<name>`` or ``Event<name>Timestamp`` node is not in\
+                ``device.nodemap``.
+
+        **Returns**:
+            - ``None``.
+
+        :warning:\n
+        - Enable the notification of the events on the device\
+        (``EventSelector``, ``EventNotification``) to receive them.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(event_service, EventService):
+            raise TypeError(f'expected EventService instead of '
+                            f'{type(event_service).__name__}')
+
+        if isinstance(event_names, str):
+            event_names = [event_names]
+
+        nodemap = event_service._device.nodemap
+        for event_name in event_names:
+            timestamp_node = nodemap[f'Event{event_name}Timestamp']
+            try:
+                frame_id_node = nodemap[f'Event{event_name}FrameID']
+            except KeyError:
+                frame_id_node = None
+
+            def on_event(_, event_name=event_name,
+                         timestamp_node=timestamp_node,
+                         frame_id_node=frame_id_node):
+                frame_id = frame_id_node.value if frame_id_node else None
+                self.record(event_name, timestamp_node.value, frame_id)
+
+            # recording is cheap, so it is done on the service thread
+            event_service.subscribe(f'Event{event_name}', on_event)
+
+    def clear(self):
+        '''
+        Removes all the recorded events.
+        '''
+        with self.__lock:
+            self.__rings.clear()
+
+    # lookups -------------------------------------------------------------
+
+    def before(self, event_name, timestamp_ns):
+        '''
+        Returns the latest ``EventRecord`` of ``event_name`` with a\
+        timestamp <= ``timestamp_ns``, or ``None``.
+        '''
+        with self.__lock:
+            ring = self.__rings.get(event_name)
+            if not ring:
+                return None
+            index = bisect_left(ring, timestamp_ns + 1) - 1
+            return ring.record_at(index) if index >= 0 else None
+
+    def after(self, event_name, timestamp_ns):
+        '''
+        Returns the earliest ``EventRecord`` of ``event_name`` with a\
+        timestamp >= ``timestamp_ns``, or ``None``.
+        '''
+        with self.__lock:
+            ring = self.__rings.get(event_name)
+            if not ring:
+                return None
+            index = bisect_left(ring, timestamp_ns)
+            return ring.record_at(index) if index < len(ring) else None
+
+    def nearest(self, event_name, timestamp_ns, tolerance_ns=None):
+        '''
+        Returns the ``EventRecord`` of ``event_name`` closest to\
+        ``timestamp_ns``, or ``None`` if there is no event or the closest\
+        one is further than ``tolerance_ns``.
+        '''
+        with self.__lock:
+            ring = self.__rings.get(event_name)
+            if not ring:
+                return None
+
+            index = bisect_left(ring, timestamp_ns)
+            candidates = []
+            if index < len(ring):
+                candidates.append(index)
+            if index > 0:
+                candidates.append(index - 1)
+            closest = min(candidates,
+                          key=lambda i: abs(ring[i] - timestamp_ns))
+
+            if tolerance_ns is not None and \
+               abs(ring[closest] - timestamp_ns) > tolerance_ns:
+                return None
+            return ring.record_at(closest)
+
+    def join(self, buffer, event_names=None, tolerance_ns=None):
+        '''
+        Finds the events closest to a buffer.
+
+        **Args**:
+            buffer :
+                a ``Buffer`` instance or an ``int`` timestamp in nanoseconds.\n
+            event_names :
+                a ``list`` of event names. ``None``, the default value,\
+                joins all the recorded event names.\n
+            tolerance_ns :
+                maximum distance between the buffer and an event timestamp.\
+                ``None``, the default value, does not limit the distance.\n
+
+        **Returns**:
+            - a ``dict`` that has the event name as a key and the closest\
+            ``EventRecord`` or ``None`` as a value.\n
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if isinstance(buffer, _Buffer):
+            timestamp_ns = buffer.timestamp_ns
+        elif isinstance(buffer, int):
+            timestamp_ns = buffer
+        else:
+            raise TypeError(f'expected Buffer or int instead of '
+                            f'{type(buffer).__name__}')
+
+        if event_names is None:
+            event_names = self.event_names
+
+        return {event_name: self.nearest(event_name, timestamp_ns,
+                                         tolerance_ns)
+                for event_name in event_names}
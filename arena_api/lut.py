@@ -0,0 +1,152 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+from collections import namedtuple
+from time import perf_counter
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError(f'arena_api.lut needs numpy\n'
+                      f'run \'pip install arena-api[numpy]\' or '
+                      f'\'pip install numpy\'')
+
+from arena_api import _node
+from arena_api._nodemap import Nodemap as _Nodemap
+
+# layout of the LUTValueAll register, one little endian 32 bit value per
+# LUT entry
+LUT_VALUE_ALL_DTYPE = np.dtype('<i4')
+
+LUTUploadStats = namedtuple('LUTUploadStats', ['entries', 'native_calls',
+                                               'seconds', 'entries_per_sec'])
+LUTUploadStats.__doc__ = '''
+The result of ``upload_lut()``: the number of LUT entries written, the\
+number of native calls made to write them, the time the upload took and\
+the resulting throughput.
+'''
+
+
+def upload_lut(nodemap, table, lut_selector=None):
+    '''
+    Uploads a whole lookup table with the minimum number of native calls.\n
+    When the device has a ``LUTValueAll`` register, the table is written\
+    to it in one call, see ``LUT_VALUE_ALL_DTYPE`` for the layout.\
+    Otherwise every entry is written through ``LUTIndex`` and\
+    ``LUTValue`` with node accessors, two calls per entry. The node map is\
+    locked during the upload.
+
+    >>> table = (numpy.linspace(0, 1, 4096) ** (1 / 2.2) * 4095)
+    >>> stats = upload_lut(device.nodemap, table.astype(numpy.int32))
+    >>> print(f'{stats.entries_per_sec:.0f} entries/s')
+
+    **Args**:
+        nodemap :
+            a ``Nodemap``, usually ``device.nodemap``.\n
+        table :
+            a one dimension ``numpy.ndarray`` of integers, or anything\
+            ``numpy.asarray()`` converts to one. It must have an entry for\
+            every ``LUTIndex``, each in the range of ``LUTValue``.\n
+        lut_selector :
+            a ``str``, the ``LUTSelector`` entry to upload to, for example\
+            ``'Luminance'``. ``None``, the default value, uploads to the\
+            LUT currently selected.\n
+
+    **Raises**:
+        - ``TypeError`` :
+            - ``nodemap`` is not a ``Nodemap``.
+            - ``table`` is not an integer array.
+        - ``ValueError`` :
+            - ``table`` is not one dimension, or its length is not the\
+            number of LUT entries.
+            - a value of ``table`` is out of the ``[min, max]`` range of\
+            ``LUTValue``, or does not fit ``LUT_VALUE_ALL_DTYPE`` when\
+            ``LUTValueAll`` is used. Nothing is written then.
+        - ``KeyError`` :
+            - the device has no ``LUTIndex`` or ``LUTValue`` node.
+
+    **Returns**:
+        - a ``LUTUploadStats``.\n
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+    if not isinstance(nodemap, _Nodemap):
+        raise TypeError(f'expected Nodemap instead of '
+                        f'{type(nodemap).__name__}')
+
+    table = np.asarray(table)
+    if not np.issubdtype(table.dtype, np.integer):
+        raise TypeError(f'expected an integer array instead of '
+                        f'{table.dtype} array')
+    if table.ndim != 1:
+        raise ValueError(f'expected a one dimension array instead of '
+                         f'{table.ndim} dimensions')
+
+    nodemap.lock()
+    try:
+        if lut_selector is not None:
+            nodemap['LUTSelector'].value = lut_selector
+
+        lut_index = nodemap['LUTIndex']
+        entries = lut_index.max - lut_index.min + 1
+        if len(table) != entries:
+            raise ValueError(f'the LUT has {entries} entries, the table '
+                             f'has {len(table)}')
+
+        # checked before the conversions, astype() wraps the values that
+        # do not fit silently
+        lut_value = nodemap['LUTValue']
+        _check_table_range(table, lut_value.min, lut_value.max, 'LUTValue')
+
+        started = perf_counter()
+        lut_value_all = _get_lut_value_all(nodemap)
+        if lut_value_all is not None:
+            dtype_info = np.iinfo(LUT_VALUE_ALL_DTYPE)
+            _check_table_range(table, dtype_info.min, dtype_info.max,
+                               'LUTValueAll')
+            lut_value_all.write_from(
+                np.ascontiguousarray(table, dtype=LUT_VALUE_ALL_DTYPE))
+            native_calls = 1
+        else:
+            index_accessor = nodemap.accessor('LUTIndex')
+            value_accessor = nodemap.accessor('LUTValue')
+            for index, value in enumerate(table.tolist(), lut_index.min):
+                index_accessor.set(index)
+                value_accessor.set(value)
+            native_calls = 2 * entries
+        seconds = perf_counter() - started
+    finally:
+        nodemap.unlock()
+
+    return LUTUploadStats(entries, native_calls, seconds,
+                          entries / seconds if seconds > 0 else float('inf'))
+
+
+def _check_table_range(table, minimum, maximum, name):
+    out_of_range = np.flatnonzero((table < minimum) | (table > maximum))
+    if len(out_of_range):
+        index = out_of_range[0]
+        raise ValueError(f'{len(out_of_range)} table values are out of the '
+                         f'{name} range [{minimum}, {maximum}], the first '
+                         f'is table[{index}] = {table[index]}')
+
+
+def _get_lut_value_all(nodemap):
+    try:
+        lut_value_all = nodemap['LUTValueAll']
+    except KeyError:
+        return None
+    if not isinstance(lut_value_all, _node.NodeRegister):
+        return None
+    return lut_value_all
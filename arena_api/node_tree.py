@@ -0,0 +1,286 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import re
+
+from arena_api import _node
+from arena_api._nodemap import Nodemap as _Nodemap
+
+
+class NodeTree:
+    '''
+    The category hierarchy of a node map with the static metadata of every\
+    node, so a configuration UI can be built without walking\
+    ``NodeCategory.features`` on the device every session.\n
+    A tree is exported once per device model and firmware, and saved as\
+    JSON. ``NodeTree.load()`` reads the saved tree when one exists for the\
+    ``DeviceModelName`` and ``DeviceVersion`` of the device, so the device\
+    is only touched for the current values.
+
+    Every node of the tree is a ``dict`` with the keys:\n
+        - ``'name'``, ``'type'`` (``'Category'``, ``'Integer'``,\
+        ``'Float'``, ``'Boolean'``, ``'Enumeration'``, ``'String'``,\
+        ``'Command'``, ``'Register'``), ``'display_name'``,\
+        ``'description'``, ``'tool_tip'``, ``'visibility'``.\n
+        - ``'features'`` : the child nodes of a category.\n
+        - ``'unit'``, ``'representation'``, ``'min'``, ``'max'``,\
+        ``'inc'`` : for integer and float nodes.\n
+        - ``'entries'`` : for enumeration nodes, a ``list`` of ``dict``\
+        with ``'name'``, ``'display_name'`` and ``'value'``.\n
+    Metadata that can not be read from a node is left out.
+
+    >>> tree = NodeTree.load(device.nodemap)
+    >>> for node in tree:
+    >>>     if node['type'] == 'Float':
+    >>>         print(node['name'], node['min'], node['max'])
+    >>> exposure_time = tree['ExposureTime']
+
+    :warning:\n
+    - ``min``, ``max`` and ``inc`` are the values when the tree was\
+    exported. Some of them depend on other settings, read the nodes for\
+    the current ones.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    # bump when the layout of the saved trees changes, old caches are
+    # exported again
+    FORMAT_VERSION = 1
+
+    DEFAULT_CACHE_DIR = os.path.join(
+        os.path.expanduser('~'), '.arena_api', 'node_tree_cache')
+
+    def __init__(self, root, key=None):
+
+        if not isinstance(root, dict):
+            raise TypeError(f'expected dict instead of '
+                            f'{type(root).__name__}')
+
+        self.root = root
+        self.key = key
+        self.__nodes = {}  # {node name : node dict}
+        for node in self.__walk(root):
+            self.__nodes.setdefault(node['name'], node)
+
+    def __getitem__(self, node_name):
+        return self.__nodes[node_name]
+
+    def __contains__(self, node_name):
+        return node_name in self.__nodes
+
+    def __iter__(self):
+        return self.__walk(self.root)
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    def __walk(self, node):
+        yield node
+        for feature in node.get('features', ()):
+            yield from self.__walk(feature)
+
+    # export --------------------------------------------------------------
+
+    @classmethod
+    def from_nodemap(cls, nodemap, root_name='Root'):
+        '''
+        Walks the category tree of a node map and reads the static\
+        metadata of every node. This is the slow path that\
+        ``NodeTree.load()`` avoids.
+
+        **Args**:
+            nodemap :
+                a ``Nodemap``, for example ``device.nodemap``.\n
+            root_name :
+                a ``str``, the name of the category to start from.\
+                ``'Root'`` is the default value.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``nodemap`` is not a ``Nodemap``.
+                - ``root_name`` is not a category node.
+            - ``KeyError`` :
+                - ``root_name`` is not in the node map.
+
+        **Returns**:
+            - a ``NodeTree``.\n
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(nodemap, _Nodemap):
+            raise TypeError(f'expected Nodemap instead of '
+                            f'{type(nodemap).__name__}')
+
+        root = nodemap[root_name]
+        if not isinstance(root, _node.NodeCategory):
+            raise TypeError(f'\'{root_name}\' is not a category node')
+
+        return cls(cls.__export_node(root, set()))
+
+    @classmethod
+    def __export_node(cls, node, path):
+        exported = {'name': node.name,
+                    'type': type(node).__name__[len('Node'):]}
+
+        for key in ('display_name', 'description', 'tool_tip'):
+            cls.__export_metadata(exported, key, lambda: getattr(node, key))
+        cls.__export_metadata(exported, 'visibility',
+                              lambda: node.visibility.name)
+
+        if isinstance(node, (_node.NodeInteger, _node.NodeFloat)):
+            cls.__export_metadata(exported, 'unit', lambda: node.unit)
+            cls.__export_metadata(exported, 'representation',
+                                  lambda: node.representation.name)
+            for key in ('min', 'max', 'inc'):
+                cls.__export_metadata(exported, key,
+                                      lambda: getattr(node, key))
+
+        elif isinstance(node, _node.NodeEnumeration):
+            cls.__export_metadata(exported, 'entries',
+                                  lambda: cls.__export_entries(node))
+
+        elif isinstance(node, _node.NodeCategory):
+            # a category can not contain itself but guard against broken
+            # XMLs that would make the walk endless
+            path = path | {exported['name']}
+            exported['features'] = [
+                cls.__export_node(feature, path)
+                for feature_name, feature in node.features.items()
+                if feature_name not in path]
+
+        return exported
+
+    @staticmethod
+    def __export_metadata(exported, key, getter):
+        try:
+            exported[key] = getter()
+        except Exception:
+            pass
+
+    @staticmethod
+    def __export_entries(enumeration):
+        # all the entries, not only the ones available with the current
+        # settings as enumentry_names returns
+        xenumeration = enumeration.xenumeration
+        entries = []
+        for index in range(xenumeration.xEnumerationGetNumEntries()):
+            entry = _node.NodeEnumentry(
+                xenumeration.xEnumerationGetEntryByIndex(index))
+            entries.append({
+                'name': entry.name,
+                'display_name': entry.display_name,
+                'value': entry.xenumentry.xEnumEntryGetIntValue()})
+        return entries
+
+    # cache ---------------------------------------------------------------
+
+    @staticmethod
+    def get_cache_key(nodemap):
+        '''
+        Returns the ``str`` that identifies the trees of a device model and\
+        firmware, ``'<DeviceModelName>_<DeviceVersion>'``.
+        '''
+        values = nodemap.read_values(['DeviceModelName', 'DeviceVersion'])
+        return f'{values["DeviceModelName"]}_{values["DeviceVersion"]}'
+
+    @classmethod
+    def load(cls, nodemap, cache_dir=None, key=None):
+        '''
+        Returns the tree of a node map from the cache, or exports it and\
+        saves it to the cache when the cache has no tree for the device.
+
+        **Args**:
+            nodemap :
+                a ``Nodemap``, usually ``device.nodemap``.\n
+            cache_dir :
+                the directory of the saved trees. ``None``, the default\
+                value, uses ``NodeTree.DEFAULT_CACHE_DIR``.\n
+            key :
+                a ``str`` that identifies the tree in the cache. ``None``,\
+                the default value, uses ``NodeTree.get_cache_key()``, which\
+                needs ``DeviceModelName`` and ``DeviceVersion`` nodes. Pass\
+                a key for node maps that do not have them, such as the\
+                ``GenTL`` node maps.\n
+
+        **Returns**:
+            - a ``NodeTree``.\n
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if key is None:
+            key = cls.get_cache_key(nodemap)
+        path = cls.__get_cache_path(cache_dir, key)
+
+        try:
+            tree = cls.read(path)
+            if tree.key == key:
+                return tree
+        except (OSError, ValueError, KeyError, TypeError):
+            # missing, from an older format or damaged, export it again
+            pass
+
+        tree = cls.from_nodemap(nodemap)
+        tree.key = key
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tree.save(path)
+        return tree
+
+    @classmethod
+    def __get_cache_path(cls, cache_dir, key):
+        if cache_dir is None:
+            cache_dir = cls.DEFAULT_CACHE_DIR
+        file_name = re.sub(r'[^\w.-]', '_', key)
+        return os.path.join(os.fspath(cache_dir), f'{file_name}.json')
+
+    # serialization -------------------------------------------------------
+
+    def to_dict(self):
+        '''
+        Returns the tree as a JSON serializable ``dict``.
+        '''
+        return {'format_version': self.FORMAT_VERSION,
+                'key': self.key,
+                'root': self.root}
+
+    @classmethod
+    def from_dict(cls, tree_dict):
+        '''
+        Builds a tree from a ``dict`` returned by ``to_dict()``.
+
+        **Raises**:
+            - ``ValueError`` :
+                - the ``dict`` was saved by a different format version.
+        '''
+        if tree_dict.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError('the node tree was saved in a different format')
+        return cls(tree_dict['root'], tree_dict.get('key'))
+
+    def save(self, path):
+        '''
+        Saves the tree to a JSON file.
+        '''
+        with open(path, 'w', encoding='utf-8') as tree_file:
+            json.dump(self.to_dict(), tree_file)
+
+    @classmethod
+    def read(cls, path):
+        '''
+        Reads a tree saved by ``save()``.
+        '''
+        with open(path, 'r', encoding='utf-8') as tree_file:
+            return cls.from_dict(json.load(tree_file))
@@ -11,8 +11,12 @@
 # THE SOFTWARE.
 # -----------------------------------------------------------------------------
 
-from copy import deepcopy
+import functools
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from ipaddress import ip_address
+from time import monotonic_ns
 
 from arena_api._xlayer.xarena._xglobal import _xGlobal
 from arena_api._xlayer.xarena._xsystem import _xSystem
@@ -21,6 +25,61 @@ from arena_api._xlayer.xarena.arenac_defaults import \
     _UPDATE_DEVICES_TIMEOUT_MILLISEC_DEFAULT
 from arena_api._device import Device as _Device
 from arena_api._nodemap import Nodemap as _Nodemap
+from arena_api.device_watcher import DeviceWatcher as _DeviceWatcher
+
+
+class DeviceError(Exception):
+    '''
+    Raised by ``system.create_device()`` and ``system.destroy_device()``\
+    in parallel mode when some of the devices failed.
+
+    - ``errors`` a ``dict`` that has the MAC address of every device that\
+    failed as a key and its exception as the value.
+    - ``devices`` a ``list`` of the devices that were created, or\
+    destroyed, successfully.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    def __init__(self, message, errors, devices):
+        super().__init__(message)
+        self.errors = errors
+        self.devices = devices
+
+
+class _DeviceInfo():
+    # one discovered device. system.device_infos returns them as dicts,
+    # built on every call so user changes do not reach the records
+
+    __slots__ = ('index', 'model', 'vendor', 'serial', 'ip', 'subnetmask',
+                 'defaultgateway', 'mac', 'name', 'version', 'dhcp',
+                 'presistentip', 'lla')
+
+    # the keys of the dicts, in the order they always had
+    KEYS = ('model', 'vendor', 'serial', 'ip', 'subnetmask',
+            'defaultgateway', 'mac', 'name', 'version', 'dhcp',
+            'presistentip', 'lla')
+
+    def __init__(self, xsystem, index):
+        self.index = index
+        self.model = xsystem.xSystemGetDeviceModel(index)
+        self.vendor = xsystem.xSystemGetDeviceVendor(index)
+        self.serial = xsystem.xSystemGetDeviceSerial(index)
+        self.ip = xsystem.xSystemGetDeviceIpAddressStr(index)
+        self.subnetmask = xsystem.xSystemGetDeviceSubnetMaskStr(index)
+        self.defaultgateway = xsystem.xSystemGetDeviceDefaultGatewayStr(
+            index)
+        self.mac = xsystem.xSystemGetDeviceMacAddressStr(index)
+        self.name = xsystem.xSystemGetDeviceUserDefinedName(index)
+        self.version = xsystem.xSystemGetDeviceVersion(index)
+        self.dhcp = xsystem.xSystemIsDeviceDHCPConfigurationEnabled(index)
+        self.presistentip = \
+            xsystem.xSystemIsDevicePersistentIpConfigurationEnabled(index)
+        self.lla = xsystem.xSystemIsDeviceLLAConfigurationEnabled(index)
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.KEYS}
 
 
 class _System():
@@ -65,9 +124,19 @@ class _System():
             self.__run_init = False
 
         self.__xsystem = None
-        self.__device_infos = []
+        # {mac : _DeviceInfo} and {serial : _DeviceInfo} of the last
+        # discovery, in device index order
+        self.__device_infos = {}
+        self.__device_infos_by_serial = {}
+        self.__device_infos_read_ns = None
+        # the device list of ArenaC changes while it is read if discovery
+        # runs on another thread
+        self.__discovery_lock = threading.RLock()
         self.__created_devices = {}  # {mac value : device}
+        self.__device_watcher = None
+        self.__tl_system_nodemap = None
         self.__DEVICE_INFOS_TIMEOUT_MILLISEC = _UPDATE_DEVICES_TIMEOUT_MILLISEC_DEFAULT
+        self.__DEVICE_INFOS_TTL_MILLISEC = 10000
         self.__open()
 
     # ---------------------------------------------------------------------
@@ -91,14 +160,22 @@ class _System():
     def __close(self):
         if self.__xsystem:
             # clean up before close system
+            if self.__device_watcher is not None:
+                self.__device_watcher.stop()
+
             if len(self.__created_devices) != 0:
                 self.destroy_device()
 
+            if self.__tl_system_nodemap is not None:
+                self.__tl_system_nodemap._release()
+                self.__tl_system_nodemap = None
+
             _xGlobal.xCloseSystem(self.__xsystem.hxsystem)
 
         self.__xsystem = None
         self.__device_infos.clear()
         self.__device_infos = None
+        self.__device_infos_by_serial = None
         if self.__created_devices != {}:
             raise BaseException(
                 'Internal: __connect_devices list is not updated')
@@ -149,6 +226,40 @@ class _System():
 
     # ---------------------------------------------------------------------
 
+    def __get_DEVICE_INFOS_TTL_MILLISEC(self):
+        return self.__DEVICE_INFOS_TTL_MILLISEC
+
+    def __set_DEVICE_INFOS_TTL_MILLISEC(self, value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(f'expected int instead of '
+                            f'{type(value).__name__}')
+        if value < 0:
+            raise ValueError('DEVICE_INFOS_TTL_MILLISEC must be >= 0')
+        self.__DEVICE_INFOS_TTL_MILLISEC = value
+    DEVICE_INFOS_TTL_MILLISEC = property(
+        __get_DEVICE_INFOS_TTL_MILLISEC,
+        __set_DEVICE_INFOS_TTL_MILLISEC)
+    '''
+    The longest time the device infos read by ``system.device_infos`` are\
+    reused. The default value is ``10000`` millisec.
+
+    :getter: Returns the current time to live.
+    :setter: Sets the time to live. expects an int >= 0.
+    :type: int
+
+    ``system.device_infos`` always broadcasts a discovery packet, but it\
+    reads the information of every device again only when the discovery\
+    reports a change, or when the infos are older than this time. Some\
+    changes, such as a new user defined name, are not reported by the\
+    discovery; they show after this time. ``0`` reads the infos on every\
+    call.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    # ---------------------------------------------------------------------
+
     def __get_interface_infos(self):
         num_of_interfaces = self.__xsystem.xSystemGetNumInterfaces()
         all_interfaces_info = []
@@ -201,46 +312,69 @@ class _System():
 
     def __get_device_infos(self):
 
-        # update devices first otherwise it will be zero devices
+        with self.__discovery_lock:
+            # update devices first otherwise it will be zero devices
+            device_info_has_changed = self.__xsystem.xSystemUpdateDevicesHasChanged(
+                self.DEVICE_INFOS_TIMEOUT_MILLISEC)
+
+            num_of_devices = self.__xsystem.xSystemGetNumDevices()
+            if device_info_has_changed or \
+                    num_of_devices != len(self.__device_infos) or \
+                    self.__are_device_infos_expired():
+                self.__read_device_infos(num_of_devices)
+
+            return [device_info.to_dict()
+                    for device_info in self.__device_infos.values()]
+
+    def _discover_device_infos(self):
+        # device_infos for the device watcher. the update runs without the
+        # discovery lock so the watcher does not block device_infos,
+        # create_device() and wait_for_device() for the discovery timeout.
+        # instead of DEVICE_INFOS_TTL_MILLISEC, the MAC and IP address at
+        # every index are compared to the records, two calls per device,
+        # so a device that left and came back, or got a new IP address,
+        # within the TTL is not missed
         device_info_has_changed = self.__xsystem.xSystemUpdateDevicesHasChanged(
             self.DEVICE_INFOS_TIMEOUT_MILLISEC)
 
-        num_of_devices = self.__xsystem.xSystemGetNumDevices()
-        device_infos = []
+        with self.__discovery_lock:
+            num_of_devices = self.__xsystem.xSystemGetNumDevices()
+            if device_info_has_changed or \
+                    num_of_devices != len(self.__device_infos) or \
+                    not self.__are_device_infos_at_their_indexes():
+                self.__read_device_infos(num_of_devices)
+
+            return [device_info.to_dict()
+                    for device_info in self.__device_infos.values()]
+
+    def __are_device_infos_at_their_indexes(self):
+        for device_info in self.__device_infos.values():
+            if self.__xsystem.xSystemGetDeviceMacAddressStr(
+                    device_info.index) != device_info.mac or \
+                    self.__xsystem.xSystemGetDeviceIpAddressStr(
+                        device_info.index) != device_info.ip:
+                return False
+        return True
+
+    def __are_device_infos_expired(self):
+        if self.__device_infos_read_ns is None:
+            return True
+        age_millisec = (monotonic_ns() - self.__device_infos_read_ns) // 1000000
+        return age_millisec >= self.DEVICE_INFOS_TTL_MILLISEC
+
+    def __read_device_infos(self, num_of_devices):
+        device_infos = {}
+        device_infos_by_serial = {}
         for index in range(num_of_devices):
-            device_info = {}
+            device_info = _DeviceInfo(self.__xsystem, index)
+            device_infos[device_info.mac] = device_info
+            device_infos_by_serial[device_info.serial] = device_info
 
-            device_info['model'] = self.__xsystem.xSystemGetDeviceModel(index)
-            device_info['vendor'] = self.__xsystem.xSystemGetDeviceVendor(
-                index)
-            device_info['serial'] = self.__xsystem.xSystemGetDeviceSerial(
-                index)
-            device_info['ip'] = self.__xsystem.xSystemGetDeviceIpAddressStr(
-                index)
-            device_info['subnetmask'] = self.__xsystem.xSystemGetDeviceSubnetMaskStr(
-                index)
-            device_info['defaultgateway'] = self.__xsystem.xSystemGetDeviceDefaultGatewayStr(
-                index)
-            device_info['mac'] = self.__xsystem.xSystemGetDeviceMacAddressStr(
-                index)
-            device_info['name'] = self.__xsystem.xSystemGetDeviceUserDefinedName(
-                index)
-            device_info['version'] = self.__xsystem.xSystemGetDeviceVersion(
-                index)
-            device_info['dhcp'] = self.__xsystem.xSystemIsDeviceDHCPConfigurationEnabled(
-                index)
-            device_info['presistentip'] = self.__xsystem.xSystemIsDevicePersistentIpConfigurationEnabled(
-                index)
-            device_info['lla'] = self.__xsystem.xSystemIsDeviceLLAConfigurationEnabled(
-                index)
-            device_infos.append(device_info)
+        # replaced, not updated, so readers see the old or the new infos
+        self.__device_infos = device_infos
+        self.__device_infos_by_serial = device_infos_by_serial
+        self.__device_infos_read_ns = monotonic_ns()
 
-        # update old list
-        # index is the device info position
-        del self.__device_infos[:]
-        self.__device_infos = deepcopy(device_infos)
-
-        return device_infos
     # calling this will update the inner __device_infos list as well
     device_infos = property(__get_device_infos)
     '''
@@ -375,9 +509,205 @@ class _System():
     **------------------------------------------------------------------**\
     **-------------------------------------------------------------------**
     '''
+    # device_watcher ------------------------------------------------------
+
+    def __get_device_watcher(self):
+        if self.__device_watcher is None:
+            self.__device_watcher = _DeviceWatcher(self)
+        return self.__device_watcher
+
+    device_watcher = property(__get_device_watcher)
+    '''
+    The background device discovery of the system.
+
+    :getter: Returns the ``DeviceWatcher`` instance of the system.\
+    The same instance is returned every time.\n
+
+    The watcher discovers the devices from its own thread, with an\
+    interval that grows while nothing changes, keeps a table of the\
+    connected devices, and notifies subscribers when a device connects,\
+    disconnects or changes its IP address.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    # wait_for_device -----------------------------------------------------
+
+    def wait_for_device(self, serial=None, mac=None, timeout=10000):
+        '''
+        Waits until a device is discovered, for example after it was\
+        restarted, and returns its device info.\n
+        Discovery runs on every interface in parallel, each on its own\
+        thread, with ``DEVICE_INFOS_TIMEOUT_MILLISEC`` per round, cut\
+        short so no round ends after ``timeout``. The call returns at\
+        the end of the first round that finds the device, on any\
+        interface, without waiting for the other interfaces; their\
+        threads stop at the end of the round in progress. When ArenaC\
+        lists no interface, the rounds update every device at once, as\
+        ``system.device_infos`` does, on one thread.\n
+        Every update reorders the device list, so all the records of\
+        ``device_infos`` are read again before returning.
+
+        **Args**:
+            serial :
+                a ``str``, the serial number of the device.\n
+            mac :
+                a ``str``, the MAC address of the device, with any of\
+                ``':'``, ``'-'``, ``'.'`` as separators, or none.\n
+            timeout :
+                an ``int``, the longest time to wait in millisec, or\
+                ``math.inf``. ``10000`` is the default value.\n
+            At least one of ``serial`` and ``mac`` must be given. If both\
+            are given the device must match both.
+
+        **Raises**:
+            - ``TypeError`` :
+                - ``serial`` or ``mac`` is not a ``str``.
+                - ``timeout`` is not an ``int`` nor ``math.inf``.
+            - ``ValueError`` :
+                - neither ``serial`` nor ``mac`` is given.
+                - ``timeout`` is < 0.
+            - ``TimeoutError`` :
+                - the device was not discovered within ``timeout``.
+
+        **Returns**:
+            - the device info ``dict`` of the device, as in\
+            ``system.device_infos``, which can be passed to\
+            ``system.create_device()``.\n
+
+        **Examples**:\n
+            >>> device_info = system.wait_for_device(serial='204700123')
+            >>> device = system.create_device(device_info)[0]
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self.__check_wait_for_device_parameters(serial, mac, timeout)
+        if mac is not None:
+            mac = self.__normalize_mac(mac)
+
+        if math.isinf(timeout):
+            deadline_ns = math.inf
+        else:
+            deadline_ns = monotonic_ns() + timeout * 1000000
+
+        num_of_interfaces = self.__xsystem.xSystemGetNumInterfaces()
+        if num_of_interfaces:
+            updates = [functools.partial(
+                self.__xsystem.xSystemUpdateDevicesOnInterface,
+                interface_index)
+                for interface_index in range(num_of_interfaces)]
+        else:
+            # no interface to run on, broadcast instead of timing out
+            updates = [self.__xsystem.xSystemUpdateDevices]
+
+        # stop is set when the device is found or a thread fails, the
+        # threads still in a round stop at its end. done is set then too,
+        # or when the last thread reached the deadline
+        stop = threading.Event()
+        done = threading.Event()
+        errors = []
+        running = [len(updates)]
+        running_lock = threading.Lock()
+
+        def remaining_millisec():
+            return (deadline_ns - monotonic_ns()) / 1000000
+
+        def discover(update):
+            try:
+                while not stop.is_set() and remaining_millisec() > 0:
+                    # the update runs without the discovery lock, the
+                    # interfaces run in parallel. each one is updated by
+                    # its own thread only
+                    update(int(min(self.DEVICE_INFOS_TIMEOUT_MILLISEC,
+                                   remaining_millisec())) or 1)
+                    with self.__discovery_lock:
+                        if stop.is_set():
+                            break
+                        if self.__find_device_index(serial, mac) is not None:
+                            stop.set()
+            except Exception as exception:
+                errors.append(exception)
+                stop.set()
+            finally:
+                with running_lock:
+                    running[0] -= 1
+                    if stop.is_set() or not running[0]:
+                        done.set()
+
+        for update in updates:
+            threading.Thread(target=discover, args=(update,),
+                             name='arena_api.wait_for_device',
+                             daemon=True).start()
+        # the rounds of the other interfaces are not waited for
+        done.wait()
+        stop.set()
+
+        if errors:
+            raise errors[0]
+
+        with self.__discovery_lock:
+            # the updates reordered the device list, every record is read
+            # again so create_device() gets the right indexes. a round
+            # still in progress can reorder it again, create_device()
+            # checks the index before using it
+            self.__read_device_infos(self.__xsystem.xSystemGetNumDevices())
+            device_info = self.__find_device_info(serial, mac)
+            if device_info is None:
+                raise TimeoutError(f'device serial={serial} mac={mac} was '
+                                   f'not discovered within {timeout} '
+                                   f'millisec')
+            return device_info.to_dict()
+
+    def __check_wait_for_device_parameters(self, serial, mac, timeout):
+        if serial is None and mac is None:
+            raise ValueError('serial or mac is expected')
+        for value in (serial, mac):
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f'expected str instead of '
+                                f'{type(value).__name__}')
+
+        if isinstance(timeout, bool) or \
+                not (isinstance(timeout, int) or timeout == math.inf):
+            raise TypeError(f'expected int or math.inf instead of '
+                            f'{type(timeout).__name__}')
+        if timeout < 0:
+            raise ValueError('timeout must be >= 0 or math.inf')
+
+    @staticmethod
+    def __normalize_mac(mac):
+        trans = str.maketrans('', '', ":.- ")
+        return mac.translate(trans).lower()
+
+    def __find_device_info(self, serial, mac):
+        # reads the records, with the lock held after they were read
+        for device_info in self.__device_infos.values():
+            if serial is not None and device_info.serial != serial:
+                continue
+            if mac is not None and \
+                    self.__normalize_mac(device_info.mac) != mac:
+                continue
+            return device_info
+        return None
+
+    def __find_device_index(self, serial, mac):
+        # reads the ArenaC device list, not the records, with the lock
+        # held by the caller
+        with self.__discovery_lock:
+            for index in range(self.__xsystem.xSystemGetNumDevices()):
+                if serial is not None and \
+                        self.__xsystem.xSystemGetDeviceSerial(index) != serial:
+                    continue
+                if mac is not None and self.__normalize_mac(
+                        self.__xsystem.xSystemGetDeviceMacAddressStr(index)) != mac:
+                    continue
+                return index
+        return None
+
     # create_device -------------------------------------------------------
 
-    def create_device(self, device_infos=None):
+    def create_device(self, device_infos=None, parallel=False):
         '''
         Creates and initializes ``arena_api._device.Device`` instance(s)\
         from device_infos argument. The device(s) must be destroyed\
@@ -397,9 +727,18 @@ class _System():
                 in other words, if these calls as the same:\n
                     - ``system.create_device(system.device_infos)``
                     - ``system.create_device()``
+            parallel :
+                ``False`` by default, the devices are created one after\
+                the other. ``True`` creates them at the same time, one\
+                thread each, so downloading the XML and opening the\
+                control channel of every device overlap. The devices\
+                that can be created are created even if others fail.\n
         **Raises**:
             - ``ValueError`` :
                 - device_infos is an empty list.
+                - a device of device_infos is no longer discovered. Its\
+                index is checked, and the device list read again if the\
+                index changed, before the device is created.
             - ``TypeError`` :
                 - device_infos type is not a list of dicts, a dict, nor None.
                 - device_infos is a dict with MAC Address of a device\
@@ -407,6 +746,11 @@ class _System():
             - BaseException :
                 - device_info is a dict and ``system.device_infos``\
                 was not called.\n
+            - ``DeviceError`` :
+                - ``parallel`` is ``True`` and some devices could not be\
+                created. ``errors`` has the exception of every device that\
+                failed; ``devices`` has the devices that were created,\
+                they must be destroyed too.\n
         **Returns**:
             - A list of ``arena_api._device.Device`` instances.\n
 
@@ -429,6 +773,17 @@ class _System():
         - Provides read-write access only to initial process that creates\
         the device; following processes given read-only access.
         - Devices must be destroyed.
+        - The discovery lock of the system is held while devices are\
+        created: for each device in turn, or, with ``parallel=True``,\
+        for the whole creation of all the devices, XML downloads\
+        included. ``xSystemCreateDevice()`` takes a device index and\
+        ArenaC looks it up inside the call, so the device list must not\
+        be reordered until every call has started; the lock can not be\
+        released between the start of a call and its end. Meanwhile\
+        ``system.device_infos`` and the lookups of\
+        ``system.wait_for_device()`` and of the device watcher wait. To\
+        keep discovering during a long startup, call\
+        ``system.wait_for_device()`` before ``create_device()``.
 
         **------------------------------------------------------------------**\
         **-------------------------------------------------------------------**
@@ -460,6 +815,9 @@ class _System():
 
         # create devices from device info ----------------------------------
 
+        if parallel:
+            return self.__create_devices_in_parallel(device_infos_as_list)
+
         devices = []
         for device_info in device_infos_as_list:
             self.__validate_device_info_before_create_device(device_info)
@@ -476,10 +834,59 @@ class _System():
 
         return devices
 
+    def __create_devices_in_parallel(self, device_infos_as_list):
+
+        # all the infos are checked before any device is created
+        for device_info in device_infos_as_list:
+            self.__validate_device_info_before_create_device(device_info)
+
+        # {mac : device info} of the devices to create, once each
+        new_device_infos = {}
+        for device_info in device_infos_as_list:
+            if device_info['mac'] not in self.__created_devices:
+                new_device_infos.setdefault(device_info['mac'], device_info)
+
+        errors = {}
+        if new_device_infos:
+            # device indexes must not change while devices are created.
+            # the indexes are resolved here, the workers can not take the
+            # lock. it is held until every worker returns: ArenaC resolves
+            # the index inside xSystemCreateDevice(), there is no point
+            # where it is known to be used and the lock could be released
+            with self.__discovery_lock:
+                device_indexes = {}
+                for mac, device_info in new_device_infos.items():
+                    try:
+                        device_indexes[mac] = self.__get_device_index(
+                            device_info)
+                    except Exception as exception:
+                        errors[mac] = exception
+
+                with ThreadPoolExecutor(
+                        max_workers=max(len(device_indexes), 1),
+                        thread_name_prefix='arena_api.create_device') as executor:
+                    futures = {mac: executor.submit(self.__create_device_at,
+                                                    device_index)
+                               for mac, device_index in device_indexes.items()}
+                    for mac, future in futures.items():
+                        try:
+                            self.__created_devices[mac] = future.result()
+                        except Exception as exception:
+                            errors[mac] = exception
+
+        devices = [self.__created_devices[device_info['mac']]
+                   for device_info in device_infos_as_list
+                   if device_info['mac'] not in errors]
+        if errors:
+            raise DeviceError(f'{len(errors)} of {len(new_device_infos)} '
+                              f'devices could not be created: '
+                              f'{list(errors)}', errors, devices)
+        return devices
+
     def __validate_device_info_before_create_device(self, device_info):
 
         # no device_info has been broadcasted
-        if self.__device_infos == []:
+        if not self.__device_infos:
             raise BaseException('Call system.device_infos first')
 
         # list has an element that is not dict
@@ -489,34 +896,46 @@ class _System():
                             f'element')
 
         # unknown mac
-        for info in self.__device_infos:
-            if info['mac'] == device_info['mac']:
-                break
-        else:
+        if device_info.get('mac') not in self.__device_infos:
             raise ValueError(f'Invalid device_info : {device_info}')
 
     def __create_new_device(self, device_info):
-        # find index of device_info to create it
-        device_index = self.__get_device_index(device_info)
+        # the index must not change between finding and using it
+        with self.__discovery_lock:
+            device_index = self.__get_device_index(device_info)
+            return self.__create_device_at(device_index)
+
+    def __create_device_at(self, device_index):
         hxdevice = self.__xsystem.xSystemCreateDevice(device_index)
         new_device = _Device(hxdevice)
 
         return new_device
 
     def __get_device_index(self, device_info):
-        device_index = 0
+        # called with the discovery lock held.
         # incase user want to create device from a sliced device_info list
-        # self.__device_infos has the latest sort of device_info; so its
-        # indexing can be trusted
-        for index, __device_info in enumerate(self.__device_infos):
-            if device_info == __device_info:
-                device_index = index
-                break
-        return device_index
+        # self.__device_infos has the index of the last read. ArenaC
+        # reorders its device list on every update, wait_for_device() or
+        # another thread can have updated it since, so the index is
+        # checked against the MAC address ArenaC has at that index
+        mac = device_info['mac']
+        device_index = self.__device_infos[mac].index
+        if self.__is_device_at_index(mac, device_index):
+            return device_index
+
+        self.__read_device_infos(self.__xsystem.xSystemGetNumDevices())
+        if mac not in self.__device_infos:
+            raise ValueError(f'device {mac} is no longer discovered, call '
+                             f'system.device_infos again')
+        return self.__device_infos[mac].index
+
+    def __is_device_at_index(self, mac, device_index):
+        return device_index < self.__xsystem.xSystemGetNumDevices() and \
+            self.__xsystem.xSystemGetDeviceMacAddressStr(device_index) == mac
 
     # destroy_device ------------------------------------------------------
 
-    def destroy_device(self, device=None):
+    def destroy_device(self, device=None, parallel=False):
         '''
         destroys and cleans up the internal memory of a ``Device``\
         instance(s). Devices that have been created \
@@ -534,6 +953,11 @@ class _System():
                 - ``None``. This is the default value. The system\
                 destroys all of the created devices. Any device\
                 reference can not be used after calling this function\n
+            parallel :
+                ``False`` by default, the devices are destroyed one after\
+                the other. ``True`` destroys them at the same time, one\
+                thread each. The devices that can be destroyed are\
+                destroyed even if others fail.\n
         **Raises**:
             - ``ValueError`` :
                 - device is an empty list.
@@ -546,6 +970,10 @@ class _System():
                 - device type is not a list of\
                 ``arena_api._device.Device``, an \
                 ``arena_api._device.Device`` instance, nor None.\n
+            - ``DeviceError`` :
+                - ``parallel`` is ``True`` and some devices could not be\
+                destroyed. ``errors`` has the exception of every device\
+                that failed; ``devices`` has the destroyed devices.\n
         **Returns**:
             - None\n
         When called, it deletes all internal memory associated with a\
@@ -594,27 +1022,55 @@ class _System():
 
         # destroy devices in list -----------------------------------------
 
-        updated_connected_devices = self.__created_devices.copy()
+        # {device : mac}, so finding the mac of a device is not a search
+        created_devices_macs = {
+            created_device: mac
+            for mac, created_device in self.__created_devices.items()}
+        # once each, all checked before any device is destroyed
+        devices_as_list = list(dict.fromkeys(devices_as_list))
         for device in devices_as_list:
+            self.__validate_device_before_destroy_device(
+                device, created_devices_macs)
 
-            self.__validate_device_before_destroy_device(device)
-
-            mac_to_remove = None
-            for mac in updated_connected_devices.keys():
-                if device == updated_connected_devices[mac]:
-                    mac_to_remove = mac
-                    break
-
-            if mac_to_remove is None:
-                raise ValueError('Internal error : device is not found in '
-                                 'connected devices')
-
-            self.__xsystem.xSystemDestroyDevice(device._xdev.hxdevice.value)
-            del updated_connected_devices[mac_to_remove]
-
-        self.__created_devices = updated_connected_devices
+        if parallel:
+            self.__destroy_devices_in_parallel(devices_as_list,
+                                               created_devices_macs)
+            return
 
-    def __validate_device_before_destroy_device(self, device):
+        for device in devices_as_list:
+            self.__destroy_device(device)
+            del self.__created_devices[created_devices_macs[device]]
+
+    def __destroy_device(self, device):
+        device._release()
+        self.__xsystem.xSystemDestroyDevice(device._xdev.hxdevice.value)
+
+    def __destroy_devices_in_parallel(self, devices_as_list,
+                                      created_devices_macs):
+        errors = {}
+        destroyed_devices = []
+        with ThreadPoolExecutor(
+                max_workers=len(devices_as_list),
+                thread_name_prefix='arena_api.destroy_device') as executor:
+            futures = {device: executor.submit(self.__destroy_device, device)
+                       for device in devices_as_list}
+            for device, future in futures.items():
+                mac = created_devices_macs[device]
+                try:
+                    future.result()
+                except Exception as exception:
+                    errors[mac] = exception
+                else:
+                    del self.__created_devices[mac]
+                    destroyed_devices.append(device)
+
+        if errors:
+            raise DeviceError(f'{len(errors)} of {len(devices_as_list)} '
+                              f'devices could not be destroyed: '
+                              f'{list(errors)}', errors, destroyed_devices)
+
+    def __validate_device_before_destroy_device(self, device,
+                                                created_devices_macs):
 
         # no device_info has been broadcasted
         if self.__created_devices == {}:
@@ -625,12 +1081,8 @@ class _System():
             raise TypeError(f'Expected list of devices instead of list '
                             f'with an element of type {type(device).__name__}')
 
-        available_devices = []
-        for device in self.__created_devices.values():
-            available_devices.append(device)  # might want to compare hxdevice
-
         # unknown device
-        if device not in available_devices:
+        if device not in created_devices_macs:
             raise ValueError(f'Invalid device')
 
     # force_ip ----------------------------------------------------------------
@@ -694,8 +1146,11 @@ class _System():
     # ---------------------------------------------------------------------
 
     def __get_tl_system_nodemap(self):
-        hxnodemap = self.__xsystem.xSystemGetTLSystemNodeMap()
-        return _Nodemap(hxnodemap)
+        # the handle is valid until the system is closed
+        if self.__tl_system_nodemap is None:
+            hxnodemap = self.__xsystem.xSystemGetTLSystemNodeMap()
+            self.__tl_system_nodemap = _Nodemap(hxnodemap)
+        return self.__tl_system_nodemap
 
     tl_system_nodemap = property(__get_tl_system_nodemap)
     '''
@@ -0,0 +1,345 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2020, Lucid Vision Labs, Inc.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS
+# BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN
+# ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+# CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# -----------------------------------------------------------------------------
+
+import threading
+from time import perf_counter_ns, time_ns
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError(f'arena_api.telemetry needs numpy\n'
+                      f'run \'pip install arena-api[numpy]\' or '
+                      f'\'pip install numpy\'')
+
+from arena_api._nodemap import Nodemap as _Nodemap
+
+
+class Sampler:
+    '''
+    Samples integer, float and boolean nodes at a fixed rate on a\
+    background thread, into preallocated NumPy ring arrays.\n
+    The values are read through the node map by name, so no node instance\
+    is created, and written in place; sampling does not allocate arrays.\
+    ``values`` and ``timestamps_ns`` are read only views of the rings, so\
+    a dashboard can plot them without copying.
+
+    >>> sampler = Sampler(device.nodemap,
+    >>>                   ['DeviceTemperature', 'ExposureTime'], hz=50)
+    >>> with sampler:
+    >>>     time.sleep(10)
+    >>>     timestamps_ns, values = sampler.get_ordered()
+    >>>     temperature = sampler['DeviceTemperature']  # a view of a column
+
+    The rings hold the last ``capacity`` samples. Row ``i`` of ``values``\
+    is the sample taken at ``timestamps_ns[i]``, the row written next is\
+    ``count % capacity``. Rows that were not written yet are ``NaN`` with a\
+    timestamp of ``0``. A value that could not be read is ``NaN``.
+
+    :warning:\n
+    - The thread writes the rings while they are read. A row can be\
+    overwritten while it is read, compare ``count`` before and after\
+    reading, or use ``get_ordered()`` which copies the rings.\n
+    - ``system.destroy_device()`` stops the samplers of the device node\
+    maps.
+
+    **------------------------------------------------------------------**\
+    **-------------------------------------------------------------------**
+    '''
+
+    DEFAULT_CAPACITY = 4096
+
+    def __init__(self, nodemap, nodes_names, hz, capacity=None):
+        '''
+        **Args**:
+            nodemap :
+                a ``Nodemap``, for example ``device.nodemap``.\n
+            nodes_names :
+                a ``list`` or ``tuple`` of ``str``, the names of integer,\
+                float or boolean nodes.\n
+            hz :
+                an ``int`` or ``float``, the number of samples per second.\n
+            capacity :
+                an ``int``, the number of samples kept in the rings.\
+                ``None``, the default value, uses\
+                ``Sampler.DEFAULT_CAPACITY``.\n
+
+        **Raises**:
+            - ``TypeError`` :
+                - a parameter is not one of the expected types.
+                - a node is not an integer, float or boolean node.
+            - ``ValueError`` :
+                - ``nodes_names`` is empty or has duplicates.
+                - a node name is not in the node map.
+                - ``hz`` or ``capacity`` is not > 0.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if not isinstance(nodemap, _Nodemap):
+            raise TypeError(f'expected Nodemap instead of '
+                            f'{type(nodemap).__name__}')
+        nodes_names = self.__check_nodes_names(nodes_names)
+        hz = self.__check_hz(hz)
+        capacity = self.__check_capacity(capacity)
+
+        # resolved once, raises for unknown or non numeric nodes
+        readers = [nodemap._get_numeric_value_reader(node_name)
+                   for node_name in nodes_names]
+
+        self.__nodemap = nodemap
+        self.__nodes_names = nodes_names
+        self.__columns = {node_name: column
+                          for column, node_name in enumerate(nodes_names)}
+        self.__readers = [(column, node_name, reader)
+                          for column, (node_name, reader)
+                          in enumerate(zip(nodes_names, readers))]
+        self.__hz = hz
+        self.__capacity = capacity
+
+        self.__values = np.full((capacity, len(nodes_names)), np.nan,
+                                dtype=np.float64)
+        self.__timestamps_ns = np.zeros(capacity, dtype=np.int64)
+        self.__values_view = self.__values.view()
+        self.__values_view.flags.writeable = False
+        self.__timestamps_ns_view = self.__timestamps_ns.view()
+        self.__timestamps_ns_view.flags.writeable = False
+
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = None
+
+        self.count = 0
+        self.overrun_count = 0
+        self.error_count = 0
+        self.last_error = None
+
+        nodemap._add_worker(self)
+
+    def __enter__(self):
+        if not self.is_running:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def __getitem__(self, node_name):
+        # a read only view of the node column, not a copy
+        return self.__values_view[:, self.__columns[node_name]]
+
+    @staticmethod
+    def __check_nodes_names(nodes_names):
+        if not isinstance(nodes_names, (list, tuple)):
+            raise TypeError(f'expected list or tuple instead of '
+                            f'{type(nodes_names).__name__}')
+        for node_name in nodes_names:
+            if not isinstance(node_name, str):
+                raise TypeError(f'expected str instead of '
+                                f'{type(node_name).__name__}')
+        if not nodes_names:
+            raise ValueError('nodes_names is empty')
+        if len(set(nodes_names)) != len(nodes_names):
+            raise ValueError('nodes_names has duplicates')
+        return tuple(nodes_names)
+
+    @staticmethod
+    def __check_hz(hz):
+        if isinstance(hz, bool) or not isinstance(hz, (int, float)):
+            raise TypeError(f'expected int or float instead of '
+                            f'{type(hz).__name__}')
+        if not hz > 0:
+            raise ValueError('hz must be > 0')
+        return hz
+
+    def __check_capacity(self, capacity):
+        if capacity is None:
+            return self.DEFAULT_CAPACITY
+        if isinstance(capacity, bool) or not isinstance(capacity, int):
+            raise TypeError(f'expected int instead of '
+                            f'{type(capacity).__name__}')
+        if capacity <= 0:
+            raise ValueError('capacity must be > 0')
+        return capacity
+
+    # properties ----------------------------------------------------------
+
+    def __get_nodes_names(self):
+        return self.__nodes_names
+
+    nodes_names = property(__get_nodes_names)
+    '''
+    The names of the sampled nodes, in the order of the ``values`` columns.
+
+    :getter: Returns a ``tuple`` of ``str``.
+    '''
+
+    def __get_hz(self):
+        return self.__hz
+
+    hz = property(__get_hz)
+    '''
+    :getter: Returns the number of samples per second.
+    '''
+
+    def __get_capacity(self):
+        return self.__capacity
+
+    capacity = property(__get_capacity)
+    '''
+    :getter: Returns the number of samples the rings hold.
+    '''
+
+    def __get_values(self):
+        return self.__values_view
+
+    values = property(__get_values)
+    '''
+    The values ring, one row per sample and one column per node.
+
+    :getter: Returns a read only ``numpy.ndarray`` of ``float64`` with the\
+    shape ``(capacity, len(nodes_names))``. It is a view of the ring, not a\
+    copy.
+    '''
+
+    def __get_timestamps_ns(self):
+        return self.__timestamps_ns_view
+
+    timestamps_ns = property(__get_timestamps_ns)
+    '''
+    The time of every sample, in nanoseconds since the epoch.
+
+    :getter: Returns a read only ``numpy.ndarray`` of ``int64`` with the\
+    shape ``(capacity,)``. It is a view of the ring, not a copy.
+    '''
+
+    def __get_is_running(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    is_running = property(__get_is_running)
+    '''
+    :getter: Returns whether the sampler thread is alive.
+    :type: ``bool``
+    '''
+
+    # read ----------------------------------------------------------------
+
+    def get_ordered(self):
+        '''
+        Copies the samples taken so far, oldest first.
+
+        **Returns**:
+            - a ``tuple`` of ``(timestamps_ns, values)``, ``numpy.ndarray``\
+            copies of at most ``capacity`` rows.\n
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        with self.__lock:
+            count = self.count
+            if count <= self.__capacity:
+                return (self.__timestamps_ns[:count].copy(),
+                        self.__values[:count].copy())
+
+            oldest = count % self.__capacity
+            order = np.r_[oldest:self.__capacity, 0:oldest]
+            return self.__timestamps_ns[order], self.__values[order]
+
+    # start / stop --------------------------------------------------------
+
+    def start(self):
+        '''
+        Starts the sampler thread. The rings keep the samples of the\
+        previous runs.
+
+        **Raises**:
+            - ``BaseException`` :
+                - the sampler is already running.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        if self.is_running:
+            raise BaseException('the sampler is already running')
+
+        self.last_error = None
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__sample_loop,
+                                         name='arena_api.telemetry.Sampler',
+                                         daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        '''
+        Stops the sampler thread. Calling it on a stopped sampler does\
+        nothing.
+
+        **Returns**:
+            - ``None``.
+
+        **------------------------------------------------------------------**\
+        **-------------------------------------------------------------------**
+        '''
+        self.__stop.set()
+        thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.__thread = None
+
+    # thread --------------------------------------------------------------
+
+    def __sample_loop(self):
+
+        period_ns = int(1e9 / self.__hz)
+        next_sample_ns = perf_counter_ns()
+
+        while True:
+            self.__sample()
+
+            next_sample_ns += period_ns
+            delay_ns = next_sample_ns - perf_counter_ns()
+            if delay_ns < 0:
+                # the reads took longer than the period. the missed samples
+                # are skipped instead of taken back to back
+                missed = -delay_ns // period_ns + 1
+                self.overrun_count += missed
+                next_sample_ns += missed * period_ns
+                delay_ns = next_sample_ns - perf_counter_ns()
+
+            if self.__stop.wait(max(delay_ns, 0) / 1e9):
+                break
+
+    def __sample(self):
+        row = self.__values[self.count % self.__capacity]
+
+        # the node map lock makes the values of a sample consistent with
+        # each other
+        self.__nodemap.lock()
+        try:
+            timestamp_ns = time_ns()
+            for column, node_name, reader in self.__readers:
+                try:
+                    row[column] = reader(node_name)
+                except Exception as exception:
+                    # not readable at the moment
+                    row[column] = np.nan
+                    self.error_count += 1
+                    self.last_error = exception
+        finally:
+            self.__nodemap.unlock()
+
+        with self.__lock:
+            self.__timestamps_ns[self.count % self.__capacity] = timestamp_ns
+            self.count += 1
@@ -0,0 +1,55 @@
+'''
+Compares reading and writing a node through a node accessor,
+nodemap.accessor('ExposureTime'), against going through the node object,
+nodemap['ExposureTime'].value.
+
+Writes the current ExposureTime back to the device, so the settings are
+not changed. Needs at least one connected device.
+'''
+import timeit
+
+from arena_api.system import system
+
+NUMBER = 2000
+NODE_NAME = 'ExposureTime'
+
+
+def benchmark(title, node_object_function, accessor_function):
+    node_object = timeit.timeit(node_object_function, number=NUMBER)
+    accessor = timeit.timeit(accessor_function, number=NUMBER)
+
+    print(f'{title}')
+    print(f'\tnodemap[name].value : {node_object / NUMBER * 1e6:.2f} us')
+    print(f'\tnodemap.accessor    : {accessor / NUMBER * 1e6:.2f} us')
+    print(f'\tspeedup             : {node_object / accessor:.2f}x')
+
+
+def example_entry_point():
+
+    device_infos = system.device_infos
+    if not device_infos:
+        raise BaseException('no device is connected')
+
+    device = system.create_device(device_infos[0])[0]
+    try:
+        nodemap = device.nodemap
+        accessor = nodemap.accessor(NODE_NAME)
+        value = accessor.get()
+
+        def node_object_get():
+            return nodemap[NODE_NAME].value
+
+        def node_object_set():
+            nodemap[NODE_NAME].value = value
+
+        def accessor_set():
+            accessor.set(value)
+
+        benchmark(f'get {NODE_NAME}', node_object_get, accessor.get)
+        benchmark(f'set {NODE_NAME}', node_object_set, accessor_set)
+    finally:
+        system.destroy_device(device)
+
+
+if __name__ == '__main__':
+    example_entry_point()
@@ -0,0 +1,88 @@
+'''
+Compares the pooled string buffers of the x-layer string getters against
+allocating a new buffer on every call, the way the getters used to work.
+
+Reads:
+- the device infos strings of all the connected devices
+- the name, display name, description and tool tip of every node in the
+  main node map of the first device
+
+Needs at least one connected device.
+'''
+import timeit
+from ctypes import byref, create_string_buffer
+
+from arena_api.system import system
+from arena_api._xlayer.xarena.arenac import harenac
+from arena_api._xlayer.xarena.arenac_defaults import \
+    XARENA_STR_BUFFER_SIZE_1000
+from arena_api._xlayer.xarena.arenac_types import acNode, acSystem, size_t
+from arena_api._xlayer.xarena._xstrbuffer import xget_str
+
+NUMBER = 20
+
+
+def xget_str_per_call_buffer(c_function, *args):
+    str_buf_p = create_string_buffer(XARENA_STR_BUFFER_SIZE_1000)
+    str_buf_len = size_t(XARENA_STR_BUFFER_SIZE_1000)
+    c_function(*args, str_buf_p, byref(str_buf_len))
+    return str_buf_p.value.decode()
+
+
+def read_device_infos_strings(get_str, hxsystem, num_devices):
+    for index in range(num_devices):
+        index = size_t(index)
+        get_str(harenac.acSystemGetDeviceModel, hxsystem, index)
+        get_str(harenac.acSystemGetDeviceVendor, hxsystem, index)
+        get_str(harenac.acSystemGetDeviceSerial, hxsystem, index)
+        get_str(harenac.acSystemGetDeviceIpAddressStr, hxsystem, index)
+        get_str(harenac.acSystemGetDeviceSubnetMaskStr, hxsystem, index)
+        get_str(harenac.acSystemGetDeviceMacAddressStr, hxsystem, index)
+        get_str(harenac.acSystemGetDeviceUserDefinedName, hxsystem, index)
+        get_str(harenac.acSystemGetDeviceVersion, hxsystem, index)
+
+
+def read_nodes_metadata(get_str, hxnodes):
+    for hxnode in hxnodes:
+        get_str(harenac.acNodeGetName, hxnode)
+        get_str(harenac.acNodeGetDisplayName, hxnode)
+        get_str(harenac.acNodeGetDescription, hxnode)
+        get_str(harenac.acNodeGetToolTip, hxnode)
+
+
+def benchmark(title, function, *args):
+    per_call = timeit.timeit(
+        lambda: function(xget_str_per_call_buffer, *args), number=NUMBER)
+    pooled = timeit.timeit(
+        lambda: function(xget_str, *args), number=NUMBER)
+
+    print(f'{title}')
+    print(f'\tbuffer per call : {per_call / NUMBER * 1000:.3f} ms')
+    print(f'\tpooled buffers  : {pooled / NUMBER * 1000:.3f} ms')
+    print(f'\tspeedup         : {per_call / pooled:.2f}x')
+
+
+def example_entry_point():
+
+    device_infos = system.device_infos
+    if not device_infos:
+        raise BaseException('no device is connected')
+
+    # internal handles, only for the benchmark
+    hxsystem = acSystem(system._System__xsystem.hxsystem)
+    benchmark(f'device infos strings of {len(device_infos)} device(s)',
+              read_device_infos_strings, hxsystem, len(device_infos))
+
+    device = system.create_device(device_infos[0])[0]
+    try:
+        xnodemap = device.nodemap._Nodemap__xnodemap
+        hxnodes = [acNode(xnodemap.xNodeMapGetNodeByIndex(index))
+                   for index in range(xnodemap.xNodeMapGetNumNodes())]
+        benchmark(f'metadata of {len(hxnodes)} nodes',
+                  read_nodes_metadata, hxnodes)
+    finally:
+        system.destroy_device(device)
+
+
+if __name__ == '__main__':
+    example_entry_point()
@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+
+from arena_api.device_watcher import DeviceWatcher
+
+
+class FakeSystem:
+    # returns the scripted discoveries one after the other, then the last
+    # one again. records the interval the watcher waited before each one
+
+    def __init__(self, *discoveries):
+        self.discoveries = list(discoveries)
+        self.discovered = threading.Event()
+        self.watcher = None
+        self.intervals = []
+
+    def _discover_device_infos(self):
+        if self.discovered.is_set():
+            device_infos = self.discoveries[-1]
+        else:
+            self.intervals.append(self.watcher.interval_millisec)
+            device_infos = self.discoveries.pop(0)
+            if len(self.discoveries) == 1:
+                self.discovered.set()
+        if isinstance(device_infos, Exception):
+            raise device_infos
+        return device_infos
+
+
+def device_info(mac, ip='169.254.0.1'):
+    return {'mac': mac, 'ip': ip, 'serial': mac[-4:]}
+
+
+def run(system, *event_types, min_interval_millisec=1,
+        max_interval_millisec=1, missed_discoveries_to_disconnect=2):
+    # runs the watcher until the script is done, returns the events as
+    # (type, mac)
+    watcher = DeviceWatcher(system)
+    system.watcher = watcher
+    watcher.min_interval_millisec = min_interval_millisec
+    watcher.max_interval_millisec = max_interval_millisec
+    watcher.missed_discoveries_to_disconnect = missed_discoveries_to_disconnect
+
+    events = []
+    for event_type in event_types or DeviceWatcher.EVENT_TYPES:
+        watcher.subscribe(event_type, events.append)
+
+    with watcher:
+        assert system.discovered.wait(5)
+    assert not watcher.is_running
+    return watcher, events
+
+
+def summary(events):
+    return [(event.type, event.device_info['mac']) for event in events]
+
+
+def test_connect():
+    system = FakeSystem([device_info('1c0faa000001')],
+                        [device_info('1c0faa000001')],
+                        [device_info('1c0faa000001'),
+                         device_info('1c0faa000002')],
+                        [device_info('1c0faa000001'),
+                         device_info('1c0faa000002')])
+    watcher, events = run(system, DeviceWatcher.CONNECT)
+
+    assert summary(events) == [(DeviceWatcher.CONNECT, '1c0faa000001'),
+                               (DeviceWatcher.CONNECT, '1c0faa000002')]
+    assert sorted(watcher.devices) == ['1c0faa000001', '1c0faa000002']
+
+
+def test_disconnect_after_missed_discoveries():
+    # missed twice then found again: the count starts over, the device is
+    # disconnected after the three misses in a row at the end
+    system = FakeSystem([device_info('1c0faa000001')], [], [],
+                        [device_info('1c0faa000001')], [], [], [], [])
+    watcher, events = run(system, missed_discoveries_to_disconnect=3)
+
+    assert summary(events) == [(DeviceWatcher.CONNECT, '1c0faa000001'),
+                               (DeviceWatcher.DISCONNECT, '1c0faa000001')]
+    assert watcher.devices == {}
+
+
+def test_disconnect_after_one_miss():
+    system = FakeSystem([device_info('1c0faa000001')], [], [])
+    watcher, events = run(system, DeviceWatcher.DISCONNECT,
+                          missed_discoveries_to_disconnect=1)
+
+    assert summary(events) == [(DeviceWatcher.DISCONNECT, '1c0faa000001')]
+    assert watcher.error_count == 0
+
+
+def test_ip_change():
+    system = FakeSystem([device_info('1c0faa000001', '169.254.0.1')],
+                        [device_info('1c0faa000001', '192.168.0.7')],
+                        [device_info('1c0faa000001', '192.168.0.7')])
+    watcher, events = run(system, DeviceWatcher.IP_CHANGE)
+
+    assert len(events) == 1
+    assert events[0].device_info['ip'] == '192.168.0.7'
+    assert events[0].previous_device_info['ip'] == '169.254.0.1'
+    assert watcher.devices['1c0faa000001']['ip'] == '192.168.0.7'
+
+
+def test_interval_backs_off_and_resets_on_change():
+    one = [device_info('1c0faa000001')]
+    two = one + [device_info('1c0faa000002')]
+    system = FakeSystem(one, one, one, one, one, two, two, two)
+    run(system, min_interval_millisec=1, max_interval_millisec=8)
+
+    # doubles after each discovery without a change, up to the max, and
+    # starts over after the discovery that found the second device
+    assert system.intervals == [1, 1, 2, 4, 8, 8, 1]
+
+
+def test_errors_are_recorded_and_the_watcher_goes_on():
+    system = FakeSystem([device_info('1c0faa000001')],
+                        OSError('interface down'),
+                        [device_info('1c0faa000001')],
+                        [device_info('1c0faa000001')])
+    watcher, events = run(system, min_interval_millisec=1,
+                          max_interval_millisec=4)
+
+    assert summary(events) == [(DeviceWatcher.CONNECT, '1c0faa000001')]
+    assert watcher.error_count == 1
+    assert isinstance(watcher.last_error, OSError)
+    # the failed discovery waits the longest interval
+    assert system.intervals[2] == 4
+
+
+def test_subscribe_unknown_event_type():
+    watcher = DeviceWatcher(FakeSystem())
+    with pytest.raises(ValueError):
+        watcher.subscribe('reboot', print)
+    with pytest.raises(ValueError):
+        watcher.unsubscribe(DeviceWatcher.CONNECT)
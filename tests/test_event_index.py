@@ -0,0 +1,64 @@
+import pytest
+
+from arena_api.event import EventIndex, EventRecord, _EventRing
+
+
+def test_ring_wraparound_keeps_the_newest_in_order():
+    ring = _EventRing(4)
+    for timestamp in range(10, 70, 10):
+        ring.append(EventRecord('ExposureEnd', timestamp, None))
+
+    assert len(ring) == 4
+    assert [ring[i] for i in range(len(ring))] == [30, 40, 50, 60]
+    assert [ring.record_at(i).timestamp_ns for i in range(len(ring))] == \
+        [30, 40, 50, 60]
+
+
+def test_ring_clears_when_timestamps_go_back():
+    ring = _EventRing(4)
+    ring.append(EventRecord('ExposureEnd', 100, None))
+    ring.append(EventRecord('ExposureEnd', 200, None))
+    ring.append(EventRecord('ExposureEnd', 5, None))
+
+    assert len(ring) == 1
+    assert ring[0] == 5
+
+
+@pytest.fixture
+def event_index():
+    event_index = EventIndex(capacity=4)
+    # 100 and 200 are dropped by the wraparound
+    for frame_id, timestamp in enumerate([100, 200, 300, 400, 500, 600]):
+        event_index.record('ExposureEnd', timestamp, frame_id)
+    return event_index
+
+
+def test_before_after_after_wraparound(event_index):
+    assert event_index.before('ExposureEnd', 450).timestamp_ns == 400
+    assert event_index.before('ExposureEnd', 400).timestamp_ns == 400
+    assert event_index.before('ExposureEnd', 250) is None
+    assert event_index.after('ExposureEnd', 450).timestamp_ns == 500
+    assert event_index.after('ExposureEnd', 500).timestamp_ns == 500
+    assert event_index.after('ExposureEnd', 601) is None
+
+
+def test_nearest_and_tolerance(event_index):
+    assert event_index.nearest('ExposureEnd', 340).frame_id == 2
+    assert event_index.nearest('ExposureEnd', 360).frame_id == 3
+    assert event_index.nearest('ExposureEnd', 0).timestamp_ns == 300
+    assert event_index.nearest('ExposureEnd', 10000).timestamp_ns == 600
+    assert event_index.nearest('ExposureEnd', 340, tolerance_ns=30) is None
+    assert event_index.nearest('FrameStart', 340) is None
+
+
+def test_join(event_index):
+    event_index.record('FrameStart', 290)
+    joined = event_index.join(310, tolerance_ns=50)
+    assert joined['ExposureEnd'].timestamp_ns == 300
+    assert joined['FrameStart'].timestamp_ns == 290
+    assert len(event_index) == 5
+
+
+def test_record_checks_timestamp_type():
+    with pytest.raises(TypeError):
+        EventIndex().record('ExposureEnd', 1.5)
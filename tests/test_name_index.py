@@ -0,0 +1,38 @@
+from difflib import get_close_matches
+
+from arena_api._name_index import NameIndex
+
+NAMES = ['ExposureAuto', 'ExposureTime', 'ExposureMode', 'Gain', 'GainAuto',
+         'GainSelector', 'Gamma', 'GammaEnable', 'PixelFormat', 'Width',
+         'Height', 'OffsetX', 'OffsetY', 'AcquisitionMode',
+         'AcquisitionFrameRate', 'AcquisitionFrameRateEnable',
+         'DeviceTemperature', 'DeviceModelName', 'TriggerMode',
+         'TriggerSource', 'TriggerSelector', 'BalanceRatio',
+         'BalanceWhiteAuto', 'BlackLevel']
+
+
+def test_contains_and_len():
+    index = NameIndex(NAMES)
+    assert len(index) == len(NAMES)
+    assert 'ExposureTime' in index
+    assert 'exposuretime' not in index
+    assert 'Exposure' not in index
+
+
+def test_suggest_ranks_like_difflib():
+    index = NameIndex(NAMES)
+    for name in ['ExposureTme', 'exposuretime', 'Gian', 'PixelFromat',
+                 'TrigerMode', 'AcquisitionFramerate', 'Temperature']:
+        assert index.suggest(name, n=5, cutoff=0.6) == \
+            get_close_matches(name, NAMES, n=5, cutoff=0.6)
+
+
+def test_suggest_prefix():
+    index = NameIndex(NAMES)
+    suggestions = index.suggest('Trigger')
+    assert set(suggestions[:3]) == {'TriggerMode', 'TriggerSource',
+                                    'TriggerSelector'}
+
+
+def test_suggest_nothing_close():
+    assert NameIndex(NAMES).suggest('zzzzzz', cutoff=0.6) == []
@@ -0,0 +1,54 @@
+import pytest
+
+from arena_api._node import _snap
+
+
+@pytest.mark.parametrize('value, expected', [
+    (-100, 0),      # below min
+    (0, 0),         # on min
+    (1, 0),
+    (2, 4),         # half way goes up
+    (3, 4),
+    (97, 96),
+    (98, 96),       # on max, 98 is not min + n * inc, the last step is 96
+    (1000, 96),     # above max
+])
+def test_snap_integer_edges(value, expected):
+    assert _snap(value, 0, 98, 4) == expected
+
+
+def test_snap_integer_max_on_a_step():
+    assert _snap(99, 0, 100, 4) == 100
+    assert _snap(1000, 0, 100, 4) == 100
+
+
+def test_snap_integer_offset_min():
+    # steps start at min, not at 0
+    assert _snap(10, 3, 50, 4) == 11
+    assert _snap(3, 3, 50, 4) == 3
+    assert _snap(50, 3, 50, 4) == 47
+
+
+def test_snap_integer_keeps_int64_precision():
+    maximum = 2 ** 63 - 1
+    assert _snap(maximum - 1, 0, maximum, 2) == maximum - 1
+    assert _snap(maximum, 0, maximum, 1) == maximum
+
+
+def test_snap_without_inc_only_clamps():
+    assert _snap(7.3, 0.0, 10.0, None) == 7.3
+    assert _snap(-1.0, 0.0, 10.0, None) == 0.0
+    assert _snap(11.0, 0.0, 10.0, 0) == 10.0
+
+
+@pytest.mark.parametrize('value, expected', [
+    (-5.0, 10.0),
+    (10.0, 10.0),
+    (12.4, 10.0),
+    (12.5, 15.0),
+    (99.0, 95.0),
+    (100.0, 95.0),
+    (1e9, 95.0),
+])
+def test_snap_float_edges(value, expected):
+    assert _snap(value, 10.0, 97.5, 5.0) == pytest.approx(expected)
@@ -0,0 +1,50 @@
+import pytest
+
+from arena_api._nodemap import NodemapSnapshot
+
+REFERENCE = {'ExposureTime': 5000.0, 'Gain': 0.0, 'PixelFormat': 'Mono8',
+             'ReverseX': False, 'DeviceUserID': 'left'}
+
+
+def test_diff_of_equal_snapshots_is_empty():
+    reference = NodemapSnapshot(REFERENCE)
+    assert len(reference.diff(NodemapSnapshot(REFERENCE))) == 0
+
+
+def test_diff_has_the_reference_values_of_changed_features():
+    current = dict(REFERENCE, ExposureTime=7000.0, PixelFormat='Mono16')
+    drift = NodemapSnapshot(REFERENCE).diff(current)
+    assert drift.to_dict() == {'ExposureTime': 5000.0,
+                               'PixelFormat': 'Mono8'}
+
+
+def test_diff_has_features_missing_from_other():
+    current = dict(REFERENCE)
+    del current['Gain']
+    assert NodemapSnapshot(REFERENCE).diff(current).to_dict() == \
+        {'Gain': 0.0}
+
+
+def test_diff_ignores_features_only_in_other():
+    current = dict(REFERENCE, BlackLevel=3.0)
+    assert len(NodemapSnapshot(REFERENCE).diff(current)) == 0
+
+
+def test_diff_compares_values_not_identity():
+    # 0 == False and 1.0 == 1, as the values read from the device
+    reference = NodemapSnapshot({'ReverseX': False, 'Width': 1})
+    assert len(reference.diff({'ReverseX': 0, 'Width': 1.0})) == 0
+
+
+def test_diff_checks_other_type():
+    with pytest.raises(TypeError):
+        NodemapSnapshot(REFERENCE).diff([('Gain', 0.0)])
+
+
+def test_round_trip_through_dict():
+    snapshot = NodemapSnapshot.from_dict(REFERENCE)
+    assert snapshot.to_dict() == REFERENCE
+    assert snapshot['PixelFormat'] == 'Mono8'
+    # a copy, the snapshot does not change with the dict
+    snapshot.to_dict()['Gain'] = 1.0
+    assert snapshot['Gain'] == 0.0